@@ -1,12 +1,8 @@
 from pyrevit import revit, DB
-from pyrevit.compat import get_elementid_value_func
+from pyrevit import script
+from Snippets._revisions import RevisionIndex, get_elementid_value
 
-get_elementid_value = get_elementid_value_func()
-
-# Collecting all revisions
-revclouds = DB.FilteredElementCollector(revit.doc)\
-              .OfCategory(DB.BuiltInCategory.OST_RevisionClouds)\
-              .WhereElementIsNotElementType()
+output = script.get_output()
 
 # Collecting all sheets
 shts = DB.FilteredElementCollector(revit.doc)\
@@ -16,56 +12,74 @@ shts = DB.FilteredElementCollector(revit.doc)\
 
 sheets = sorted(shts, key=lambda x: x.SheetNumber)
 
-# make a dictionary of all viewports on each sheet
-sheetvpdict = {get_elementid_value(sh.Id): [revit.doc.GetElement(x).ViewId
-                                    for x in sh.GetAllViewports()]
-               for sh in sheets}
-
-# make a dictionary of all revisions and the associated sheets
-sheetrevs = {get_elementid_value(sh.Id): [] for sh in sheets}
-
-atleastonecrazysheetwasfound = False
+# viewport -> sheet (inverted: view -> sheets), dependent/primary views and
+# clouds by owner view, all collected in one pass
+index = RevisionIndex(revit.doc)
 
 print('SEARCHING...\n')
 
-for revcloud in revclouds:
-    # get revision info
-    revid = get_elementid_value(revcloud.RevisionId)
-
-    # get parent view
-    parentvpid = revcloud.OwnerViewId
-    parentvp = revit.doc.GetElement(parentvpid)
+# sheet id -> {revision id: set of names of the views clouding it}
+sheetrevs = {get_elementid_value(sh.Id): {} for sh in sheets}
 
+# one pass over the clouds: each owner view is looked up in the view -> sheets map
+for ownerid, revclouds in index.clouds_by_owner.items():
+    parentvp = index.get_view(ownerid)
     if isinstance(parentvp, DB.ViewSheet):
         continue    # nevermind if parent view is a sheet
-    else:
-        # find the sheets showing the parent view
-        for sheetid in sheetvpdict:
-            if parentvpid in sheetvpdict:
-                # add the revision to the list of revisions
-                # that should be on sheet
-                sheetrevs[sheetid].append(revid)
 
-# after the above loop the revsheets dictionary should be complete
-for sheetid, revids in sheetrevs.items():
-    missedrevids = []
-    sheet = revit.doc.GetElement(DB.ElementId(sheetid))
-    listedrevids = [get_elementid_value(x) for x in sheet.GetAllRevisionIds()]
-    for revid in revids:
-        if revid not in listedrevids:
-            missedrevids.append(revid)
-            atleastonecrazysheetwasfound = True
-    if len(missedrevids) > 0:
-        print('SHEET:  {0}\t{1}\nDOES NOT LIST THESE REVISIONS:\n'
-              .format(sheet.Parameter[DB.BuiltInParameter.SHEET_NUMBER].AsString(),
-                      sheet.Parameter[DB.BuiltInParameter.SHEET_NAME].AsString()))
+    # placed views showing the owner: itself, its placed dependents, its primary
+    placedids = index.placed_views_showing(ownerid)
+    if not placedids:
+        continue    # view is not on any sheet
+
+    viewname = revit.query.get_name(parentvp)
+    for placedid in placedids:
+        placedview = index.get_view(placedid)
+        for revcloud in revclouds:
+            # a cloud cropped out of a placed (dependent) view is not listed on its sheets
+            if not index.is_cloud_visible(revcloud, placedview):
+                continue
+            revid = get_elementid_value(revcloud.RevisionId)
+            for sheetid in index.view_sheets[placedid]:
+                if sheetid in sheetrevs:
+                    sheetrevs[sheetid].setdefault(revid, set()).add(viewname)
 
-        for revid in missedrevids:
-            if revid not in listedrevids:
-                rev = revit.doc.GetElement(DB.ElementId(revid))
-                revit.report.print_revision(rev, prefix='\t', print_id=False)
+# compare with the revisions each sheet lists
+revisions = {}
+rows = []
+for sheet in sheets:
+    expected = sheetrevs[get_elementid_value(sheet.Id)]
+    if not expected:
+        continue
+    listedrevids = set(get_elementid_value(x) for x in sheet.GetAllRevisionIds())
+    for revid, viewnames in expected.items():
+        if revid in listedrevids:
+            continue
+        if revid not in revisions:
+            revisions[revid] = revit.doc.GetElement(DB.ElementId(revid))
+        rev = revisions[revid]
+        rows.append((
+            sheet.SheetNumber,
+            rev.SequenceNumber,
+            [
+                output.linkify(sheet.Id, sheet.SheetNumber),
+                sheet.Name,
+                revit.query.get_rev_number(rev),
+                rev.RevisionDate,
+                rev.Description,
+                ', '.join(sorted(viewnames)),
+            ]
+        ))
 
-if atleastonecrazysheetwasfound:
+if rows:
+    # sorted by sheet number, then revision sequence
+    rows.sort(key=lambda r: (r[0], r[1]))
+    output.print_table(
+        table_data=[r[2] for r in rows],
+        title='Sheets Missing Revisions ({} sheet(s), {} missing revision(s))'
+              .format(len(set(r[0] for r in rows)), len(rows)),
+        columns=['Sheet', 'Sheet Name', 'Missing Revision', 'Date', 'Description', 'Clouded In'],
+    )
     print('\nSEARCH COMPLETED.')
 else:
     print('SEARCH COMPLETED.\nALL REVISION SCHEDULES ARE CORRECT.')
@@ -3,6 +3,7 @@
 from pyrevit import coreutils
 from pyrevit import revit, DB
 from pyrevit import script, forms
+from Snippets._revisions import RevisionIndex, get_sheet_revision_ids
 
 
 # collect sheet
@@ -15,14 +16,6 @@ sheetsnotsorted = (
 
 all_sheets = sorted(sheetsnotsorted, key=lambda x: x.SheetNumber)
 
-# collect all clouds
-all_clouds = (
-    DB.FilteredElementCollector(revit.doc)
-    .OfCategory(DB.BuiltInCategory.OST_RevisionClouds)
-    .WhereElementIsNotElementType()
-    .ToElements()
-)
-
 # collect all revisions
 all_revisions = forms.select_revisions(
     title="Select Revisions To Include In The Report"
@@ -85,67 +78,28 @@ console.print_md(rev_table)
 
 
 class RevisedSheet:
-    def __init__(self, rvt_sheet):
+    def __init__(self, rvt_sheet, revision_index):
         self._rvt_sheet = rvt_sheet
+        self._revision_index = revision_index
 
         self._sheet_revisions = self._find_all_revisions_in_sheet()
         self._sheet_clouds = self._find_all_clouds_in_sheet()
         self._rev_numbers = self._find_revision_numbers()
 
     def _find_all_clouds_in_sheet(self):
-        sheet_clouds = []
-        ownerview_ids = [self._rvt_sheet.Id]
-        # add all the sheeted views to list
-        ownerview_ids.extend(
-            [revit.doc.GetElement(x).ViewId for x in self._rvt_sheet.GetAllViewports()]
+        # clouds on the sheet, its placed views and their primary views
+        # (looked up in the index instead of scanning every cloud)
+        return self._revision_index.clouds_on_sheet(
+            self._rvt_sheet, self._sheet_revisions
         )
 
-        primary_owenerview_ids = [
-            revit.doc.GetElement(view_id).GetPrimaryViewId()
-            for view_id in ownerview_ids
-            if revit.doc.GetElement(view_id).GetPrimaryViewId()
-            != DB.ElementId.InvalidElementId
-        ]
-
-        for rev_cloud in all_clouds:
-            is_rev_cloud_visible_in_sheet = self._is_revision_cloud_visible_in_sheet(
-                rev_cloud
-            )
-            is_rev_cloud_in_sheet_revisions = (
-                rev_cloud.RevisionId in self._sheet_revisions
-            )
-
-            if (
-                is_rev_cloud_in_sheet_revisions
-                and is_rev_cloud_visible_in_sheet
-                and (
-                    rev_cloud.OwnerViewId in ownerview_ids
-                    or rev_cloud.OwnerViewId in primary_owenerview_ids
-                )
-            ):
-                sheet_clouds.append(rev_cloud)
-        return sheet_clouds
-
-    def _is_revision_cloud_visible_in_sheet(self, rev_cloud):
-        """Check if a revision cloud is visible in the sheet."""
-        is_visible = False
-        for view_id in self._rvt_sheet.GetAllViewports():
-            viewport = revit.doc.GetElement(view_id)
-            view = revit.doc.GetElement(viewport.ViewId)
-            if not rev_cloud.IsHidden(view):
-                is_visible = True
-                break
-        return is_visible
-
     def _find_all_revisions_in_sheet(self):
-        revisions = set(self._rvt_sheet.GetAllRevisionIds())
-        revisions.update(set(self._rvt_sheet.GetAdditionalRevisionIds()))
-        return revisions
+        return get_sheet_revision_ids(self._rvt_sheet)
 
     def _find_revision_numbers(self):
         rev_numbers = set(
             [
-                revit.query.get_rev_number(revit.doc.GetElement(rev_id))
+                revit.query.get_rev_number(revit.doc.GetElement(DB.ElementId(rev_id)))
                 for rev_id in self._sheet_revisions
             ]
         )
@@ -196,11 +150,14 @@ class RevisedSheet:
         return self._rev_numbers
 
 
+# map viewports, views and clouds once for all sheets
+revision_index = RevisionIndex(revit.doc)
+
 # create a list of revised sheets
 revised_sheets = []
 for sheet in all_sheets:
     if sheet.CanBePrinted:
-        revised_sheets.append(RevisedSheet(sheet))
+        revised_sheets.append(RevisedSheet(sheet, revision_index))
 
 # draw a revision chart
 chart = console.make_bar_chart()
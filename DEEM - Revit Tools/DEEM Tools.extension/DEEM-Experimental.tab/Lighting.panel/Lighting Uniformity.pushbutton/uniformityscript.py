@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Lighting Layout Uniformity"""
+__title__ = "Lighting\nUniformity"
+__author__ = "Christopher Berndt"
+__doc__ = "Reports fixture spacing per ACT ceiling: min/max/mean spacing, spacing-to-mounting-height violations (height above the work plane) and isolated fixtures."
+
+import math
+import time
+
+from pyrevit import revit, DB, forms, script
+from Snippets._selection import get_selected_lighting_fixtures
+from Snippets._links import LinkRegistry
+from Snippets._ceilings import CeilingIndex
+from Snippets._calibration import CalibrationStore
+from Snippets._spatial import PointHash2D
+
+output = script.get_output()
+config = script.get_config(section='LightingUniformity')
+
+# Default maximum spacing-to-mounting-height ratio (S/MH)
+DEFAULT_MAX_RATIO = 1.5
+
+# Default work plane height above the level (feet); S/MH uses the height above it
+DEFAULT_WORK_PLANE_HEIGHT = 2.5
+
+# A fixture is isolated when its nearest neighbour is more than this many
+# times the allowed spacing away (or it is alone on its ceiling)
+ISOLATION_FACTOR = 2.0
+
+# Group label for fixtures that are not under a ceiling of the selected link
+NO_CEILING = "No ceiling"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Collection
+# ─────────────────────────────────────────────────────────────────────────────
+def get_fixtures_in_view(doc, view):
+    """All lighting fixtures visible in a view (view-scoped collector)"""
+    return list(DB.FilteredElementCollector(doc, view.Id)
+                .OfCategory(DB.BuiltInCategory.OST_LightingFixtures)
+                .WhereElementIsNotElementType())
+
+
+def get_ceiling_link(doc):
+    """Linked model with the ceiling grid: the one saved by Center Lights In Grid, else ask"""
+    registry = LinkRegistry(doc)
+    loaded = registry.loaded()
+    if not loaded:
+        return None
+
+    config = script.get_config(section='LightCenterTool')
+    saved_link = registry.find(getattr(config, 'selected_link_key', None),
+                               getattr(config, 'selected_link_name', None))
+    if saved_link and saved_link.is_loaded:
+        return saved_link
+
+    links_by_name = dict((link.name, link) for link in loaded)
+    name = forms.SelectFromList.show(sorted(links_by_name.keys()),
+                                     title="Select Linked File with Ceiling Grid",
+                                     button_name="Select")
+    return links_by_name.get(name) if name else None
+
+
+def get_mounting_height(doc, fixture, level_elevations, work_plane_height=0.0):
+    """
+    Height of the fixture above the work plane over its level (feet).
+    Returns (height, None), or (None, reason) when S/MH can't be checked.
+    """
+    location = fixture.Location
+    if not isinstance(location, DB.LocationPoint):
+        return None, "no insertion point"
+    level_id = fixture.LevelId
+    if level_id == DB.ElementId.InvalidElementId:
+        return None, "no level"
+    key = level_id.IntegerValue
+    if key not in level_elevations:
+        level = doc.GetElement(level_id)
+        level_elevations[key] = level.ProjectElevation if level else None
+    if level_elevations[key] is None:
+        return None, "level not found"
+    height = location.Point.Z - level_elevations[key] - work_plane_height
+    if height <= 0:
+        return None, "at or below the work plane"
+    return height, None
+
+
+def group_fixtures_by_ceiling(fixtures, ceiling_index):
+    """Dictionary: ceiling id (or NO_CEILING) -> [(fixture, XYZ)]"""
+    groups = {}
+    for fixture in fixtures:
+        location = fixture.Location
+        if not isinstance(location, DB.LocationPoint):
+            continue
+        point = location.Point
+        ceiling = ceiling_index.ceiling_at_point(point) if ceiling_index else None
+        key = ceiling.Id.IntegerValue if ceiling else NO_CEILING
+        groups.setdefault(key, []).append((fixture, point))
+    return groups
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Analysis
+# ─────────────────────────────────────────────────────────────────────────────
+def analyze_group(doc, entries, max_ratio, level_elevations, work_plane_height):
+    """
+    Nearest-neighbour spacing for one ceiling.
+    Returns dict with spacing stats, ratio violations, isolated fixtures and
+    fixtures without a mounting height (not checked against S/MH).
+    """
+    index = PointHash2D.from_points((fixture.Id.IntegerValue, (point.X, point.Y)) for fixture, point in entries)
+    neighbours = index.nearest_neighbours()
+
+    spacings = []
+    violations = []  # (fixture, spacing, height above work plane)
+    isolated = []    # (fixture, spacing or None)
+    unmeasured = []  # (fixture, reason)
+
+    for fixture, point in entries:
+        neighbour_key, spacing = neighbours[fixture.Id.IntegerValue]
+        mounting_height, reason = get_mounting_height(doc, fixture, level_elevations, work_plane_height)
+        if reason:
+            unmeasured.append((fixture, reason))
+
+        if spacing is None:
+            isolated.append((fixture, None))
+            continue
+        spacings.append(spacing)
+
+        if mounting_height:
+            allowed = max_ratio * mounting_height
+            if spacing > ISOLATION_FACTOR * allowed:
+                isolated.append((fixture, spacing))
+            elif spacing > allowed:
+                violations.append((fixture, spacing, mounting_height))
+
+    return {
+        'count': len(entries),
+        'min': min(spacings) if spacings else None,
+        'max': max(spacings) if spacings else None,
+        'mean': sum(spacings) / len(spacings) if spacings else None,
+        'violations': violations,
+        'isolated': isolated,
+        'unmeasured': unmeasured,
+    }
+
+
+def format_feet(value):
+    """Feet with 2 decimals, or a dash"""
+    return "{:.2f}'".format(value) if value is not None else "-"
+
+
+def format_grid(grid):
+    """Calibrated grid as spacing and rotation, or a dash"""
+    if not grid:
+        return "-"
+    offset_x, offset_y, spacing_x, spacing_y, angle = grid
+    text = "{:g}' x {:g}'".format(round(spacing_x, 2), round(spacing_y, 2))
+    if abs(angle) > 1e-6:
+        text += " @ {:.1f}°".format(math.degrees(angle))
+    return text
+
+
+def ask_number(prompt, default):
+    """Ask for a number, None if cancelled or not a number"""
+    text = forms.ask_for_string(default="{:g}".format(default), prompt=prompt, title="Lighting Uniformity")
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        forms.alert("'{}' is not a number.".format(text), title="Lighting Uniformity")
+        return None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+def main():
+    doc = revit.doc
+    view = doc.ActiveView
+
+    # ── fixtures: selection, else everything visible in the active view ──────
+    fixtures = get_selected_lighting_fixtures() or get_fixtures_in_view(doc, view)
+    if not fixtures:
+        forms.alert("No lighting fixtures selected or visible in the active view.",
+                    title="Lighting Uniformity")
+        return
+
+    # ── criteria, remembered between runs ────────────────────────────────────
+    max_ratio = ask_number("Maximum spacing-to-mounting-height ratio (S/MH):",
+                           getattr(config, 'max_ratio', DEFAULT_MAX_RATIO))
+    if max_ratio is None:
+        return
+    work_plane_height = ask_number("Work plane height above the level (feet).\n"
+                                   "Mounting height is measured from the work plane:",
+                                   getattr(config, 'work_plane_height', DEFAULT_WORK_PLANE_HEIGHT))
+    if work_plane_height is None:
+        return
+    config.max_ratio = max_ratio
+    config.work_plane_height = work_plane_height
+    script.save_config()
+
+    # ── group by ceiling of the linked model (same grid model as Center Lights) ─
+    link = get_ceiling_link(doc)
+    start_time = time.time()
+    ceiling_index = CeilingIndex(link) if link else None
+    grids = {}
+    if ceiling_index:
+        for unique_id, grid in CalibrationStore().get_ceiling_grids(ceiling_index.link_doc).items():
+            ceiling = ceiling_index.link_doc.GetElement(unique_id)
+            if ceiling is not None:
+                grids[ceiling.Id.IntegerValue] = grid
+
+    groups = group_fixtures_by_ceiling(fixtures, ceiling_index)
+
+    # ── nearest-neighbour analysis per ceiling ───────────────────────────────
+    level_elevations = {}
+    results = dict((key, analyze_group(doc, entries, max_ratio, level_elevations, work_plane_height))
+                   for key, entries in groups.items())
+
+    elapsed = time.time() - start_time
+
+    # ── report ───────────────────────────────────────────────────────────────
+    output.print_md("## Lighting Layout Uniformity")
+    output.print_md("{} fixture(s) on {} ceiling group(s) | Max S/MH {:g} | Work plane {} | Link: {} | {:.2f}s".format(
+        sum(r['count'] for r in results.values()), len(results), max_ratio, format_feet(work_plane_height),
+        link.name if link else "(none)", elapsed))
+    output.print_md("")
+    output.print_md("| Ceiling | Grid | Fixtures | Min | Max | Mean | S/MH Violations | Isolated | S/MH Not Checked |")
+    output.print_md("|---|---|---|---|---|---|---|---|---|")
+
+    ordered_keys = sorted(results.keys(), key=lambda k: (k == NO_CEILING, str(k)))
+    for key in ordered_keys:
+        result = results[key]
+        output.print_md("| {} | {} | {} | {} | {} | {} | {} | {} | {} |".format(
+            key, format_grid(grids.get(key)), result['count'],
+            format_feet(result['min']), format_feet(result['max']), format_feet(result['mean']),
+            len(result['violations']), len(result['isolated']), len(result['unmeasured'])))
+
+    violations = [(key, v) for key in ordered_keys for v in results[key]['violations']]
+    if violations:
+        output.print_md("\n### Spacing exceeds {:g} × mounting height above work plane".format(max_ratio))
+        for key, (fixture, spacing, mounting_height) in violations:
+            print("{} | Ceiling {} | spacing {} | height above work plane {} | S/MH {:.2f}".format(
+                output.linkify(fixture.Id), key, format_feet(spacing), format_feet(mounting_height),
+                spacing / mounting_height))
+
+    isolated = [(key, i) for key in ordered_keys for i in results[key]['isolated']]
+    if isolated:
+        output.print_md("\n### Isolated fixtures")
+        for key, (fixture, spacing) in isolated:
+            print("{} | Ceiling {} | nearest fixture {}".format(
+                output.linkify(fixture.Id), key, format_feet(spacing) if spacing else "none on this ceiling"))
+
+    # Fixtures without a mounting height only count towards spacing, never S/MH
+    unmeasured = [(key, u) for key in ordered_keys for u in results[key]['unmeasured']]
+    if unmeasured:
+        output.print_md("\n### {} fixture(s) not checked against S/MH (no mounting height)".format(len(unmeasured)))
+        for key, (fixture, reason) in unmeasured:
+            print("{} | Ceiling {} | {}".format(output.linkify(fixture.Id), key, reason))
+
+    if not violations and not isolated:
+        output.print_md("\n> ✅ No spacing violations or isolated fixtures.")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+main()
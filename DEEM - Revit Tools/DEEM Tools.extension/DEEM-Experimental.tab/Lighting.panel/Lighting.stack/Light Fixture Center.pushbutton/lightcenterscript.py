@@ -4,7 +4,14 @@ __author__ = "Christopher Berndt"
 __doc__ = "Centers light fixtures in ACT ceiling grid from linked architectural model."
 
 from pyrevit import revit, DB, forms, script
-from Autodesk.Revit.UI.Selection import ObjectType
+from Snippets._selection import get_selected_lighting_fixtures, pick_lighting_fixtures
+from Snippets._ceilings import CeilingIndex, detect_ceiling_grids, get_pattern_group_key
+from Snippets._geometry import (locate_cells, cell_centers, nearest_cells, rotate_points,
+                                grid_from_picks, dominant_edge_angle, angle_difference)
+import math
+import time
+from Snippets._calibration import CalibrationStore, import_legacy_config
+from Snippets._links import LinkRegistry
 import clr
 clr.AddReference('PresentationFramework')
 clr.AddReference('PresentationCore')
@@ -14,15 +21,38 @@ from System.Windows.Controls import Button, StackPanel, TextBlock, Border, Scrol
 from System.Windows import Thickness, HorizontalAlignment, VerticalAlignment
 from System.Windows.Media import Brushes, SolidColorBrush, Color
 from System.Windows.Controls import RowDefinition
+from System.Collections.Generic import List
 
 # Get current document and UI document
 doc = revit.doc
 uidoc = revit.uidoc
 
 # Global grid offset dictionary - keyed by ceiling ID
-# Value: (offset_x, offset_y, spacing_x, spacing_y)
+# Value: (offset_x, offset_y, spacing_x, spacing_y, angle) in link coordinates, angle in radians
 CEILING_GRID_OFFSETS = {}
 
+# Translations shorter than this (feet) are treated as already centered
+MOVE_TOLERANCE = 0.001
+
+# Translations are grouped after rounding to this many decimal places (feet)
+TRANSLATION_DIGITS = 6
+
+# Ceiling edges further than this (radians) off a picked pattern grid ask for confirmation
+ANGLE_CONFIRM_TOLERANCE = math.radians(0.5)
+
+# How far (in cells) a fixture may be pushed to find a free cell
+MAX_PUSH_RADIUS = 3
+
+# Fixtures moved per transaction; the chunks form one undo step and cancelling rolls them all back
+CHUNK_SIZE = 200
+
+# Where to take fixtures from when nothing is pre-selected
+SCOPE_OPTIONS = [
+    "Pick Fixtures",
+    "All in Active View",
+    "All on Selected Levels",
+]
+
 
 class LinkSelectionWindow(Window):
     """WPF Window for selecting a linked file"""
@@ -132,7 +162,7 @@ class LinkSelectionWindow(Window):
 
         # Select clicked row
         sender.Background = SolidColorBrush(Color.FromRgb(173, 216, 230))  # Light blue
-        self.selected_link = self.link_dict[sender.Tag]
+        self.selected_link = self.link_dict[sender.Tag]  # LinkInfo
 
     def select_click(self, sender, args):
         """Apply selection"""
@@ -169,36 +199,15 @@ def is_act_ceiling(ceiling):
     return False
 
 
-def get_ceiling_at_point(point, link_instance):
-    """Get ceiling element at a given point from the specified linked file
+def get_ceiling_at_point(point, ceiling_index):
+    """Get ceiling element at a given point from the indexed linked file
+    ceiling_index: CeilingIndex built once for the selected link
     Returns: (ceiling, transform) tuple"""
 
     try:
-        link_doc = link_instance.GetLinkDocument()
-        if not link_doc:
-            return None, None
-
-        # Get transform from link instance
-        transform = link_instance.GetTransform()
-
-        # Transform the point to link coordinates
-        inverse_transform = transform.Inverse
-        link_point = inverse_transform.OfPoint(point)
-
-        # Get ceilings from linked document
-        link_ceilings = DB.FilteredElementCollector(link_doc).OfClass(DB.Ceiling).ToElements()
-
-        for ceiling in link_ceilings:
-            try:
-                bbox = ceiling.get_BoundingBox(None)
-                if not bbox:
-                    continue
-
-                if (bbox.Min.X <= link_point.X <= bbox.Max.X and
-                    bbox.Min.Y <= link_point.Y <= bbox.Max.Y):
-                    return ceiling, transform
-            except:
-                continue
+        ceiling = ceiling_index.ceiling_at_point(point)
+        if ceiling:
+            return ceiling, ceiling_index.transform
     except:
         pass
 
@@ -242,63 +251,53 @@ def get_grid_spacing(ceiling, use_default=True):
     return spacing_x, spacing_y
 
 
-def get_closest_grid_intersection(fixture_location, ceiling, transform, ceiling_id):
-    """Find the closest grid line intersection for fixture location
-    transform: Transform from link instance if ceiling is linked, None if in host
-    ceiling_id: ID of the ceiling element for offset lookup"""
+def get_grid_cells(link_points, ceiling_id):
+    """Grid cells for a batch of fixture points on one ceiling
+    link_points: list of XYZ in link coordinates
+    ceiling_id: ID of the ceiling element for offset lookup
+    Returns: list of (cell_x, cell_y), or None if the ceiling is not calibrated"""
 
     # Check if we have an offset for this ceiling
     if ceiling_id not in CEILING_GRID_OFFSETS:
         return None  # No offset calibrated for this ceiling yet
 
-    # Get stored offset and spacing
-    offset_x, offset_y, spacing_x, spacing_y = CEILING_GRID_OFFSETS[ceiling_id]
+    # Get stored offset, spacing and rotation (ALL IN LINK COORDINATES)
+    offset_x, offset_y, spacing_x, spacing_y, angle = CEILING_GRID_OFFSETS[ceiling_id]
 
     if not spacing_x or not spacing_y:
         return None
 
-    # Find bounding box of ceiling
-    bbox = ceiling.get_BoundingBox(None)
-
-    if not bbox:
-        return None
-
-    # If ceiling is from a link, work in link coordinates then transform back
-    work_location = fixture_location
-    if transform:
-        inverse_transform = transform.Inverse
-        work_location = inverse_transform.OfPoint(fixture_location)
-
-    # Calculate position relative to the grid pattern
-    # The grid line intersections are at positions where (X % spacing) = offset_x
-    # Cell centers are at intersection + (spacing/2, spacing/2)
+    # Rotate all points into the grid frame at once and find the cell each one is in
+    return locate_cells([(p.X, p.Y) for p in link_points], offset_x, offset_y, spacing_x, spacing_y, angle)
 
-    # Find which cell the fixture is in, accounting for the offset
-    adjusted_x = work_location.X - offset_x
-    adjusted_y = work_location.Y - offset_y
 
-    # Use floor to find which cell the fixture is currently in
-    # This prevents fixtures near cell boundaries from jumping to adjacent cells
-    import math
-    cell_index_x = int(math.floor(adjusted_x / spacing_x))
-    cell_index_y = int(math.floor(adjusted_y / spacing_y))
-
-    # Calculate the corner intersection position for this cell
-    intersection_x = cell_index_x * spacing_x + offset_x
-    intersection_y = cell_index_y * spacing_y + offset_y
-
-    # Now offset by half spacing to get to the CENTER of the cell
-    center_x = intersection_x + (spacing_x / 2.0)
-    center_y = intersection_y + (spacing_y / 2.0)
-    center_z = work_location.Z
+def pick_pattern_grid(label, spacings, inverse_transform):
+    """Grid from two neighbouring intersections picked along one grid line, checked
+    against the pattern spacings. Returns (offset_x, offset_y, spacing_x, spacing_y, angle)
+    in link coordinates, or None if cancelled or the picks do not match the pattern"""
+    try:
+        first_host = uidoc.Selection.PickPoint(
+            "{}: click EXACTLY on a GRID LINE INTERSECTION (zoom in!)".format(label))
+        second_host = uidoc.Selection.PickPoint(
+            "{}: click the NEXT INTERSECTION along one grid line".format(label))
+    except Exception:
+        forms.alert("Calibration cancelled. Skipping {}.".format(label))
+        return None
 
-    center_point = DB.XYZ(center_x, center_y, center_z)
+    first = inverse_transform.OfPoint(first_host)
+    second = inverse_transform.OfPoint(second_host)
+    grid = grid_from_picks((first.X, first.Y), (second.X, second.Y), spacings)
+    if grid is None:
+        forms.alert("The picked intersections are {:.2f}' apart, which matches neither pattern spacing "
+                    "({:.2f}' x {:.2f}').\nSkipping {}.".format(
+                        math.hypot(second.X - first.X, second.Y - first.Y), spacings[0], spacings[1], label))
+    return grid
 
-    # Transform back to host coordinates if needed
-    if transform:
-        center_point = transform.OfPoint(center_point)
 
-    return center_point
+def get_cell_targets(cells, link_points, ceiling_id):
+    """Cell center for each cell, in link coordinates (Z stays at the fixture's insertion level)"""
+    centers = cell_centers(cells, *CEILING_GRID_OFFSETS[ceiling_id])
+    return [DB.XYZ(x, y, p.Z) for (x, y), p in zip(centers, link_points)]
 
 
 def check_hosted_fixtures(fixtures):
@@ -319,15 +318,14 @@ def check_hosted_fixtures(fixtures):
     return hosted_fixtures
 
 
-def center_fixture_in_grid(fixture, link_instance):
-    """Center a lighting fixture at ceiling grid line intersection
-    Returns: (success, ceiling_id) tuple"""
+def get_fixture_point(fixture):
+    """Point used to center a fixture, or None if it is not point based"""
 
     # Get fixture location
     location = fixture.Location
 
     if not isinstance(location, DB.LocationPoint):
-        return False, None
+        return None
 
     # Use the fixture's bounding box center for X/Y, but keep Z at the insertion point level
     # This handles recessed fixtures where the bounding box includes housing above the ceiling
@@ -336,48 +334,205 @@ def center_fixture_in_grid(fixture, link_instance):
         if bbox:
             # Calculate bounding box center for X and Y, but use insertion point Z
             # This ensures we're working at the visible trim level, not the housing level
-            fixture_point = DB.XYZ(
+            return DB.XYZ(
                 (bbox.Min.X + bbox.Max.X) / 2.0,
                 (bbox.Min.Y + bbox.Max.Y) / 2.0,
                 location.Point.Z  # Use insertion point Z (at ceiling level)
             )
-        else:
-            # Fall back to insertion point if no bounding box
-            fixture_point = location.Point
     except:
-        # Fall back to insertion point if error
-        fixture_point = location.Point
+        pass
 
-    # Find ceiling at fixture location
-    ceiling, transform = get_ceiling_at_point(fixture_point, link_instance)
+    # Fall back to insertion point if no bounding box or error
+    return location.Point
 
-    if not ceiling:
-        return False, None
 
-    # Get ceiling ID
-    ceiling_id = ceiling.Id.IntegerValue
+class FixturePlacement(object):
+    """Computed grid position of one fixture"""
+    def __init__(self, fixture, fixture_point, link_point, ceiling_id, cell, translation):
+        self.fixture = fixture
+        self.fixture_point = fixture_point  # Current center (host coordinates)
+        self.link_point = link_point        # Current center (link coordinates)
+        self.ceiling_id = ceiling_id
+        self.cell = cell                    # (cell_x, cell_y) in the ceiling grid
+        self.translation = translation      # Move from current center to the cell center (host)
 
-    # Get closest grid intersection
-    target_point = get_closest_grid_intersection(fixture_point, ceiling, transform, ceiling_id)
+    @property
+    def cell_key(self):
+        return (self.ceiling_id, self.cell[0], self.cell[1])
 
-    if not target_point:
-        return False, ceiling_id  # Return ceiling_id so caller knows which ceiling needs calibration
 
-    # Move fixture to grid intersection
-    # Note: We calculated target based on bounding box center, but we move the insertion point
-    # So we need to calculate the translation from the current center to the target
-    try:
-        translation = target_point - fixture_point
-        location.Move(translation)
-    except Exception as move_error:
-        print("ERROR: Failed to move fixture - {}".format(str(move_error)))
-        return False, ceiling_id
+def compute_fixture_placements(fixtures, ceiling_index):
+    """Find the grid cell center for every fixture, batched per ceiling
+    ceiling_index: CeilingIndex of the selected link
+    Returns: (placements, failed) where placements is a list of FixturePlacement
+    and failed is a list of fixtures with no ceiling or no calibrated grid"""
+
+    placements = []
+    failed = []
+
+    # Group fixtures by ceiling: ceiling id -> [(fixture, host point, link point)]
+    fixtures_by_ceiling = {}
+    for fixture in fixtures:
+        fixture_point = get_fixture_point(fixture)
+        if fixture_point is None:
+            failed.append(fixture)
+            continue
+
+        ceiling, transform = get_ceiling_at_point(fixture_point, ceiling_index)
+        if not ceiling:
+            failed.append(fixture)
+            continue
+
+        link_point = ceiling_index.to_link(fixture_point)
+        fixtures_by_ceiling.setdefault(ceiling.Id.IntegerValue, []).append((fixture, fixture_point, link_point))
+
+    for ceiling_id, entries in fixtures_by_ceiling.items():
+        link_points = [link_point for _, _, link_point in entries]
+        cells = get_grid_cells(link_points, ceiling_id)
+        if cells is None:
+            failed.extend(fixture for fixture, _, _ in entries)
+            continue
+
+        targets = get_cell_targets(cells, link_points, ceiling_id)
+
+        # Note: We calculated target based on bounding box center, but we move the insertion point
+        # So we need to calculate the translation from the current center to the target
+        for (fixture, fixture_point, link_point), cell, target in zip(entries, cells, targets):
+            translation = ceiling_index.to_host(target) - fixture_point
+            placements.append(FixturePlacement(fixture, fixture_point, link_point, ceiling_id, cell, translation))
+
+    return placements, failed
+
+
+def find_cell_conflicts(placements):
+    """Fixtures that end up in the same grid cell, in one pass over all placements
+    Returns: list of placement lists (2+ per cell), the fixture nearest the cell center first"""
+
+    placements_by_cell = {}
+    for placement in placements:
+        placements_by_cell.setdefault(placement.cell_key, []).append(placement)
+
+    return [sorted(cell_placements, key=lambda p: p.translation.GetLength())
+            for cell_placements in placements_by_cell.values() if len(cell_placements) > 1]
+
+
+def push_to_free_cells(conflicts, placements, ceiling_index):
+    """Move every fixture after the first in a conflicting cell to the nearest free cell
+    on the same ceiling (within MAX_PUSH_RADIUS cells)
+    Returns: list of placements that could not be pushed"""
+
+    occupied = set(placement.cell_key for placement in placements)
+    unresolved = []
+
+    for cell_placements in conflicts:
+        for placement in cell_placements[1:]:
+            spacing_x, spacing_y = CEILING_GRID_OFFSETS[placement.ceiling_id][2:4]
+            region = ceiling_index.get_region(placement.ceiling_id)
+
+            pushed = False
+            for cell in nearest_cells(placement.cell, spacing_x, spacing_y, MAX_PUSH_RADIUS):
+                if (placement.ceiling_id, cell[0], cell[1]) in occupied:
+                    continue
+                target = get_cell_targets([cell], [placement.link_point], placement.ceiling_id)[0]
+                # Stay on the same ceiling
+                if region is not None and not region.contains(target.X, target.Y):
+                    continue
+
+                placement.cell = cell
+                placement.translation = ceiling_index.to_host(target) - placement.fixture_point
+                occupied.add(placement.cell_key)
+                pushed = True
+                break
+
+            if not pushed:
+                unresolved.append(placement)
+
+    return unresolved
+
 
-    return True, ceiling_id
+def report_cell_conflicts(conflicts):
+    """Print conflicting fixtures with clickable element IDs"""
+    output = script.get_output()
+    output.print_md("## Fixtures sharing a ceiling grid cell")
+    output.print_md("{} cell(s) have more than one fixture.".format(len(conflicts)))
+    for cell_placements in conflicts:
+        first = cell_placements[0]
+        print("Ceiling {} cell ({}, {}): {}".format(
+            first.ceiling_id, first.cell[0], first.cell[1],
+            ", ".join(output.linkify(p.fixture.Id) for p in cell_placements)))
+
+
+def get_fixtures_in_view(view):
+    """All lighting fixtures visible in a view (view-scoped collector)"""
+    return list(DB.FilteredElementCollector(doc, view.Id)
+                .OfCategory(DB.BuiltInCategory.OST_LightingFixtures)
+                .WhereElementIsNotElementType())
+
+
+def get_fixtures_on_levels(levels):
+    """All lighting fixtures on the given levels (one collector pass)"""
+    level_filters = [DB.ElementLevelFilter(level.Id) for level in levels]
+    if len(level_filters) == 1:
+        level_filter = level_filters[0]
+    else:
+        level_filter = DB.LogicalOrFilter(List[DB.ElementFilter](level_filters))
+    return list(DB.FilteredElementCollector(doc)
+                .OfCategory(DB.BuiltInCategory.OST_LightingFixtures)
+                .WhereElementIsNotElementType()
+                .WherePasses(level_filter))
+
+
+def group_translations(placements):
+    """Group fixtures that share the same translation vector
+    Returns: (groups, unchanged) where groups is a dict of rounded (x, y, z) -> [fixture, ...]
+    and unchanged is the number of fixtures within MOVE_TOLERANCE of their target"""
+
+    groups = {}
+    unchanged = 0
+    for placement in placements:
+        translation = placement.translation
+        if translation.GetLength() < MOVE_TOLERANCE:
+            unchanged += 1
+            continue
+        key = (round(translation.X, TRANSLATION_DIGITS),
+               round(translation.Y, TRANSLATION_DIGITS),
+               round(translation.Z, TRANSLATION_DIGITS))
+        groups.setdefault(key, []).append(placement.fixture)
+    return groups, unchanged
+
+
+def apply_translation_groups(groups):
+    """Move each group of fixtures with one MoveElements call (must run inside a transaction)
+    A group that fails is retried one fixture at a time so one bad fixture doesn't block the rest
+    Returns: (moved, failed) counts"""
+
+    moved = 0
+    failed = 0
+    for (x, y, z), fixtures in groups.items():
+        translation = DB.XYZ(x, y, z)
+        # Sub-transaction so a failed group move leaves nothing half moved before the retry
+        sub_t = DB.SubTransaction(doc)
+        try:
+            sub_t.Start()
+            DB.ElementTransformUtils.MoveElements(doc, List[DB.ElementId]([f.Id for f in fixtures]), translation)
+            sub_t.Commit()
+            moved += len(fixtures)
+        except Exception:
+            if sub_t.HasStarted() and not sub_t.HasEnded():
+                sub_t.RollBack()
+            for fixture in fixtures:
+                try:
+                    DB.ElementTransformUtils.MoveElement(doc, fixture.Id, translation)
+                    moved += 1
+                except Exception as move_error:
+                    print("ERROR: Failed to move fixture {} - {}".format(fixture.Id, str(move_error)))
+                    failed += 1
+    return moved, failed
 
 
 # Main execution
 t = None
+tg = None
 try:
     # Get current view
     active_view = doc.ActiveView
@@ -388,19 +543,16 @@ try:
         sys.exit()
 
     # Prompt user to select the linked file with ceiling grid
-    link_collector = DB.FilteredElementCollector(doc).OfClass(DB.RevitLinkInstance).ToElements()
+    # Links are enumerated once; documents and transforms are cached on each LinkInfo
+    link_registry = LinkRegistry(doc)
 
-    if not link_collector:
+    if not len(link_registry):
         forms.alert("No linked Revit files found in this project.")
         import sys
         sys.exit()
 
     # Create a selection dialog for link files
-    link_dict = {}
-
-    for link in link_collector:
-        if link.GetLinkDocument():
-            link_dict[link.Name] = link
+    link_dict = dict((link.name, link) for link in link_registry.loaded())
 
     if not link_dict:
         forms.alert("No loaded linked Revit files found.")
@@ -409,14 +561,16 @@ try:
 
     # Try to retrieve the previously selected link from config
     # Use a shared config section so reset button can access it
+    # Links are saved by instance UniqueId; older versions saved the display name
     config = script.get_config(section='LightCenterTool')
-    saved_link_name = getattr(config, 'selected_link_name', None)
+    saved_link = link_registry.find(getattr(config, 'selected_link_key', None),
+                                    getattr(config, 'selected_link_name', None))
     selected_link = None
 
     # Check if the saved link still exists and is loaded
-    if saved_link_name and saved_link_name in link_dict:
+    if saved_link and saved_link.is_loaded:
         # Use the saved link
-        selected_link = link_dict[saved_link_name]
+        selected_link = saved_link
     else:
         # No saved link or it's been reset - show selection window
         link_window = LinkSelectionWindow(link_dict)
@@ -428,48 +582,50 @@ try:
             sys.exit()
 
         selected_link = link_window.selected_link
-        # Save the selected link name for next time
-        config.selected_link_name = selected_link.Name
+
+    # Save the selected link for next time
+    if getattr(config, 'selected_link_key', None) != selected_link.key:
+        config.selected_link_key = selected_link.key
+        config.selected_link_name = selected_link.name
         script.save_config()
 
-    # Load all saved ceiling offsets and spacings from config
-    for attr_name in dir(config):
-        if attr_name.startswith('grid_offset_ceiling_{}_{}'.format(selected_link.Name, '')):
-            try:
-                # Parse ceiling ID from attribute name
-                parts = attr_name.split('_')
-                if len(parts) >= 5:
-                    ceiling_id = int(parts[4])
-                    offset_x = getattr(config, 'grid_offset_ceiling_{}_{}_{}'.format(selected_link.Name, ceiling_id, 'x'), None)
-                    offset_y = getattr(config, 'grid_offset_ceiling_{}_{}_{}'.format(selected_link.Name, ceiling_id, 'y'), None)
-                    spacing_x = getattr(config, 'grid_spacing_ceiling_{}_{}_{}'.format(selected_link.Name, ceiling_id, 'x'), None)
-                    spacing_y = getattr(config, 'grid_spacing_ceiling_{}_{}_{}'.format(selected_link.Name, ceiling_id, 'y'), None)
-                    if all(v is not None for v in [offset_x, offset_y, spacing_x, spacing_y]):
-                        CEILING_GRID_OFFSETS[ceiling_id] = (offset_x, offset_y, spacing_x, spacing_y)
-            except:
-                pass
-
-    # Get selected elements or prompt for selection
-    selection = [doc.GetElement(id) for id in uidoc.Selection.GetElementIds()]
-
-    if not selection:
-        # Prompt user to select fixtures
-        selected_refs = uidoc.Selection.PickObjects(
-            ObjectType.Element,
-            "Select light fixtures to center in ceiling grid"
-        )
+    # Index the link's ceilings once for this run (bounding boxes are reused between runs)
+    ceiling_index = CeilingIndex(selected_link)
+    link_doc = ceiling_index.link_doc
 
-        selection = [doc.GetElement(ref.ElementId) for ref in selected_refs]
+    # Load all saved ceiling offsets and spacings (one file read, keyed by ceiling UniqueId)
+    calibration_store = CalibrationStore()
+    if import_legacy_config(config, calibration_store, selected_link.name, link_doc):
+        calibration_store.save()
+        script.save_config()
 
-    if not selection:
-        forms.alert("No elements selected.")
-        import sys
-        sys.exit()
+    for unique_id, grid in calibration_store.get_ceiling_grids(link_doc).items():
+        ceiling = link_doc.GetElement(unique_id)
+        if ceiling is not None:
+            CEILING_GRID_OFFSETS[ceiling.Id.IntegerValue] = grid
 
-    # Filter for lighting fixtures
-    lighting_fixtures = [elem for elem in selection
-                        if elem.Category and
-                        elem.Category.Id.IntegerValue == int(DB.BuiltInCategory.OST_LightingFixtures)]
+    # Get pre-selected lighting fixtures or ask where to take them from
+    # (selection filter only lets lighting fixtures be picked or box-selected)
+    lighting_fixtures = get_selected_lighting_fixtures()
+
+    if not lighting_fixtures:
+        scope = forms.CommandSwitchWindow.show(
+            SCOPE_OPTIONS,
+            message="Center light fixtures from:"
+        )
+
+        if not scope:
+            import sys
+            sys.exit()
+
+        if scope == SCOPE_OPTIONS[0]:
+            lighting_fixtures = pick_lighting_fixtures("Select light fixtures to center in ceiling grid")
+        elif scope == SCOPE_OPTIONS[1]:
+            lighting_fixtures = get_fixtures_in_view(active_view)
+        elif scope == SCOPE_OPTIONS[2]:
+            levels = forms.select_levels(title="Select Levels", multiple=True)
+            if levels:
+                lighting_fixtures = get_fixtures_on_levels(levels)
 
     if not lighting_fixtures:
         forms.alert("No lighting fixtures selected.")
@@ -526,93 +682,235 @@ try:
         location = fixture.Location
         if isinstance(location, DB.LocationPoint):
             fixture_point = location.Point
-            ceiling, transform = get_ceiling_at_point(fixture_point, selected_link)
+            ceiling, transform = get_ceiling_at_point(fixture_point, ceiling_index)
             if ceiling:
                 ceiling_id = ceiling.Id.IntegerValue
                 if ceiling_id not in CEILING_GRID_OFFSETS:
                     uncalibrated_ceilings.add(ceiling_id)
 
+    # Cached inverse transform for coordinate conversion
+    inverse_transform = ceiling_index.inverse_transform
+
+    # Read grid spacing from each uncalibrated ceiling's surface pattern. Where the
+    # pattern sits on a face and how it is rotated there are not exposed by the API,
+    # so one grid step is picked per group of ceilings sharing material and plane,
+    # and the angle is confirmed for each ceiling whose edges run another way.
+    pattern_calibrated_count = 0
+    if uncalibrated_ceilings:
+        detected_grids = detect_ceiling_grids([ceiling_index.ceilings[c_id] for c_id in uncalibrated_ceilings])
+        pattern_groups = {}
+        for ceiling_id in detected_grids:
+            group_key = get_pattern_group_key(ceiling_index.ceilings[ceiling_id])
+            if group_key is not None:
+                pattern_groups.setdefault(group_key, []).append(ceiling_id)
+
+        if pattern_groups:
+            use_patterns = forms.alert(
+                "Grid spacing was read from the surface pattern of {} ceiling(s) in {} group(s)\n"
+                "(ceilings with the same material on the same plane).\n\n"
+                "Revit does not expose where the pattern sits or how it is rotated on each\n"
+                "ceiling, so for each group you will click TWO NEIGHBOURING GRID LINE\n"
+                "INTERSECTIONS along one grid line. Ceilings in a group whose edges run at\n"
+                "another angle are confirmed one by one.\n\n"
+                "Use the detected spacing?\n"
+                "(No calibrates these ceilings with three clicks each instead)".format(
+                    sum(len(ids) for ids in pattern_groups.values()), len(pattern_groups)),
+                title="Ceiling Grids From Surface Pattern",
+                ok=False,
+                yes=True,
+                no=True
+            )
+            if not use_patterns:
+                pattern_groups = {}
+
+        for group_key, ceiling_ids in sorted(pattern_groups.items()):
+            uncalibrated_ceilings.difference_update(ceiling_ids)
+            spacings = detected_grids[ceiling_ids[0]][:2]
+            group_grid = pick_pattern_grid("{} ceiling(s)".format(len(ceiling_ids)), spacings, inverse_transform)
+            if group_grid is None:
+                continue
+
+            for ceiling_id in sorted(ceiling_ids):
+                grid = group_grid
+                region = ceiling_index.get_region(ceiling_id)
+                edge_angle = dominant_edge_angle(region.loops) if region else None
+                if edge_angle is not None and angle_difference(edge_angle, grid[4]) > ANGLE_CONFIRM_TOLERANCE:
+                    angle_options = [
+                        "Use the picked grid ({:.1f} deg)".format(math.degrees(grid[4])),
+                        "Pick this ceiling's grid (edges at {:.1f} deg)".format(math.degrees(edge_angle)),
+                        "Skip this ceiling",
+                    ]
+                    choice = forms.CommandSwitchWindow.show(
+                        angle_options,
+                        message="Ceiling {}: its edges are not parallel to the picked grid.".format(ceiling_id)
+                    )
+                    if choice == angle_options[1]:
+                        grid = pick_pattern_grid("Ceiling {}".format(ceiling_id), spacings, inverse_transform)
+                    elif choice != angle_options[0]:
+                        grid = None
+                    if grid is None:
+                        continue
+
+                CEILING_GRID_OFFSETS[ceiling_id] = grid
+                calibration_store.set_ceiling_grid(link_doc, ceiling_index.ceilings[ceiling_id].UniqueId,
+                                                   grid, selected_link.name)
+                pattern_calibrated_count += 1
+            calibration_store.save()
+
     # Calibrate any uncalibrated ceilings
     if uncalibrated_ceilings:
         forms.alert(
             "Grid calibration needed:\n\n"
-            "You have fixtures on {} ceiling(s) that haven't been calibrated yet.\n\n"
-            "For each ceiling, you will click on TWO GRID LINE INTERSECTIONS.\n\n"
+            "You have fixtures on {} ceiling(s) that haven't been calibrated yet\n"
+            "and whose grid was not taken from the ceiling material's surface pattern.\n\n"
+            "For each ceiling, you will click on THREE GRID LINE INTERSECTIONS:\n"
+            "1. Any intersection\n"
+            "2. The next intersection ALONG one grid line\n"
+            "3. The next intersection from the first one ALONG the other grid line\n\n"
             "IMPORTANT: Zoom in close and click EXACTLY where grid lines cross!\n"
-            "Click on two intersections that are diagonally opposite (across one grid cell).".format(len(uncalibrated_ceilings))
+            "The first two clicks also set the grid rotation, so rotated grids work.".format(len(uncalibrated_ceilings))
         )
 
-        # Get the transform for coordinate conversion
-        link_transform = selected_link.GetTransform()
-        inverse_transform = link_transform.Inverse
-
         for ceiling_id in uncalibrated_ceilings:
             try:
-                # Let user pick two grid line intersections in HOST coordinates
+                # Let user pick three grid line intersections in HOST coordinates
                 intersection1_host = uidoc.Selection.PickPoint("Ceiling {}: Click EXACTLY on a GRID LINE INTERSECTION (zoom in!)".format(ceiling_id))
-                intersection2_host = uidoc.Selection.PickPoint("Ceiling {}: Click EXACTLY on ANOTHER INTERSECTION (diagonally opposite)".format(ceiling_id))
+                intersection2_host = uidoc.Selection.PickPoint("Ceiling {}: Click the NEXT INTERSECTION along one grid line".format(ceiling_id))
+                intersection3_host = uidoc.Selection.PickPoint("Ceiling {}: Click the NEXT INTERSECTION from the first one along the OTHER grid line".format(ceiling_id))
 
                 # Transform to LINK coordinates since the ceiling grid is in the linked file
                 intersection1_link = inverse_transform.OfPoint(intersection1_host)
                 intersection2_link = inverse_transform.OfPoint(intersection2_host)
+                intersection3_link = inverse_transform.OfPoint(intersection3_host)
 
-                # Calculate spacing from the two intersection points IN LINK COORDINATES
-                spacing_x = abs(intersection2_link.X - intersection1_link.X)
-                spacing_y = abs(intersection2_link.Y - intersection1_link.Y)
+                # Grid X axis runs from the first to the second intersection
+                dx = intersection2_link.X - intersection1_link.X
+                dy = intersection2_link.Y - intersection1_link.Y
+                grid_angle = math.atan2(dy, dx) % (math.pi / 2)
+
+                # Work in the grid frame: rotate the picked points by -angle
+                (x1, y1), (x2, y2), (x3, y3) = rotate_points(
+                    [(p.X, p.Y) for p in (intersection1_link, intersection2_link, intersection3_link)], -grid_angle)
+
+                # Calculate spacing from the intersection points IN GRID COORDINATES
+                # (after rotation, one pair differs in X only and the other in Y only)
+                spacing_x = max(abs(x2 - x1), abs(x3 - x1))
+                spacing_y = max(abs(y2 - y1), abs(y3 - y1))
 
                 # Validate spacing - should be reasonable values (not too small)
                 if spacing_x < 0.5 or spacing_y < 0.5:
-                    forms.alert("ERROR: Grid spacing too small ({:.2f}' x {:.2f}'). \nMake sure you clicked on TWO DIFFERENT intersections that are diagonally opposite.\nSkipping ceiling {}.".format(spacing_x, spacing_y, ceiling_id))
+                    forms.alert("ERROR: Grid spacing too small ({:.2f}' x {:.2f}'). \nMake sure you clicked on THREE DIFFERENT intersections, the second and third along different grid lines.\nSkipping ceiling {}.".format(spacing_x, spacing_y, ceiling_id))
                     continue
 
-                # Use intersection1 IN LINK COORDINATES as reference point for offset calculation
+                # Use intersection1 IN GRID COORDINATES as reference point for offset calculation
                 # The offset is where grid intersections fall relative to the coordinate system
-                grid_offset_x = intersection1_link.X % spacing_x
-                grid_offset_y = intersection1_link.Y % spacing_y
-
-                # Save for this ceiling (offset + spacing, ALL IN LINK COORDINATES)
-                CEILING_GRID_OFFSETS[ceiling_id] = (grid_offset_x, grid_offset_y, spacing_x, spacing_y)
-
-                # Save to config
-                offset_x_key = 'grid_offset_ceiling_{}_{}_{}'.format(selected_link.Name, ceiling_id, 'x')
-                offset_y_key = 'grid_offset_ceiling_{}_{}_{}'.format(selected_link.Name, ceiling_id, 'y')
-                spacing_x_key = 'grid_spacing_ceiling_{}_{}_{}'.format(selected_link.Name, ceiling_id, 'x')
-                spacing_y_key = 'grid_spacing_ceiling_{}_{}_{}'.format(selected_link.Name, ceiling_id, 'y')
-
-                setattr(config, offset_x_key, grid_offset_x)
-                setattr(config, offset_y_key, grid_offset_y)
-                setattr(config, spacing_x_key, spacing_x)
-                setattr(config, spacing_y_key, spacing_y)
-                script.save_config()
+                grid_offset_x = x1 % spacing_x
+                grid_offset_y = y1 % spacing_y
+
+                # Save for this ceiling (offset + spacing + rotation, ALL IN LINK COORDINATES)
+                CEILING_GRID_OFFSETS[ceiling_id] = (grid_offset_x, grid_offset_y, spacing_x, spacing_y, grid_angle)
+
+                calibration_store.set_ceiling_grid(link_doc, ceiling_index.ceilings[ceiling_id].UniqueId,
+                                                   CEILING_GRID_OFFSETS[ceiling_id], selected_link.name)
+                calibration_store.save()
             except Exception as calib_error:
                 forms.alert("Calibration cancelled. Skipping ceiling {}.".format(ceiling_id))
                 continue
 
-    # Start transaction
-    t = DB.Transaction(doc, "Center Lights in Grid")
-    t.Start()
-
-    success_count = 0
-    fail_count = 0
-
-    for fixture in lighting_fixtures:
-        success, ceiling_id = center_fixture_in_grid(fixture, selected_link)
-        if success:
-            success_count += 1
+    # Compute phase: target cell center for every fixture (no model changes)
+    compute_start = time.time()
+    placements, failed_fixtures = compute_fixture_placements(lighting_fixtures, ceiling_index)
+
+    # Fixtures that would be stacked on the same cell center
+    conflicts = find_cell_conflicts(placements)
+    compute_time = time.time() - compute_start
+
+    unresolved_conflicts = []
+    if conflicts:
+        report_cell_conflicts(conflicts)
+        stacked_count = sum(len(cell_placements) - 1 for cell_placements in conflicts)
+        push_fixtures = forms.alert(
+            "{} fixture(s) would be centered in a grid cell that already has a fixture "
+            "({} cell(s), listed in the output window).\n\n"
+            "Push the extra fixtures to the nearest free cell on the same ceiling?\n"
+            "(No centers them anyway, stacked on the same point)".format(stacked_count, len(conflicts)),
+            title="Grid Cell Conflicts",
+            ok=False,
+            yes=True,
+            no=True
+        )
+        if push_fixtures:
+            push_start = time.time()
+            unresolved_conflicts = push_to_free_cells(conflicts, placements, ceiling_index)
+            compute_time += time.time() - push_start
+
+    groups, unchanged_count = group_translations(placements)
+
+    # Apply phase: one MoveElements call per distinct translation, one transaction per chunk,
+    # all chunks in one transaction group (a single undo step; cancel rolls back the whole run)
+    apply_start = time.time()
+    moved_count = 0
+    fail_count = len(failed_fixtures)
+    processed_count = 0
+    cancelled = False
+
+    # Fixtures ordered by translation so each chunk keeps groups together
+    pending = [(key, fixture) for key in sorted(groups) for fixture in groups[key]]
+
+    if pending:
+        tg = DB.TransactionGroup(doc, "Center Lights in Grid")
+        tg.Start()
+        with forms.ProgressBar(title="Centering fixtures ({value} of {max_value})", cancellable=True) as pb:
+            for chunk_start in range(0, len(pending), CHUNK_SIZE):
+                if pb.cancelled:
+                    cancelled = True
+                    break
+
+                chunk_groups = {}
+                for key, fixture in pending[chunk_start:chunk_start + CHUNK_SIZE]:
+                    chunk_groups.setdefault(key, []).append(fixture)
+
+                t = DB.Transaction(doc, "Center Lights in Grid")
+                t.Start()
+                moved, failed = apply_translation_groups(chunk_groups)
+                t.Commit()
+                moved_count += moved
+                fail_count += failed
+
+                processed_count = min(chunk_start + CHUNK_SIZE, len(pending))
+                pb.update_progress(processed_count, len(pending))
+
+        if cancelled:
+            tg.RollBack()
+            moved_count = 0
+            fail_count = len(failed_fixtures)
         else:
-            fail_count += 1
+            tg.Assimilate()
 
-    t.Commit()
+    apply_time = time.time() - apply_start
 
     # Report results
-    message = "Centered {} fixture(s) successfully.".format(success_count)
+    message = "Centered {} fixture(s) successfully.".format(moved_count)
+    if cancelled:
+        message += "\nCancelled: all moves were rolled back, {} fixture(s) were left in place.".format(len(pending))
+    if unchanged_count > 0:
+        message += "\n{} fixture(s) were already centered.".format(unchanged_count)
+    if conflicts:
+        message += "\n{} grid cell(s) had more than one fixture.".format(len(conflicts))
+    if unresolved_conflicts:
+        message += "\n{} fixture(s) had no free cell nearby and share a cell.".format(len(unresolved_conflicts))
+    if pattern_calibrated_count > 0:
+        message += "\nGrid spacing read from surface pattern for {} ceiling(s).".format(pattern_calibrated_count)
     if fail_count > 0:
         message += "\n{} fixture(s) could not be centered (no ceiling grid found or not calibrated).".format(fail_count)
+    message += "\n\nCompute: {:.2f}s | Move: {:.2f}s ({} move group(s))".format(compute_time, apply_time, len(groups))
 
     forms.alert(message)
 
 except Exception as e:
     # Rollback transaction if it was started
-    if t and t.HasStarted():
+    if t and t.HasStarted() and not t.HasEnded():
         t.RollBack()
+    if tg and tg.HasStarted() and not tg.HasEnded():
+        tg.RollBack()
     forms.alert("An error occurred:\n{}".format(str(e)))
\ No newline at end of file
@@ -6,7 +6,9 @@
 
 pyRevit_tool_name = "Light\nFixture\nFlip"
 
-# Description : This tool will flip the work plane of selected light fixtures by type. 
+# Description : This tool will flip the work plane of selected light fixtures by type.
+#               Fixtures can be toggled or set to an explicit flipped / not flipped state,
+#               and type selections can be limited to chosen levels or views.
 
 # Author : Chris Berndt
 
@@ -24,8 +26,6 @@ pyRevit_tool_name = "Light\nFixture\nFlip"
 
 #######################
 
-import sys
-import os
 import time
 
 # Autodesk Revit Database
@@ -38,7 +38,7 @@ from System.Collections.Generic import List
 from pyrevit import script
 output = script.get_output()
 
-from pyrevit import revit, forms
+from pyrevit import forms
 
 # Error info
 import traceback
@@ -49,12 +49,16 @@ clr.AddReference('PresentationFramework')
 clr.AddReference('PresentationCore')
 import System
 from System.Windows import Window
-from System.Windows.Controls import Button, StackPanel, TextBlock, ScrollViewer, Border, Grid, RowDefinition, CheckBox, Expander
-from System.Windows import Thickness, HorizontalAlignment, VerticalAlignment
-from System.Windows.Media import Brushes, SolidColorBrush, Color
-from System.Windows.Input import ModifierKeys
+from System.Windows.Controls import Button, StackPanel, TextBlock, ScrollViewer, Grid, RowDefinition, CheckBox, Expander
+from System.Windows import Thickness, HorizontalAlignment
 import re
 
+# Shared virtualizing multi-select list
+from Snippets._selectable_list import SelectableItem, SelectableList, make_text_template
+
+# Shared lighting fixture selection (category-filtered picking and preselection)
+from Snippets._selection import get_selected_lighting_fixtures, pick_lighting_fixtures
+
 #######################
 
 #     _____ _                  ______  _____
@@ -156,47 +160,46 @@ class SelectionMethodWindow(Window):
         self.Close()
 
 
-class FixtureTypeData:
+class FixtureTypeData(SelectableItem):
     """Class to store fixture type selection state"""
-    def __init__(self, family_name, type_name, full_name, fixtures):
+    def __init__(self, type_key, family_name, type_name, full_name, fixtures):
+        # Show only type name (not full name) with count
+        SelectableItem.__init__(self, "{} ({} fixtures)".format(type_name, len(fixtures)))
+        self.type_key = type_key  # Type element ID (key in type_dict / host index)
         self.family_name = family_name
         self.type_name = type_name
         self.full_name = full_name  # "Family : Type"
         self.fixtures = fixtures
-        self.is_selected = False
-        self.row_border = None
         self.is_visible = True  # For filtering
         self.is_header = False  # True for family headers, False for type rows
 
 
-class FamilyHeaderData:
-    """Class to store family header information"""
+class FamilyHeaderData(SelectableItem):
+    """Class to store family header information (non-selectable row)"""
     def __init__(self, family_name):
+        SelectableItem.__init__(self, family_name, is_selectable=False)
         self.family_name = family_name
         self.is_header = True
         self.is_visible = True
-        self.row_border = None
 
 
 class FixtureTypeSelectionWindow(Window):
     """WPF Window for selecting fixture types with row-based selection"""
 
-    def __init__(self, type_dict, host_dict):
+    def __init__(self, type_dict, host_dict, host_index):
         self.type_dict = type_dict
         self.host_dict = host_dict  # Dictionary mapping host names to host info
+        self.host_index = host_index  # Dictionary mapping host names to sets of type keys
         self.selected_fixtures = []
+        self.selected_type_ids = []
         self.Title = "Select Light Fixture Types to Flip Work Plane"
         self.Width = 600
         self.Height = 650
         self.WindowStartupLocation = System.Windows.WindowStartupLocation.CenterScreen
 
-        # Track selection state
-        self.last_selected_index = -1
-        self.is_dragging = False
-        self.drag_start_selected = False
-
         # Track host checkboxes
         self.host_checkboxes = {}  # Dictionary mapping host names to checkbox controls
+        self.updating_host_checkboxes = False  # Suppress events fired by our own checkbox changes
 
         # Organize data by family
         families = {}
@@ -208,7 +211,7 @@ class FixtureTypeSelectionWindow(Window):
 
             if family_name not in families:
                 families[family_name] = []
-            families[family_name].append(FixtureTypeData(family_name, type_name, full_name, fixtures))
+            families[family_name].append(FixtureTypeData(key, family_name, type_name, full_name, fixtures))
 
         # Create display list with family headers and indented types
         self.all_display_items = []  # Mix of FamilyHeaderData and FixtureTypeData
@@ -304,23 +307,13 @@ class FixtureTypeSelectionWindow(Window):
         Grid.SetRow(instructions, 1)
         main_grid.Children.Add(instructions)
 
-        # Scrollable list of fixture types (dynamic height)
-        scroll = ScrollViewer()
-        scroll.VerticalScrollBarVisibility = System.Windows.Controls.ScrollBarVisibility.Auto
-
-        self.type_panel = StackPanel()
-        scroll.Content = self.type_panel
-
-        # Create all rows (headers + types)
-        for item in self.all_display_items:
-            if item.is_header:
-                row = self.create_family_header_row(item)
-            else:
-                row = self.create_type_row(item)
-            self.type_panel.Children.Add(row)
+        # Virtualizing list of fixture types (dynamic height), type rows indented under family headers
+        self.type_list = SelectableList(item_template=make_text_template(padding='25,5,5,5'),
+                                        keep_hidden_selection=False)
+        self.type_list.set_items(self.all_display_items)
 
-        Grid.SetRow(scroll, 2)
-        main_grid.Children.Add(scroll)
+        Grid.SetRow(self.type_list.control, 2)
+        main_grid.Children.Add(self.type_list.control)
 
         # Buttons
         button_panel = StackPanel()
@@ -358,245 +351,84 @@ class FixtureTypeSelectionWindow(Window):
         Grid.SetRow(button_panel, 3)
         main_grid.Children.Add(button_panel)
 
-        # Add mouse event handlers for drag selection
-        self.MouseMove += self.window_mouse_move
-        self.MouseLeftButtonUp += self.window_mouse_up
-
         self.Content = main_grid
 
     def host_filter_changed(self, sender, args):
         """Handle host filter checkbox changes"""
+        if self.updating_host_checkboxes:
+            return
+
         changed_checkbox = sender
         changed_host = changed_checkbox.Tag
 
-        # Special handling for "All Hosts" checkbox
-        if changed_host is None:  # "All Hosts" checkbox
-            if changed_checkbox.IsChecked:
-                # When "All Hosts" is checked, uncheck all other checkboxes
-                for host_name, checkbox in self.host_checkboxes.items():
-                    if host_name is not None:  # Not the "All Hosts" checkbox
-                        checkbox.IsChecked = False
-        else:
-            # When a specific host is checked, uncheck "All Hosts"
-            if changed_checkbox.IsChecked:
+        self.updating_host_checkboxes = True
+        try:
+            # Special handling for "All Hosts" checkbox
+            if changed_host is None:  # "All Hosts" checkbox
+                if changed_checkbox.IsChecked:
+                    # When "All Hosts" is checked, uncheck all other checkboxes
+                    for host_name, checkbox in self.host_checkboxes.items():
+                        if host_name is not None:  # Not the "All Hosts" checkbox
+                            checkbox.IsChecked = False
+            else:
+                # When a specific host is checked, uncheck "All Hosts"
+                if changed_checkbox.IsChecked:
+                    all_hosts_checkbox = self.host_checkboxes.get(None)
+                    if all_hosts_checkbox:
+                        all_hosts_checkbox.IsChecked = False
+
+            # Get all selected hosts
+            selected_hosts = [
+                host_name for host_name, checkbox in self.host_checkboxes.items()
+                if checkbox.IsChecked
+            ]
+
+            # If no hosts are selected, check "All Hosts" automatically
+            if not selected_hosts:
                 all_hosts_checkbox = self.host_checkboxes.get(None)
                 if all_hosts_checkbox:
-                    all_hosts_checkbox.IsChecked = False
-
-        # Get all selected hosts
-        selected_hosts = [
-            host_name for host_name, checkbox in self.host_checkboxes.items()
-            if checkbox.IsChecked
-        ]
-
-        # If no hosts are selected, check "All Hosts" automatically
-        if not selected_hosts:
-            all_hosts_checkbox = self.host_checkboxes.get(None)
-            if all_hosts_checkbox:
-                all_hosts_checkbox.IsChecked = True
-            selected_hosts = [None]
-
-        # Update visibility for all type data
+                    all_hosts_checkbox.IsChecked = True
+                selected_hosts = [None]
+        finally:
+            self.updating_host_checkboxes = False
+
+        # Visible type keys are the union of the selected hosts' type sets
+        show_all = None in selected_hosts
+        visible_keys = set()
+        if not show_all:
+            for host_name in selected_hosts:
+                visible_keys |= self.host_index.get(host_name, set())
+
+        # Update visibility for type data and collect families that still have visible types
+        visible_families = set()
         for type_data in self.fixture_type_data:
-            if None in selected_hosts:
-                # "All Hosts" is selected - show all
-                type_data.is_visible = True
-            else:
-                # Check if any fixture in this type has any of the selected hosts
-                type_data.is_visible = any(
-                    self.get_fixture_host_name(fixture) in selected_hosts
-                    for fixture in type_data.fixtures
-                )
+            type_data.is_visible = show_all or type_data.type_key in visible_keys
+            if type_data.is_visible:
+                visible_families.add(type_data.family_name)
 
-        # Update visibility for family headers (show if any child type is visible)
+        # Family headers are shown if any child type is visible
         for item in self.all_display_items:
             if item.is_header:
-                # Check if any types under this family are visible
-                family_name = item.family_name
-                item.is_visible = any(
-                    td.is_visible and td.family_name == family_name
-                    for td in self.fixture_type_data
-                )
-
-        # Rebuild panel with visible items
-        self.type_panel.Children.Clear()
-        for item in self.all_display_items:
-            if item.is_visible:
-                if item.is_header:
-                    row = self.create_family_header_row(item)
-                else:
-                    row = self.create_type_row(item)
-                self.type_panel.Children.Add(row)
-
-    def get_fixture_host_name(self, fixture):
-        """Get the host name for a fixture"""
-        try:
-            host = fixture.Host
-            if host:
-                # Get host element name and category
-                host_category = host.Category.Name if host.Category else "Unknown"
-                host_name = DB.Element.Name.GetValue(host) if hasattr(host, 'Name') else str(host.Id.IntegerValue)
-                return "{}: {}".format(host_category, host_name)
-        except:
-            pass
-        return "No Host"
-
-    def create_family_header_row(self, header_data):
-        """Create a non-selectable header row for a family"""
-        row_border = Border()
-        row_border.BorderThickness = Thickness(0, 1, 0, 0)
-        row_border.BorderBrush = Brushes.Gray
-        row_border.Padding = Thickness(5, 8, 5, 5)
-        row_border.Margin = Thickness(0, 5, 0, 2)
-        row_border.Background = SolidColorBrush(Color.FromRgb(240, 240, 240))  # Light gray
-
-        # Store reference for updates
-        header_data.row_border = row_border
-
-        # Family name text (bold)
-        text_block = TextBlock()
-        text_block.Text = header_data.family_name
-        text_block.FontWeight = System.Windows.FontWeights.Bold
-        text_block.FontSize = 12
-        text_block.VerticalAlignment = VerticalAlignment.Center
-        row_border.Child = text_block
-
-        return row_border
-
-    def create_type_row(self, type_data):
-        """Create a selectable row for a fixture type (indented under family)"""
-        row_border = Border()
-        row_border.BorderThickness = Thickness(0)
-        row_border.Padding = Thickness(25, 5, 5, 5)  # Indent from left
-        row_border.Margin = Thickness(0, 1, 0, 1)
-        row_border.Tag = type_data
-        row_border.MouseLeftButtonDown += self.row_click
-
-        # Store reference for updates
-        type_data.row_border = row_border
-
-        # Update appearance based on selection
-        self.update_row_appearance(type_data)
-
-        # Type name text - show only type name (not full name) with count
-        text_block = TextBlock()
-        text_block.Text = "{} ({} fixtures)".format(type_data.type_name, len(type_data.fixtures))
-        text_block.VerticalAlignment = VerticalAlignment.Center
-        row_border.Child = text_block
-
-        return row_border
-
-    def row_click(self, sender, args):
-        """Handle row click with Shift/Ctrl support and start drag selection"""
-        clicked_row = sender
-        clicked_type_data = clicked_row.Tag
-
-        # Only handle type rows (not family headers)
-        if not isinstance(clicked_type_data, FixtureTypeData):
-            return
+                item.is_visible = item.family_name in visible_families
 
-        # Get list of currently visible type items (not headers)
-        visible_items = [td for td in self.fixture_type_data if td.is_visible]
-
-        # Get the index of clicked row in visible list
-        clicked_index = visible_items.index(clicked_type_data)
-
-        # Get modifier keys
-        modifiers = System.Windows.Input.Keyboard.Modifiers
-
-        if modifiers == ModifierKeys.Control:
-            # Ctrl+Click: Toggle selection of clicked row
-            clicked_type_data.is_selected = not clicked_type_data.is_selected
-            self.last_selected_index = clicked_index
-            self.update_row_appearance(clicked_type_data)
-            # Start drag in toggle mode
-            self.is_dragging = True
-            self.drag_start_selected = clicked_type_data.is_selected
-
-        elif modifiers == ModifierKeys.Shift and self.last_selected_index >= 0:
-            # Shift+Click: Select range from last selected to current in visible items
-            start_index = min(self.last_selected_index, clicked_index)
-            end_index = max(self.last_selected_index, clicked_index)
-
-            for i in range(start_index, end_index + 1):
-                visible_items[i].is_selected = True
-                self.update_row_appearance(visible_items[i])
-
-        else:
-            # Normal click: Select only this row, deselect others
-            for type_data in self.fixture_type_data:
-                type_data.is_selected = False
-                self.update_row_appearance(type_data)
-
-            clicked_type_data.is_selected = True
-            self.last_selected_index = clicked_index
-            self.update_row_appearance(clicked_type_data)
-            # Start drag in select mode
-            self.is_dragging = True
-            self.drag_start_selected = True
-
-        args.Handled = True
-
-    def window_mouse_move(self, sender, args):
-        """Handle mouse move for drag selection"""
-        if not self.is_dragging:
-            return
-
-        # Get the element under the mouse
-        element = self.InputHitTest(args.GetPosition(self))
-        if element is None:
-            return
-
-        # Find the row border by traversing up the visual tree
-        current = element
-        while current is not None:
-            if isinstance(current, Border) and hasattr(current, 'Tag'):
-                # Only handle type rows, not headers
-                if isinstance(current.Tag, FixtureTypeData):
-                    type_data = current.Tag
-                    type_data.is_selected = self.drag_start_selected
-                    self.update_row_appearance(type_data)
-                break
-            # Move up the visual tree
-            try:
-                current = System.Windows.Media.VisualTreeHelper.GetParent(current)
-            except:
-                break
-
-    def window_mouse_up(self, sender, args):
-        """Handle mouse up to end drag selection"""
-        self.is_dragging = False
-
-    def update_row_appearance(self, type_data):
-        """Update row background based on selection state"""
-        if type_data.row_border is None:
-            return
-
-        if type_data.is_selected:
-            # Selected row - highlight with blue
-            type_data.row_border.Background = SolidColorBrush(Color.FromRgb(173, 216, 230))  # Light blue
-        else:
-            # Not selected - white
-            type_data.row_border.Background = Brushes.White
+        # Show visible items (rows are virtualized, nothing is rebuilt)
+        self.type_list.set_items([item for item in self.all_display_items if item.is_visible])
 
     def select_all_click(self, sender, args):
-        """Select all fixture types"""
-        for type_data in self.fixture_type_data:
-            type_data.is_selected = True
-            self.update_row_appearance(type_data)
+        """Select all visible fixture types"""
+        self.type_list.select_all()
 
     def deselect_all_click(self, sender, args):
-        """Deselect all fixture types"""
-        for type_data in self.fixture_type_data:
-            type_data.is_selected = False
-            self.update_row_appearance(type_data)
+        """Deselect all visible fixture types"""
+        self.type_list.deselect_all()
 
     def flip_click(self, sender, args):
         """Flip selected fixture types"""
         self.selected_fixtures = []
-        for type_data in self.fixture_type_data:
-            if type_data.is_selected:
-                self.selected_fixtures.extend(type_data.fixtures)
+        self.selected_type_ids = []
+        for type_data in self.type_list.get_selected():
+            self.selected_fixtures.extend(type_data.fixtures)
+            self.selected_type_ids.append(self.type_dict[type_data.type_key]['type_id'])
 
         if self.selected_fixtures:
             self.DialogResult = True
@@ -637,79 +469,147 @@ def get_all_light_fixtures(doc):
         .WhereElementIsNotElementType()
     return list(collector)
 
+# Get display name of a fixture's host
+def get_fixture_host_name(fixture, host_name_cache=None):
+    """
+    Returns "Category: Name" for the fixture's host, or "No Host".
+    host_name_cache: optional dictionary of host element ID -> name, so each host is only read once
+    """
+    try:
+        host = fixture.Host
+        if host:
+            host_id = host.Id.IntegerValue
+            if host_name_cache is not None and host_id in host_name_cache:
+                return host_name_cache[host_id]
+
+            # Get host element name and category
+            host_category = host.Category.Name if host.Category else "Unknown"
+            host_name = DB.Element.Name.GetValue(host) if hasattr(host, 'Name') else str(host_id)
+            full_host_name = "{}: {}".format(host_category, host_name)
+
+            if host_name_cache is not None:
+                host_name_cache[host_id] = full_host_name
+            return full_host_name
+    except:
+        pass
+    return "No Host"
+
 # Get light fixture types from elements and collect hosts
 def get_fixture_types_and_hosts(fixtures):
     """
-    Returns a tuple of (type_dict, host_dict)
-    type_dict: dictionary with keys as unique type IDs, values as dict with 'family', 'type', 'full_name', 'fixtures'
+    Returns a tuple of (type_dict, host_dict, host_index)
+    type_dict: dictionary with keys as unique type IDs, values as dict with 'type_id', 'family', 'type', 'full_name', 'fixtures'
     host_dict: dictionary of host names to host elements
+    host_index: dictionary of host names to sets of type keys (inverted index used by the host filter)
     """
     type_dict = {}
     host_dict = {}
+    host_index = {}
+    host_name_cache = {}
 
     for fixture in fixtures:
+        unique_key = None
+
         # Get type information
         type_id = fixture.GetTypeId()
         if type_id != DB.ElementId.InvalidElementId:
-            fixture_type = fixture.Document.GetElement(type_id)
-            if fixture_type:
-                # Get family name directly from the family
-                family_name = fixture_type.FamilyName
-
-                # Get type name from the type element
-                type_name = DB.Element.Name.GetValue(fixture_type)
+            # Use a unique key (type element ID) to avoid duplicates
+            unique_key = type_id.IntegerValue
 
-                # Create full name for display/reference
-                full_name = "{} : {}".format(family_name, type_name)
+            if unique_key not in type_dict:
+                fixture_type = fixture.Document.GetElement(type_id)
+                if fixture_type:
+                    # Get family name directly from the family
+                    family_name = fixture_type.FamilyName
 
-                # Use a unique key (type element ID) to avoid duplicates
-                unique_key = type_id.IntegerValue
+                    # Get type name from the type element
+                    type_name = DB.Element.Name.GetValue(fixture_type)
 
-                # Add to type dictionary
-                if unique_key not in type_dict:
+                    # Add to type dictionary with full name for display/reference
                     type_dict[unique_key] = {
+                        'type_id': type_id,
                         'family': family_name,
                         'type': type_name,
-                        'full_name': full_name,
+                        'full_name': "{} : {}".format(family_name, type_name),
                         'fixtures': []
                     }
-                type_dict[unique_key]['fixtures'].append(fixture)
 
-        # Collect host information
-        try:
-            host = fixture.Host
-            if host:
-                # Get host element name and category
-                host_category = host.Category.Name if host.Category else "Unknown"
-                host_name = DB.Element.Name.GetValue(host) if hasattr(host, 'Name') else str(host.Id.IntegerValue)
-                full_host_name = "{}: {}".format(host_category, host_name)
-
-                if full_host_name not in host_dict:
-                    host_dict[full_host_name] = host
+            if unique_key in type_dict:
+                type_dict[unique_key]['fixtures'].append(fixture)
             else:
-                # No host - add to dictionary
-                if "No Host" not in host_dict:
-                    host_dict["No Host"] = None
-        except:
-            # Error getting host - add to "No Host" category
-            if "No Host" not in host_dict:
-                host_dict["No Host"] = None
+                unique_key = None
+
+        # Collect host information (resolved once per fixture, once per host element)
+        full_host_name = get_fixture_host_name(fixture, host_name_cache)
+        if full_host_name not in host_dict:
+            host_dict[full_host_name] = fixture.Host if full_host_name != "No Host" else None
+            host_index[full_host_name] = set()
+
+        if unique_key is not None:
+            host_index[full_host_name].add(unique_key)
+
+    return type_dict, host_dict, host_index
 
-    return type_dict, host_dict
+# Combine element filters with OR (a single filter is returned as is)
+def combine_filters_or(filters):
+    if len(filters) == 1:
+        return filters[0]
+    return DB.LogicalOrFilter(List[DB.ElementFilter](filters))
+
+# Filter matching instances of any of the given fixture types
+def get_type_filter(doc, type_ids):
+    return combine_filters_or([DB.FamilyInstanceFilter(doc, type_id) for type_id in type_ids])
+
+# Get fixtures of the chosen types on the chosen levels
+def get_fixtures_on_levels(doc, type_ids, levels):
+    """
+    Single collector pass: (type A or type B ...) and (level 1 or level 2 ...)
+    """
+    level_filter = combine_filters_or([DB.ElementLevelFilter(level.Id) for level in levels])
+    collector = DB.FilteredElementCollector(doc)\
+        .OfCategory(DB.BuiltInCategory.OST_LightingFixtures)\
+        .WhereElementIsNotElementType()\
+        .WherePasses(DB.LogicalAndFilter(get_type_filter(doc, type_ids), level_filter))
+    return list(collector)
+
+# Get fixtures of the chosen types visible in the chosen views
+def get_fixtures_in_views(doc, type_ids, views):
+    """
+    One view-scoped collector per view, fixtures shown in several views are only returned once
+    """
+    type_filter = get_type_filter(doc, type_ids)
+    fixtures = {}
+    for view in views:
+        collector = DB.FilteredElementCollector(doc, view.Id)\
+            .OfCategory(DB.BuiltInCategory.OST_LightingFixtures)\
+            .WhereElementIsNotElementType()\
+            .WherePasses(type_filter)
+        for fixture in collector:
+            fixtures[fixture.Id.IntegerValue] = fixture
+    return list(fixtures.values())
+
+# Flip results
+FLIPPED = 'flipped'
+UNCHANGED = 'unchanged'
+SKIPPED = 'skipped'
 
 # Flip work plane for a single element
-def flip_work_plane(element):
+def flip_work_plane(element, target_state=None):
     """
     Flips the work plane of a family instance.
-    Toggles the IsWorkPlaneFlipped property.
+    target_state None toggles the IsWorkPlaneFlipped property,
+    True/False sets it and leaves fixtures already in that state untouched.
+    Returns FLIPPED, UNCHANGED or SKIPPED (work plane flip not supported).
     """
     if isinstance(element, DB.FamilyInstance):
         # Check if the element can be flipped
         if element.CanFlipWorkPlane:
-            # Toggle the work plane flip state
-            element.IsWorkPlaneFlipped = not element.IsWorkPlaneFlipped
-            return True
-    return False
+            current_state = element.IsWorkPlaneFlipped
+            if target_state is not None and current_state == target_state:
+                return UNCHANGED
+            element.IsWorkPlaneFlipped = not current_state
+            return FLIPPED
+    return SKIPPED
 
 #######################
 
@@ -725,6 +625,29 @@ def flip_work_plane(element):
 
 start_time = time.time()
 
+# Scopes offered after picking fixture types
+SCOPE_OPTIONS = [
+    "Whole Model",
+    "On Selected Levels",
+    "Visible in Selected Views",
+]
+
+# Flip modes: None toggles, True/False sets IsWorkPlaneFlipped explicitly
+FLIP_MODE_OPTIONS = ["Toggle", "Set Flipped", "Set Not Flipped"]
+FLIP_MODES = {
+    "Toggle": None,
+    "Set Flipped": True,
+    "Set Not Flipped": False,
+}
+
+# Views that can be used for the view scope
+PLAN_VIEW_TYPES = [
+    DB.ViewType.FloorPlan,
+    DB.ViewType.CeilingPlan,
+    DB.ViewType.EngineeringPlan,
+    DB.ViewType.AreaPlan,
+]
+
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
 
@@ -744,12 +667,7 @@ try:
     fixtures_to_flip = []
 
     # Check for pre-selected light fixtures
-    current_selection = uidoc.Selection.GetElementIds()
-    if current_selection.Count > 0:
-        for elem_id in current_selection:
-            element = doc.GetElement(elem_id)
-            if element and element.Category and element.Category.Id.IntegerValue == int(DB.BuiltInCategory.OST_LightingFixtures):
-                fixtures_to_flip.append(element)
+    fixtures_to_flip = get_selected_lighting_fixtures()
 
     # If no light fixtures pre-selected, show selection options
     if not fixtures_to_flip:
@@ -768,33 +686,50 @@ try:
                 forms.alert("No light fixtures found in the model.", title="Light Fixture Flip")
             else:
                 # Get fixture types dictionary and hosts
-                type_dict, host_dict = get_fixture_types_and_hosts(all_fixtures)
+                type_dict, host_dict, host_index = get_fixture_types_and_hosts(all_fixtures)
 
                 if not type_dict:
                     forms.alert("No valid light fixture types found.", title="Light Fixture Flip")
                 else:
                     # Show custom fixture type selection window
-                    type_selection_window = FixtureTypeSelectionWindow(type_dict, host_dict)
+                    type_selection_window = FixtureTypeSelectionWindow(type_dict, host_dict, host_index)
                     result = type_selection_window.ShowDialog()
 
                     if result and type_selection_window.selected_fixtures:
-                        fixtures_to_flip = type_selection_window.selected_fixtures
+                        # Choose where to look for the selected types
+                        scope = forms.CommandSwitchWindow.show(
+                            SCOPE_OPTIONS,
+                            message="Flip fixtures of the selected types in:"
+                        )
+
+                        if scope == SCOPE_OPTIONS[0]:
+                            fixtures_to_flip = type_selection_window.selected_fixtures
+
+                        elif scope == SCOPE_OPTIONS[1]:
+                            levels = forms.select_levels(title="Select Levels", multiple=True)
+                            if levels:
+                                fixtures_to_flip = get_fixtures_on_levels(
+                                    doc, type_selection_window.selected_type_ids, levels)
+
+                        elif scope == SCOPE_OPTIONS[2]:
+                            views = forms.select_views(
+                                title="Select Views",
+                                multiple=True,
+                                filterfunc=lambda v: v.ViewType in PLAN_VIEW_TYPES
+                            )
+                            if views:
+                                fixtures_to_flip = get_fixtures_in_views(
+                                    doc, type_selection_window.selected_type_ids, views)
+
+                        if scope and not fixtures_to_flip:
+                            forms.alert("No light fixtures of the selected types found in that scope.",
+                                        title="Light Fixture Flip")
 
         elif method_window.selection_method == 'Pick in View':
             # Let user pick fixtures in the view
             try:
-                # Create a selection filter for lighting fixtures
-                selection_filter = DB.ElementCategoryFilter(DB.BuiltInCategory.OST_LightingFixtures)
-
-                selected_refs = uidoc.Selection.PickObjects(
-                    UI.Selection.ObjectType.Element,
-                    'Select light fixtures to flip (press Finish when done)'
-                )
-
-                for ref in selected_refs:
-                    element = doc.GetElement(ref.ElementId)
-                    if element and element.Category.Id.IntegerValue == int(DB.BuiltInCategory.OST_LightingFixtures):
-                        fixtures_to_flip.append(element)
+                # Selection filter only lets lighting fixtures be picked or box-selected
+                fixtures_to_flip = pick_lighting_fixtures('Select light fixtures to flip (press Finish when done)')
 
                 if not fixtures_to_flip:
                     forms.alert("No light fixtures were selected.", title="Light Fixture Flip")
@@ -808,26 +743,35 @@ try:
 
     # Flip the fixtures if any were selected
     if fixtures_to_flip:
-        # Count for results
-        flipped_count = 0
-        skipped_count = 0
+        # Toggle, or set an explicit state so re-runs only touch fixtures that differ
+        mode = forms.CommandSwitchWindow.show(
+            FLIP_MODE_OPTIONS,
+            message="Work plane flip mode for {} fixture(s):".format(len(fixtures_to_flip))
+        )
 
-        # Start Transaction
-        t = DB.Transaction(doc, 'Flip Light Fixture Work Planes')
-        t.Start()
+        if mode:
+            target_state = FLIP_MODES[mode]
 
-        for fixture in fixtures_to_flip:
-            if flip_work_plane(fixture):
-                flipped_count += 1
-            else:
-                skipped_count += 1
+            # Count for results
+            counts = {FLIPPED: 0, UNCHANGED: 0, SKIPPED: 0}
 
-        # End Transaction
-        t.Commit()
+            # One transaction for all fixtures
+            t = DB.Transaction(doc, 'Flip Light Fixture Work Planes')
+            t.Start()
 
-        # Only show dialog if no fixtures were flipped
-        if flipped_count == 0:
-            forms.alert("No fixtures could be flipped (work plane flip not supported).", title="Light Fixture Flip")
+            for fixture in fixtures_to_flip:
+                counts[flip_work_plane(fixture, target_state)] += 1
+
+            # End Transaction
+            t.Commit()
+
+            # Only show dialog if no fixtures were flipped
+            if counts[FLIPPED] == 0:
+                if counts[UNCHANGED]:
+                    forms.alert("All {} fixture(s) were already in the requested state.".format(counts[UNCHANGED]),
+                                title="Light Fixture Flip")
+                else:
+                    forms.alert("No fixtures could be flipped (work plane flip not supported).", title="Light Fixture Flip")
 
 except Exception as ex:
     details = traceback.format_exc()
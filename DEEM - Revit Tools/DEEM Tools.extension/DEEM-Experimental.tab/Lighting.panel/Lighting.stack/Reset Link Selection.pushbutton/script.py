@@ -1,11 +1,38 @@
 """Reset the saved linked file selection for Center Lights tool"""
 __title__ = "Reset Link\nSelection"
 __author__ = "Christopher Berndt"
-__doc__ = "Clears the saved linked file selection. Next time you run Center Lights, you'll be prompted to select a link."
+__doc__ = "Clears the saved linked file selection and the grid calibration of the chosen links. Next time you run Center Lights, you'll be prompted to select a link."
 
-from pyrevit import script, forms
+from pyrevit import revit, script, forms
+from Snippets._calibration import CalibrationStore, get_legacy_attributes
+from Snippets._links import LinkRegistry
 
-# Clear the saved link selection and all grid offsets
+
+class LinkOption(forms.TemplateListItem):
+    """(link key, link name) list entry; links sharing a name are told apart by key"""
+
+    def __init__(self, link_key, link_name, label):
+        forms.TemplateListItem.__init__(self, (link_key, link_name))
+        self.label = label
+
+    @property
+    def name(self):
+        return self.label
+
+
+def delete_attributes(config, attr_names):
+    """Delete config attributes, returns how many were deleted"""
+    deleted = 0
+    for attr_name in attr_names:
+        try:
+            delattr(config, attr_name)
+            deleted += 1
+        except Exception as e:
+            print("ERROR deleting {}: {}".format(attr_name, str(e)))
+    return deleted
+
+
+# Clear the saved link selection and grid calibrations
 # Use the same shared config section as the main tool
 config = script.get_config(section='LightCenterTool')
 
@@ -16,32 +43,74 @@ print("=" * 60)
 # Clear link selection
 old_link_name = getattr(config, 'selected_link_name', None)
 config.selected_link_name = None
+config.selected_link_key = None
 print("Cleared link selection: {}".format(old_link_name if old_link_name else "(none)"))
 
-# Clear all grid offset and spacing configurations
+# Choose which links to clear calibration for (one entry per link in the store)
+calibration_store = CalibrationStore()
+link_names = calibration_store.get_link_names()
+
+# Show the current name of links loaded in this model (stored names may be out of date)
+for document_key, link in LinkRegistry(revit.doc).documents().items():
+    if document_key in link_names:
+        link_names[document_key] = link.name
+
 cleared_count = 0
-cleared_items = []
+cleared_links = []
+legacy_count = 0
 
-for attr_name in dir(config):
-    if attr_name.startswith('grid_offset_') or attr_name.startswith('grid_spacing_'):
-        try:
-            delattr(config, attr_name)
-            cleared_items.append(attr_name)
-            cleared_count += 1
-        except Exception as e:
-            print("ERROR deleting {}: {}".format(attr_name, str(e)))
+if link_names:
+    # Options carry the link key, so two links with the same name are cleared separately
+    name_counts = {}
+    for link_name in link_names.values():
+        name_counts[link_name] = name_counts.get(link_name, 0) + 1
+    options = sorted(
+        (LinkOption(link_key, link_name,
+                    link_name if name_counts[link_name] == 1 else "{}  [{}]".format(link_name, link_key))
+         for link_key, link_name in link_names.items()),
+        key=lambda option: option.name
+    )
+    selected = forms.SelectFromList.show(
+        options,
+        title="Clear Grid Calibration",
+        button_name="Clear Calibration",
+        multiselect=True
+    ) or []
+
+    for link_key, link_name in selected:
+        cleared_count += calibration_store.reset_link(link_key)
+        cleared_links.append(link_name)
+        # Calibrations saved as flat config attributes by older versions of the tool
+        legacy_count += delete_attributes(config, get_legacy_attributes(config, link_name))
+
+    if cleared_links:
+        calibration_store.save()
+
+# Old flat config calibrations of other links are only purged when confirmed
+other_legacy = get_legacy_attributes(config)
+if other_legacy and forms.alert(
+        "{} calibration parameter(s) saved by an older version of Center Lights\n"
+        "belong to links that were not selected.\n\n"
+        "Delete them as well?".format(len(other_legacy)),
+        title="Clear Grid Calibration",
+        yes=True,
+        no=True):
+    legacy_count += delete_attributes(config, other_legacy)
 
-print("\nCleared {} calibration parameter(s):".format(cleared_count))
-for item in sorted(cleared_items):
-    print("  - {}".format(item))
+print("\nCleared {} ceiling calibration(s) from {} link(s):".format(cleared_count, len(cleared_links)))
+for link_name in sorted(cleared_links):
+    print("  - {}".format(link_name))
+if legacy_count:
+    print("Cleared {} legacy calibration parameter(s).".format(legacy_count))
 
 script.save_config()
 print("\nConfiguration saved.")
 print("=" * 60)
 
 forms.alert(
-    "Link selection and grid calibration have been reset.\n\n"
+    "Link selection has been reset.\n"
+    "Grid calibration cleared for {} link(s).\n\n"
     "Next time you run 'Center Lights In Grid', you will be prompted to:\n"
     "1. Select a linked file\n"
-    "2. Calibrate the grid by clicking a reference point"
+    "2. Calibrate the grid of any uncalibrated ceilings".format(len(cleared_links))
 )
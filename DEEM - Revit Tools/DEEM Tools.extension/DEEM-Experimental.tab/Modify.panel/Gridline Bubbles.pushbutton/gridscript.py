@@ -2,27 +2,29 @@
 """
 Grid Bubble Control
 Control visibility of grid bubbles for individual gridlines in the active view.
+Also copies the active view's 2D grid extents to other parallel views in one pass.
 """
 
 __title__ = "Gridline\nBubbles"
 __author__ = "DEEM"
 
-from pyrevit import revit, DB, UI, forms, script
-from System.Collections.Generic import List
+from pyrevit import revit, DB, forms
 import clr
 clr.AddReference('PresentationFramework')
 clr.AddReference('PresentationCore')
 import System
-from System.Windows import Window, Application
-from System.Windows.Controls import CheckBox, Button, StackPanel, WrapPanel, TextBlock, ScrollViewer, Grid, Border, ComboBox
+from System.Windows import Window, RoutedEventHandler
+from System.Windows.Controls import CheckBox, Button, StackPanel, WrapPanel, TextBlock, Grid, ComboBox
 from System.Windows.Controls import RowDefinition, ColumnDefinition
+from System.Windows.Controls.Primitives import ButtonBase
 from System.Windows import Thickness, HorizontalAlignment, VerticalAlignment
-from System.Windows.Media import Brushes, SolidColorBrush, Color
-from System.Windows.Input import ModifierKeys
+from System.Windows.Media import Brushes
 from System.Windows.Threading import DispatcherTimer
-from System import Func, TimeSpan
+from System import TimeSpan
 import re
 
+from Snippets._selectable_list import SelectableItem, SelectableList, make_row_template
+
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
 active_view = doc.ActiveView
@@ -39,9 +41,41 @@ def natural_sort_key(text):
     return [atoi(c) for c in re.split(r'(\d+)', text)]
 
 
-class GridBubbleData:
+# Row layout for the grid table (column widths match the sticky header)
+GRID_ROW_TEMPLATE = """
+<Grid>
+    <Grid.Resources>
+        <Style TargetType="CheckBox">
+            <Setter Property="HorizontalAlignment" Value="Center"/>
+            <Setter Property="VerticalAlignment" Value="Center"/>
+            <Setter Property="Margin" Value="5"/>
+            <Style.Triggers>
+                <Trigger Property="IsEnabled" Value="False">
+                    <Setter Property="Opacity" Value="0.3"/>
+                </Trigger>
+            </Style.Triggers>
+        </Style>
+    </Grid.Resources>
+    <Grid.ColumnDefinitions>
+        <ColumnDefinition Width="120"/>
+        <ColumnDefinition Width="80"/>
+        <ColumnDefinition Width="80"/>
+        <ColumnDefinition Width="80"/>
+        <ColumnDefinition Width="80"/>
+    </Grid.ColumnDefinitions>
+    <TextBlock Grid.Column="0" Text="{Binding name}" Margin="5" VerticalAlignment="Center"/>
+    <CheckBox Grid.Column="1" Tag="left" IsEnabled="{Binding is_horizontal, Mode=OneTime}" IsChecked="{Binding left_checked, Mode=TwoWay}"/>
+    <CheckBox Grid.Column="2" Tag="right" IsEnabled="{Binding is_horizontal, Mode=OneTime}" IsChecked="{Binding right_checked, Mode=TwoWay}"/>
+    <CheckBox Grid.Column="3" Tag="top" IsEnabled="{Binding is_vertical, Mode=OneTime}" IsChecked="{Binding top_checked, Mode=TwoWay}"/>
+    <CheckBox Grid.Column="4" Tag="bottom" IsEnabled="{Binding is_vertical, Mode=OneTime}" IsChecked="{Binding bottom_checked, Mode=TwoWay}"/>
+</Grid>
+"""
+
+
+class GridBubbleData(SelectableItem):
     """Class to store grid and its bubble visibility settings"""
     def __init__(self, grid, view):
+        SelectableItem.__init__(self, grid.Name)
         self.grid = grid
         self.view = view
         self.name = grid.Name
@@ -68,51 +102,79 @@ class GridBubbleData:
         dy = abs(end.Y - start.Y)
 
         self.is_vertical = dx < dy
+        self.is_horizontal = not self.is_vertical
+
+        # Checkbox states bound to the row checkboxes
+        # For horizontal grids: Left = End1, Right = End0 (swapped mapping)
+        # For vertical grids: Top = End0, Bottom = End1 (fixed mapping)
+        self.left_checked = self.end1_visible if self.is_horizontal else False
+        self.right_checked = self.end0_visible if self.is_horizontal else False
+        self.top_checked = self.end0_visible if self.is_vertical else False
+        self.bottom_checked = self.end1_visible if self.is_vertical else False
+
+    @forms.reactive
+    def left_checked(self):
+        return self._left_checked
+
+    @left_checked.setter
+    def left_checked(self, value):
+        self._left_checked = value
+
+    @forms.reactive
+    def right_checked(self):
+        return self._right_checked
 
-        # Store checkboxes references for all directions
-        self.check_left = None
-        self.check_right = None
-        self.check_top = None
-        self.check_bottom = None
+    @right_checked.setter
+    def right_checked(self, value):
+        self._right_checked = value
 
-        # Row selection state (no checkbox needed)
-        self.is_selected = False
+    @forms.reactive
+    def top_checked(self):
+        return self._top_checked
 
-        # Row grid reference for appearance updates
-        self.row_grid = None
+    @top_checked.setter
+    def top_checked(self, value):
+        self._top_checked = value
 
+    @forms.reactive
+    def bottom_checked(self):
+        return self._bottom_checked
 
-class ViewData:
+    @bottom_checked.setter
+    def bottom_checked(self, value):
+        self._bottom_checked = value
+
+    def is_column_enabled(self, column):
+        """Left/Right apply to horizontal grids, Top/Bottom to vertical grids"""
+        if column in ('left', 'right'):
+            return self.is_horizontal
+        return self.is_vertical
+
+
+class ViewData(SelectableItem):
     """Class to store view selection state"""
     def __init__(self, view_name, view):
+        SelectableItem.__init__(self, view_name)
         self.view_name = view_name
         self.view = view
-        self.is_selected = False
-        self.row_border = None  # Reference to the row UI element
 
 
 class ViewSelectionWindow(Window):
     """WPF Window for selecting views with type filtering"""
 
-    def __init__(self, views_dict):
+    def __init__(self, views_dict, title="Select Views to Apply Grid Bubble Settings"):
         self.views_dict = views_dict  # Dict of {view_name: view}
         self.selected_views = []
-        self.Title = "Select Views to Apply Grid Bubble Settings"
+        self.Title = title
         self.Width = 500
         self.Height = 600
         self.WindowStartupLocation = System.Windows.WindowStartupLocation.CenterScreen
 
-        # Track selection state
-        self.last_selected_index = -1
-        self.is_dragging = False
-        self.drag_start_selected = False
-
-        # Create view data objects
-        self.all_view_data = []
-        for view_name, view in views_dict.items():
-            self.all_view_data.append(ViewData(view_name, view))
+        # Create view data objects, sorted once by name
+        self.all_view_data = [ViewData(view_name, view) for view_name, view in views_dict.items()]
+        self.all_view_data.sort(key=lambda x: natural_sort_key(x.view_name))
 
-        # Organize views by type
+        # Organize views by type (keeps the sorted order)
         self.views_by_type = {}
         for view_data in self.all_view_data:
             view_type = str(view_data.view.ViewType)
@@ -166,15 +228,11 @@ class ViewSelectionWindow(Window):
         Grid.SetRow(filter_panel, 1)
         main_grid.Children.Add(filter_panel)
 
-        # Scrollable list of views
-        scroll = ScrollViewer()
-        scroll.VerticalScrollBarVisibility = System.Windows.Controls.ScrollBarVisibility.Auto
+        # Virtualizing list of views
+        self.view_list = SelectableList()
 
-        self.view_panel = StackPanel()
-        scroll.Content = self.view_panel
-
-        Grid.SetRow(scroll, 2)
-        main_grid.Children.Add(scroll)
+        Grid.SetRow(self.view_list.control, 2)
+        main_grid.Children.Add(self.view_list.control)
 
         # Buttons
         button_panel = WrapPanel()
@@ -211,10 +269,6 @@ class ViewSelectionWindow(Window):
         Grid.SetRow(button_panel, 3)
         main_grid.Children.Add(button_panel)
 
-        # Add mouse event handlers for drag selection
-        self.MouseMove += self.window_mouse_move
-        self.MouseLeftButtonUp += self.window_mouse_up
-
         self.Content = main_grid
 
         # Initial population
@@ -222,132 +276,13 @@ class ViewSelectionWindow(Window):
 
     def populate_view_list(self):
         """Populate the view list based on current filter"""
-        self.view_panel.Children.Clear()
-        self.current_view_data = []
-
         selected_filter = self.filter_combo.SelectedItem
 
-        # Get views to display
+        # Lists are pre-sorted, so filtering is a lookup
         if selected_filter == "All View Types":
-            self.current_view_data = self.all_view_data[:]
+            self.view_list.set_items(self.all_view_data)
         else:
-            self.current_view_data = self.views_by_type.get(selected_filter, [])[:]
-
-        # Sort by name
-        self.current_view_data = sorted(self.current_view_data, key=lambda x: natural_sort_key(x.view_name))
-
-        # Create view rows
-        for view_data in self.current_view_data:
-            row = self.create_view_row(view_data)
-            self.view_panel.Children.Add(row)
-
-    def create_view_row(self, view_data):
-        """Create a selectable row for a view"""
-        row_border = Border()
-        row_border.BorderThickness = Thickness(0)
-        row_border.Padding = Thickness(5)
-        row_border.Margin = Thickness(0, 1, 0, 1)
-        row_border.Tag = view_data
-        row_border.MouseLeftButtonDown += self.row_click
-
-        # Store reference for updates
-        view_data.row_border = row_border
-
-        # Update appearance based on selection
-        self.update_row_appearance(view_data)
-
-        # View name text
-        text_block = TextBlock()
-        text_block.Text = view_data.view_name
-        text_block.VerticalAlignment = VerticalAlignment.Center
-        row_border.Child = text_block
-
-        return row_border
-
-    def row_click(self, sender, args):
-        """Handle row click with Shift/Ctrl support and start drag selection"""
-        clicked_row = sender
-        clicked_view_data = clicked_row.Tag
-
-        # Get the index of clicked row in the current list
-        clicked_index = self.current_view_data.index(clicked_view_data)
-
-        # Get modifier keys
-        modifiers = System.Windows.Input.Keyboard.Modifiers
-
-        if modifiers == ModifierKeys.Control:
-            # Ctrl+Click: Toggle selection of clicked row
-            clicked_view_data.is_selected = not clicked_view_data.is_selected
-            self.last_selected_index = clicked_index
-            self.update_row_appearance(clicked_view_data)
-            # Start drag in toggle mode
-            self.is_dragging = True
-            self.drag_start_selected = clicked_view_data.is_selected
-
-        elif modifiers == ModifierKeys.Shift and self.last_selected_index >= 0:
-            # Shift+Click: Select range from last selected to current
-            start_index = min(self.last_selected_index, clicked_index)
-            end_index = max(self.last_selected_index, clicked_index)
-
-            for i in range(start_index, end_index + 1):
-                self.current_view_data[i].is_selected = True
-                self.update_row_appearance(self.current_view_data[i])
-
-        else:
-            # Normal click: Select only this row, deselect others
-            for view_data in self.current_view_data:
-                view_data.is_selected = False
-                self.update_row_appearance(view_data)
-
-            clicked_view_data.is_selected = True
-            self.last_selected_index = clicked_index
-            self.update_row_appearance(clicked_view_data)
-            # Start drag in select mode
-            self.is_dragging = True
-            self.drag_start_selected = True
-
-        args.Handled = True
-
-    def window_mouse_move(self, sender, args):
-        """Handle mouse move for drag selection"""
-        if not self.is_dragging:
-            return
-
-        # Get the element under the mouse
-        element = self.InputHitTest(args.GetPosition(self))
-        if element is None:
-            return
-
-        # Find the row border by traversing up the visual tree
-        current = element
-        while current is not None:
-            if isinstance(current, Border) and hasattr(current, 'Tag') and isinstance(current.Tag, ViewData):
-                # Found a row border
-                view_data = current.Tag
-                view_data.is_selected = self.drag_start_selected
-                self.update_row_appearance(view_data)
-                break
-            # Move up the visual tree
-            try:
-                current = System.Windows.Media.VisualTreeHelper.GetParent(current)
-            except:
-                break
-
-    def window_mouse_up(self, sender, args):
-        """Handle mouse up to end drag selection"""
-        self.is_dragging = False
-
-    def update_row_appearance(self, view_data):
-        """Update row background based on selection state"""
-        if view_data.row_border is None:
-            return
-
-        if view_data.is_selected:
-            # Selected row - highlight with blue
-            view_data.row_border.Background = SolidColorBrush(Color.FromRgb(173, 216, 230))  # Light blue
-        else:
-            # Not selected - white
-            view_data.row_border.Background = Brushes.White
+            self.view_list.set_items(self.views_by_type.get(selected_filter, []))
 
     def filter_changed(self, sender, args):
         """Handle filter selection change"""
@@ -355,22 +290,15 @@ class ViewSelectionWindow(Window):
 
     def select_all_click(self, sender, args):
         """Select all visible views"""
-        for view_data in self.current_view_data:
-            view_data.is_selected = True
-            self.update_row_appearance(view_data)
+        self.view_list.select_all()
 
     def deselect_all_click(self, sender, args):
         """Deselect all visible views"""
-        for view_data in self.current_view_data:
-            view_data.is_selected = False
-            self.update_row_appearance(view_data)
+        self.view_list.deselect_all()
 
     def apply_click(self, sender, args):
         """Apply to selected views"""
-        self.selected_views = []
-        for view_data in self.all_view_data:
-            if view_data.is_selected:
-                self.selected_views.append(view_data.view)
+        self.selected_views = [view_data.view for view_data in self.view_list.get_selected()]
 
         if self.selected_views:
             self.DialogResult = True
@@ -394,13 +322,6 @@ class GridBubbleWindow(Window):
         self.Height = 600
         self.WindowStartupLocation = System.Windows.WindowStartupLocation.CenterScreen
 
-        # Track last selected index for Shift+click range selection
-        self.last_selected_index = -1
-
-        # Track drag selection state
-        self.is_dragging = False
-        self.drag_start_selected = False
-
         # Create sorted list for display (used for selection logic)
         self.sorted_grid_data_list = sorted(grid_data_list, key=lambda x: natural_sort_key(x.name))
 
@@ -435,15 +356,10 @@ class GridBubbleWindow(Window):
         Grid.SetRow(header_grid, 1)
         main_grid.Children.Add(header_grid)
 
-        # Scroll viewer for data rows only (flexible height)
-        scroll = ScrollViewer()
-        scroll.VerticalScrollBarVisibility = System.Windows.Controls.ScrollBarVisibility.Auto
-
-        # Create the data rows
-        data_panel = self.create_data_rows()
-        scroll.Content = data_panel
-        Grid.SetRow(scroll, 2)
-        main_grid.Children.Add(scroll)
+        # Virtualizing list for data rows only (flexible height)
+        data_list = self.create_data_rows()
+        Grid.SetRow(data_list, 2)
+        main_grid.Children.Add(data_list)
 
         # Buttons panel - using Grid to position left and right groups
         button_grid = Grid()
@@ -467,6 +383,14 @@ class GridBubbleWindow(Window):
         apply_views_btn.Click += self.apply_to_views_click
         left_panel.Children.Add(apply_views_btn)
 
+        # Propagate 2D extents button
+        propagate_btn = Button()
+        propagate_btn.Content = "Propagate Extents"
+        propagate_btn.Width = 120
+        propagate_btn.Margin = Thickness(5, 0, 0, 0)
+        propagate_btn.Click += self.propagate_extents_click
+        left_panel.Children.Add(propagate_btn)
+
         Grid.SetColumn(left_panel, 0)
         button_grid.Children.Add(left_panel)
 
@@ -519,10 +443,6 @@ class GridBubbleWindow(Window):
         Grid.SetRow(button_grid, 3)
         main_grid.Children.Add(button_grid)
 
-        # Add mouse event handlers for drag selection
-        self.MouseMove += self.window_mouse_move
-        self.MouseLeftButtonUp += self.window_mouse_up
-
         self.Content = main_grid
 
     def create_header(self):
@@ -561,303 +481,50 @@ class GridBubbleWindow(Window):
         return header_grid
 
     def create_data_rows(self):
-        """Create data rows panel (scrollable)"""
-        data_panel = StackPanel()
-
-        # Data rows - using pre-sorted list
-        for grid_data in self.sorted_grid_data_list:
-            row = self.create_grid_row(grid_data)
-            data_panel.Children.Add(row)
-
-        return data_panel
-
-    def create_grid_row(self, grid_data):
-        """Create a table row for a single grid"""
-        row_grid = Grid()
-        row_grid.Margin = Thickness(0, 1, 0, 1)
-        row_grid.Tag = grid_data  # Store reference to grid_data
-
-        # Solid background color (no alternating)
-        row_grid.Background = Brushes.White
-
-        # Store the row reference in grid_data for later updates
-        grid_data.row_grid = row_grid
-
-        # Make row clickable for selection
-        row_grid.MouseLeftButtonDown += self.row_click
-
-        # Define columns (same widths as header, removed Select column)
-        row_grid.ColumnDefinitions.Add(ColumnDefinition())
-        row_grid.ColumnDefinitions[0].Width = System.Windows.GridLength(120)
-
-        row_grid.ColumnDefinitions.Add(ColumnDefinition())
-        row_grid.ColumnDefinitions[1].Width = System.Windows.GridLength(80)
-
-        row_grid.ColumnDefinitions.Add(ColumnDefinition())
-        row_grid.ColumnDefinitions[2].Width = System.Windows.GridLength(80)
-
-        row_grid.ColumnDefinitions.Add(ColumnDefinition())
-        row_grid.ColumnDefinitions[3].Width = System.Windows.GridLength(80)
-
-        row_grid.ColumnDefinitions.Add(ColumnDefinition())
-        row_grid.ColumnDefinitions[4].Width = System.Windows.GridLength(80)
-
-        # Grid name
-        name_label = TextBlock()
-        name_label.Text = grid_data.name
-        name_label.Margin = Thickness(5)
-        name_label.VerticalAlignment = VerticalAlignment.Center
-        Grid.SetColumn(name_label, 0)
-        row_grid.Children.Add(name_label)
-
-        # Create checkboxes for each direction
-        # For horizontal grids: Left (End0) and Right (End1) are enabled
-        # For vertical grids: Bottom (End0) and Top (End1) are enabled
-
-        # Left checkbox
-        check_left = CheckBox()
-        check_left.HorizontalAlignment = HorizontalAlignment.Center
-        check_left.VerticalAlignment = VerticalAlignment.Center
-        check_left.Margin = Thickness(5)
-        check_left.Tag = grid_data  # Store reference for click handler
-        if not grid_data.is_vertical:
-            check_left.IsEnabled = True
-            check_left.IsChecked = grid_data.end1_visible  # Swapped: Left = End1
-            check_left.Click += self.checkbox_left_click
-        else:
-            check_left.IsEnabled = False
-            check_left.Opacity = 0.3
-        grid_data.check_left = check_left
-        Grid.SetColumn(check_left, 1)
-        row_grid.Children.Add(check_left)
-
-        # Right checkbox
-        check_right = CheckBox()
-        check_right.HorizontalAlignment = HorizontalAlignment.Center
-        check_right.VerticalAlignment = VerticalAlignment.Center
-        check_right.Margin = Thickness(5)
-        check_right.Tag = grid_data  # Store reference for click handler
-        if not grid_data.is_vertical:
-            check_right.IsEnabled = True
-            check_right.IsChecked = grid_data.end0_visible  # Swapped: Right = End0
-            check_right.Click += self.checkbox_right_click
-        else:
-            check_right.IsEnabled = False
-            check_right.Opacity = 0.3
-        grid_data.check_right = check_right
-        Grid.SetColumn(check_right, 2)
-        row_grid.Children.Add(check_right)
-
-        # Top checkbox
-        check_top = CheckBox()
-        check_top.HorizontalAlignment = HorizontalAlignment.Center
-        check_top.VerticalAlignment = VerticalAlignment.Center
-        check_top.Margin = Thickness(5)
-        check_top.Tag = grid_data  # Store reference for click handler
-        if grid_data.is_vertical:
-            check_top.IsEnabled = True
-            check_top.IsChecked = grid_data.end0_visible  # Swapped: Top = End0
-            check_top.Click += self.checkbox_top_click
-        else:
-            check_top.IsEnabled = False
-            check_top.Opacity = 0.3
-        grid_data.check_top = check_top
-        Grid.SetColumn(check_top, 3)
-        row_grid.Children.Add(check_top)
-
-        # Bottom checkbox
-        check_bottom = CheckBox()
-        check_bottom.HorizontalAlignment = HorizontalAlignment.Center
-        check_bottom.VerticalAlignment = VerticalAlignment.Center
-        check_bottom.Margin = Thickness(5)
-        check_bottom.Tag = grid_data  # Store reference for click handler
-        if grid_data.is_vertical:
-            check_bottom.IsEnabled = True
-            check_bottom.IsChecked = grid_data.end1_visible  # Swapped: Bottom = End1
-            check_bottom.Click += self.checkbox_bottom_click
-        else:
-            check_bottom.IsEnabled = False
-            check_bottom.Opacity = 0.3
-        grid_data.check_bottom = check_bottom
-        Grid.SetColumn(check_bottom, 4)
-        row_grid.Children.Add(check_bottom)
-
-        return row_grid
-
-    def row_click(self, sender, args):
-        """Handle row click with Shift/Ctrl support and start drag selection"""
-        # Check if click originated from a checkbox - if so, don't handle row selection
-        original_source = args.OriginalSource
-        source = args.Source
-
-        # Don't interfere with checkbox clicks
-        if isinstance(original_source, CheckBox) or isinstance(source, CheckBox):
-            return
+        """Create virtualizing data rows list (scrollable)"""
+        self.grid_list = SelectableList(item_template=make_row_template(GRID_ROW_TEMPLATE))
+        self.grid_list.set_items(self.sorted_grid_data_list)
 
-        clicked_row = sender
-        clicked_grid_data = clicked_row.Tag
+        # One handler for every checkbox in every row
+        self.grid_list.control.AddHandler(ButtonBase.ClickEvent, RoutedEventHandler(self.checkbox_click))
 
-        # Get the index of clicked row in the SORTED list (display order)
-        clicked_index = self.sorted_grid_data_list.index(clicked_grid_data)
+        return self.grid_list.control
 
-        # Get modifier keys
-        modifiers = System.Windows.Input.Keyboard.Modifiers
-
-        if modifiers == ModifierKeys.Control:
-            # Ctrl+Click: Toggle selection of clicked row
-            clicked_grid_data.is_selected = not clicked_grid_data.is_selected
-            self.last_selected_index = clicked_index
-            self.update_row_appearance(clicked_grid_data)
-            # Start drag in toggle mode
-            self.is_dragging = True
-            self.drag_start_selected = clicked_grid_data.is_selected
-
-        elif modifiers == ModifierKeys.Shift and self.last_selected_index >= 0:
-            # Shift+Click: Select range from last selected to current (in sorted order)
-            start_index = min(self.last_selected_index, clicked_index)
-            end_index = max(self.last_selected_index, clicked_index)
-
-            for i in range(start_index, end_index + 1):
-                self.sorted_grid_data_list[i].is_selected = True
-                self.update_row_appearance(self.sorted_grid_data_list[i])
-            # Don't start drag for Shift+click
-
-        else:
-            # Normal click: Select only this row, deselect others
-            for grid_data in self.sorted_grid_data_list:
-                grid_data.is_selected = False
-                self.update_row_appearance(grid_data)
-
-            clicked_grid_data.is_selected = True
-            self.last_selected_index = clicked_index
-            self.update_row_appearance(clicked_grid_data)
-            # Start drag in select mode
-            self.is_dragging = True
-            self.drag_start_selected = True
-
-        # Mark event as handled
-        args.Handled = True
-
-    def window_mouse_move(self, sender, args):
-        """Handle mouse move for drag selection"""
-        if not self.is_dragging:
-            return
-
-        # Get the element under the mouse
-        element = self.InputHitTest(args.GetPosition(self))
-        if element is None:
+    def checkbox_click(self, sender, args):
+        """Handle checkbox click - apply to all selected rows if clicked row is selected"""
+        clicked_checkbox = args.OriginalSource
+        if not isinstance(clicked_checkbox, CheckBox):
             return
 
-        # Find the row grid by traversing up the visual tree
-        current = element
-        while current is not None:
-            if isinstance(current, Grid) and hasattr(current, 'Tag') and isinstance(current.Tag, GridBubbleData):
-                # Found a row grid
-                grid_data = current.Tag
-                grid_data.is_selected = self.drag_start_selected
-                self.update_row_appearance(grid_data)
-                break
-            # Move up the visual tree
-            try:
-                current = System.Windows.Media.VisualTreeHelper.GetParent(current)
-            except:
-                break
-
-    def window_mouse_up(self, sender, args):
-        """Handle mouse up to end drag selection"""
-        self.is_dragging = False
-
-    def update_row_appearance(self, grid_data):
-        """Update row background based on selection state"""
-        row_grid = grid_data.row_grid
-
-        if grid_data.is_selected:
-            # Selected row - highlight with blue
-            row_grid.Background = SolidColorBrush(Color.FromRgb(173, 216, 230))  # Light blue
-        else:
-            # Not selected - solid white
-            row_grid.Background = Brushes.White
-
-    def checkbox_left_click(self, sender, args):
-        """Handle left checkbox click - apply to all selected rows if clicked row is selected"""
-        clicked_checkbox = sender
-        clicked_grid_data = clicked_checkbox.Tag
-        new_state = clicked_checkbox.IsChecked
+        clicked_grid_data = clicked_checkbox.DataContext
+        column = clicked_checkbox.Tag
+        attr_name = "{}_checked".format(column)
+        new_state = getattr(clicked_grid_data, attr_name)
 
         # If clicked row is selected, apply to all selected rows
         if clicked_grid_data.is_selected:
-            for grid_data in self.grid_data_list:
-                if grid_data.is_selected and grid_data.check_left.IsEnabled:
-                    grid_data.check_left.IsChecked = new_state
-        # Otherwise, checkbox already toggled itself (single row change)
-
-    def checkbox_right_click(self, sender, args):
-        """Handle right checkbox click - apply to all selected rows if clicked row is selected"""
-        clicked_checkbox = sender
-        clicked_grid_data = clicked_checkbox.Tag
-        new_state = clicked_checkbox.IsChecked
-
-        # If clicked row is selected, apply to all selected rows
-        if clicked_grid_data.is_selected:
-            for grid_data in self.grid_data_list:
-                if grid_data.is_selected and grid_data.check_right.IsEnabled:
-                    grid_data.check_right.IsChecked = new_state
-        # Otherwise, checkbox already toggled itself (single row change)
-
-    def checkbox_top_click(self, sender, args):
-        """Handle top checkbox click - apply to all selected rows if clicked row is selected"""
-        clicked_checkbox = sender
-        clicked_grid_data = clicked_checkbox.Tag
-        new_state = clicked_checkbox.IsChecked
-
-        # If clicked row is selected, apply to all selected rows
-        if clicked_grid_data.is_selected:
-            for grid_data in self.grid_data_list:
-                if grid_data.is_selected and grid_data.check_top.IsEnabled:
-                    grid_data.check_top.IsChecked = new_state
-        # Otherwise, checkbox already toggled itself (single row change)
-
-    def checkbox_bottom_click(self, sender, args):
-        """Handle bottom checkbox click - apply to all selected rows if clicked row is selected"""
-        clicked_checkbox = sender
-        clicked_grid_data = clicked_checkbox.Tag
-        new_state = clicked_checkbox.IsChecked
-
-        # If clicked row is selected, apply to all selected rows
-        if clicked_grid_data.is_selected:
-            for grid_data in self.grid_data_list:
-                if grid_data.is_selected and grid_data.check_bottom.IsEnabled:
-                    grid_data.check_bottom.IsChecked = new_state
-        # Otherwise, checkbox already toggled itself (single row change)
+            for grid_data in self.grid_list.get_selected():
+                if grid_data.is_column_enabled(column):
+                    setattr(grid_data, attr_name, new_state)
+        # Otherwise, the binding already updated the single row
 
     def toggle_selected_click(self, sender, args):
         """Toggle/swap bubble positions for selected rows (Left<->Right for horizontal, Top<->Bottom for vertical)"""
-        for grid_data in self.grid_data_list:
-            if grid_data.is_selected:
-                if grid_data.is_vertical:
-                    # Vertical grid: swap Top and Bottom
-                    if grid_data.check_top.IsEnabled and grid_data.check_bottom.IsEnabled:
-                        temp = grid_data.check_top.IsChecked
-                        grid_data.check_top.IsChecked = grid_data.check_bottom.IsChecked
-                        grid_data.check_bottom.IsChecked = temp
-                else:
-                    # Horizontal grid: swap Left and Right
-                    if grid_data.check_left.IsEnabled and grid_data.check_right.IsEnabled:
-                        temp = grid_data.check_left.IsChecked
-                        grid_data.check_left.IsChecked = grid_data.check_right.IsChecked
-                        grid_data.check_right.IsChecked = temp
+        for grid_data in self.grid_list.get_selected():
+            if grid_data.is_vertical:
+                # Vertical grid: swap Top and Bottom
+                grid_data.top_checked, grid_data.bottom_checked = grid_data.bottom_checked, grid_data.top_checked
+            else:
+                # Horizontal grid: swap Left and Right
+                grid_data.left_checked, grid_data.right_checked = grid_data.right_checked, grid_data.left_checked
 
     def uncheck_all_click(self, sender, args):
         """Uncheck all checkboxes to reset everything"""
         for grid_data in self.grid_data_list:
-            if grid_data.check_left.IsEnabled:
-                grid_data.check_left.IsChecked = False
-            if grid_data.check_right.IsEnabled:
-                grid_data.check_right.IsChecked = False
-            if grid_data.check_top.IsEnabled:
-                grid_data.check_top.IsChecked = False
-            if grid_data.check_bottom.IsEnabled:
-                grid_data.check_bottom.IsChecked = False
+            grid_data.left_checked = False
+            grid_data.right_checked = False
+            grid_data.top_checked = False
+            grid_data.bottom_checked = False
 
     def apply_click(self, sender, args):
         """Apply changes but keep window open"""
@@ -956,6 +623,56 @@ class GridBubbleWindow(Window):
         except Exception as e:
             forms.alert("Error applying to views: {}".format(str(e)), title="Error")
 
+    def propagate_extents_click(self, sender, args):
+        """Copy 2D grid extents from this view to other parallel views"""
+        # Use selected rows if any, otherwise every grid in the view
+        grids = [gd.grid for gd in self.grid_data_list if gd.is_selected]
+        if not grids:
+            grids = [gd.grid for gd in self.grid_data_list]
+
+        compatible_views, skipped_count = get_extent_propagation_views(grids, self.view)
+
+        if not compatible_views:
+            forms.alert("No parallel views can receive grid extents from this view.\n\n"
+                        "{} view(s) were skipped because their view direction or "
+                        "cut plane is incompatible.".format(skipped_count), title="No Views")
+            return
+
+        view_dict = {"{} - {}".format(v.ViewType, v.Name): v for v in compatible_views}
+
+        view_selection_window = ViewSelectionWindow(view_dict, title="Select Views to Receive Grid Extents")
+        result = view_selection_window.ShowDialog()
+
+        if not result or not view_selection_window.selected_views:
+            return
+
+        selected_views = view_selection_window.selected_views
+
+        try:
+            updated_count, failed_count = propagate_grid_extents(grids, self.view, selected_views)
+
+            if failed_count:
+                forms.alert("Updated {} grid extent(s).\n{} grid extent(s) could not be copied.".format(
+                    updated_count, failed_count), title="Propagate Extents")
+
+            original_content = sender.Content
+            sender.Content = "Copied to {} views ✓".format(len(selected_views))
+            sender.IsEnabled = False
+
+            timer = DispatcherTimer()
+            timer.Interval = TimeSpan.FromSeconds(2)
+
+            def on_timer_tick(s, e):
+                sender.Content = original_content
+                sender.IsEnabled = True
+                timer.Stop()
+
+            timer.Tick += on_timer_tick
+            timer.Start()
+
+        except Exception as e:
+            forms.alert("Error propagating extents: {}".format(str(e)), title="Error")
+
     def cancel_click(self, sender, args):
         """Cancel without applying"""
         self.DialogResult = False
@@ -970,6 +687,97 @@ def get_grids_in_view(view):
     return list(collector)
 
 
+def is_parallel_view(source_view, target_view):
+    """Check if target view looks in the same direction as the source view"""
+    try:
+        cross = source_view.ViewDirection.CrossProduct(target_view.ViewDirection)
+        return cross.GetLength() < 1e-6
+    except Exception:
+        return False
+
+
+def get_extent_propagation_views(grids, source_view):
+    """
+    Find views that can receive 2D grid extents from the source view.
+    Views are checked up front so incompatible ones are never touched in the transaction.
+    Returns (compatible_views, skipped_count)
+    """
+    # Views Revit itself allows propagation to (same orientation, compatible cut plane)
+    propagation_ids = set()
+    for grid in grids:
+        try:
+            for view_id in grid.GetPropagationViews(source_view):
+                propagation_ids.add(view_id.IntegerValue)
+        except Exception:
+            continue
+
+    all_views = DB.FilteredElementCollector(doc)\
+                  .OfClass(DB.View)\
+                  .WhereElementIsNotElementType()\
+                  .ToElements()
+
+    compatible_views = []
+    skipped_count = 0
+    for v in all_views:
+        if v.IsTemplate or v.Id == source_view.Id or v.ViewType != source_view.ViewType:
+            continue
+
+        if v.Id.IntegerValue in propagation_ids and is_parallel_view(source_view, v):
+            compatible_views.append(v)
+        else:
+            skipped_count += 1
+
+    return compatible_views, skipped_count
+
+
+def propagate_grid_extents(grids, source_view, target_views):
+    """
+    Copy view-specific (2D) grid curves from the source view to the target views.
+    Each curve is shifted along the view direction onto the target view's datum plane.
+    Returns (updated_count, failed_count)
+    """
+    # Read source curves once
+    source_curves = []
+    for grid in grids:
+        try:
+            curves = grid.GetCurvesInView(DB.DatumExtentType.ViewSpecific, source_view)
+            if curves.Count > 0:
+                source_curves.append((grid, curves[0]))
+        except Exception:
+            continue
+
+    view_direction = source_view.ViewDirection
+    updated_count = 0
+    failed_count = 0
+
+    with revit.Transaction("Propagate Grid Extents"):
+        for target_view in target_views:
+            target_grid_ids = set(g.Id.IntegerValue for g in get_grids_in_view(target_view))
+
+            for grid, source_curve in source_curves:
+                if grid.Id.IntegerValue not in target_grid_ids:
+                    continue
+
+                try:
+                    target_curve = grid.GetCurvesInView(DB.DatumExtentType.ViewSpecific, target_view)[0]
+
+                    # Offset between the two views measured along the view direction
+                    delta = target_curve.GetEndPoint(0) - source_curve.GetEndPoint(0)
+                    offset = view_direction.Multiply(delta.DotProduct(view_direction))
+                    new_curve = source_curve.CreateTransformed(DB.Transform.CreateTranslation(offset))
+
+                    for datum_end in (DB.DatumEnds.End0, DB.DatumEnds.End1):
+                        if grid.GetDatumExtentTypeInView(datum_end, target_view) != DB.DatumExtentType.ViewSpecific:
+                            grid.SetDatumExtentType(datum_end, target_view, DB.DatumExtentType.ViewSpecific)
+
+                    grid.SetCurveInView(DB.DatumExtentType.ViewSpecific, target_view, new_curve)
+                    updated_count += 1
+                except Exception:
+                    failed_count += 1
+
+    return updated_count, failed_count
+
+
 def apply_bubble_changes(grid_data_list, view):
     """Apply bubble visibility changes to grids"""
     with revit.Transaction("Update Grid Bubbles"):
@@ -979,12 +787,12 @@ def apply_bubble_changes(grid_data_list, view):
             # Determine which checkboxes to use based on orientation
             if grid_data.is_vertical:
                 # Vertical grid: Top = End0, Bottom = End1 (fixed mapping)
-                end0_checked = grid_data.check_top.IsChecked
-                end1_checked = grid_data.check_bottom.IsChecked
+                end0_checked = grid_data.top_checked
+                end1_checked = grid_data.bottom_checked
             else:
                 # Horizontal grid: Left = End1, Right = End0 (swapped mapping)
-                end0_checked = grid_data.check_right.IsChecked
-                end1_checked = grid_data.check_left.IsChecked
+                end0_checked = grid_data.right_checked
+                end1_checked = grid_data.left_checked
 
             # Update End 0
             try:
@@ -33,10 +33,59 @@ ROUTING MODES
   Vertical First (force all)
     All wires: run north/south first, then east/west.
 
+  Avoid Obstacles
+    Tries both L-shapes for each diagonal (and Z-shapes when both are
+    blocked) against the bounding boxes of fixtures, devices and tags
+    in the view, and keeps the route that crosses the fewest of them.
+
+GRID FRAME
+----------
+  Project Axes        N/S and E/W, as above.
+  Nearest Grid Line   each wire follows the building grid line closest
+                      to it, so angled wings get square routing too.
+  Scope Boxes         wires inside a picked scope box follow its
+                      rotation; wires outside use the project axes.
+Vertices are rotated into the local frame in bulk, cleaned there and
+rotated back; wire ends stay on their connectors.
+
+PARALLEL SEPARATION
+-------------------
+Wires that share a row of fixtures end up drawn exactly on top of each
+other. After routing, overlapping collinear runs are offset onto
+parallel tracks a set distance apart (paper inches, scaled by the view
+scale); wire ends stay on their connectors. Enter 0 to skip.
+
+SKIPPING UNTOUCHED WIRES
+------------------------
+Every wire this tool writes, or finds already clean on Apply, is
+stamped with a fingerprint of its vertices and the settings used
+(extensible storage), including the frame geometry (grid lines or
+picked scope boxes), not just its name. Later runs with the same
+settings skip wires whose vertex count and end points still match,
+without reading their vertex lists; parallel separation uses the copy
+kept at stamping time for the rest of the Revit session. Shift+Click the
+button to re-read every wire (this also catches dragged interior vertices).
+
+PREVIEW (DRY RUN)
+-----------------
+All geometry is computed before anything is written. The tool then
+offers Apply or Preview Only; the preview lists vertices added and
+removed and the length change per wire without opening a transaction.
+The computed result is kept for the Revit session, so applying it on
+the next run (same views and settings, wires unchanged) reuses it
+instead of recomputing.
+
 SELECTION BEHAVIOR
 ------------------
-  • Pre-select specific wires  →  only those are processed
-  • Nothing selected           →  all wires in the active view
+  Active View
+    • Pre-select specific wires  →  only those are processed
+    • Nothing selected           →  all wires in the active view
+
+  Multiple Plan Views
+    Wires are collected per view and each wire is processed once, even
+    when it shows in several views. Changes are committed in chunks of
+    CHUNK_SIZE wires with a progress bar; Cancel stops after the current
+    chunk and a failing chunk is rolled back without losing the others.
 
 REQUIREMENTS
 ------------
@@ -53,18 +102,29 @@ BUNDLE SETUP
 """
 
 # ── imports ───────────────────────────────────────────────────────────────────
-from pyrevit import revit, DB, forms, script
+import math
+
+import System
+from pyrevit import revit, DB, forms, script, EXEC_PARAMS
 from Autodesk.Revit.DB import (
-    Transaction, XYZ, FilteredElementCollector, ViewType
+    Transaction, TransactionGroup, TransactionStatus, XYZ, FilteredElementCollector, ViewType
 )
 from Autodesk.Revit.DB.Electrical import Wire, WiringType
+from System.Collections.Generic import List
+
+# Geometry core (Revit-free, works on (x, y, z) tuples)
+from Snippets._wires import (
+    orthogonalize_batch, separate_parallel, to_tuples,
+    axis_angle, rotate_obstacles, LineFrames, RegionFrames, wire_frame_angles, map_in_frames,
+    fingerprint, vertex_diff, source_identity
+)
+from Snippets._spatial import GridHash2D
+from Snippets._wirecache import WireFingerprintCache
 
 # ── logger / output ───────────────────────────────────────────────────────────
 logger = script.get_logger()
 output = script.get_output()
-
-# ── constants ─────────────────────────────────────────────────────────────────
-ORTHO_TOL = 0.01   # feet — segments within this of H or V are already "clean"
+config = script.get_config()
 
 # ── plan view types that make sense for this tool ─────────────────────────────
 VALID_VIEW_TYPES = {
@@ -74,192 +134,517 @@ VALID_VIEW_TYPES = {
     ViewType.EngineeringPlan,
 }
 
+# ── default spacing between overlapping parallel wires (paper inches) ─────────
+DEFAULT_SEPARATION = 1.0 / 16
 
-# ══════════════════════════════════════════════════════════════════════════════
-#  GEOMETRY HELPERS
-# ══════════════════════════════════════════════════════════════════════════════
+# ── wires written per transaction ─────────────────────────────────────────────
+CHUNK_SIZE = 500
 
-def is_horizontal(a, b):
-    return abs(b.Y - a.Y) < ORTHO_TOL
+SCOPE_OPTIONS = [
+    "Active View  (or selected wires)",
+    "Multiple Plan Views",
+]
 
+ACTION_OPTIONS = [
+    "Apply Changes",
+    "Preview Only  (dry run, no changes)",
+]
 
-def is_vertical(a, b):
-    return abs(b.X - a.X) < ORTHO_TOL
+# ── wire rows listed in the preview report (the totals always cover all) ─────
+MAX_PREVIEW_ROWS = 500
 
+# ── AppDomain slot keeping computed plans for the rest of the Revit session ──
+PLAN_CACHE_KEY = "DEEM.WireFixPlanCache"
 
-def is_orthogonal(a, b):
-    return is_horizontal(a, b) or is_vertical(a, b)
+FRAME_OPTIONS = [
+    "Project Axes  (N/S, E/W)",
+    "Nearest Grid Line",
+    "Scope Boxes",
+]
 
+# ── elements that elbows should not land on ("Avoid Obstacles" routing) ───────
+OBSTACLE_CATEGORIES = [
+    DB.BuiltInCategory.OST_LightingFixtures,
+    DB.BuiltInCategory.OST_LightingDevices,
+    DB.BuiltInCategory.OST_ElectricalFixtures,
+    DB.BuiltInCategory.OST_ElectricalEquipment,
+    DB.BuiltInCategory.OST_FireAlarmDevices,
+    DB.BuiltInCategory.OST_CommunicationDevices,
+    DB.BuiltInCategory.OST_DataDevices,
+]
 
-def elbow_point(a, b, routing):
-    """
-    Return the single intermediate XYZ vertex that converts the diagonal
-    segment A→B into two orthogonal legs.
 
-    routing: "auto" | "h_first" | "v_first"
-    """
-    dx = abs(b.X - a.X)
-    dy = abs(b.Y - a.Y)
-    z  = a.Z  # keep in the same plan elevation
+# ══════════════════════════════════════════════════════════════════════════════
+#  WIRE COLLECTION
+# ══════════════════════════════════════════════════════════════════════════════
 
-    if routing == "h_first" or (routing == "auto" and dx >= dy):
-        # Horizontal leg first: move to b.X while keeping a.Y
-        return XYZ(b.X, a.Y, z)
-    else:
-        # Vertical leg first: move to b.Y while keeping a.X
-        return XYZ(a.X, b.Y, z)
+def get_selected_wires(doc):
+    """Wires in the current selection"""
+    wires = []
+    for eid in revit.get_selection().element_ids:
+        elem = doc.GetElement(eid)
+        if isinstance(elem, Wire):
+            wires.append(elem)
+    return wires
 
 
-def remove_collinear(vertices):
+def get_view_wires(doc, view):
+    """All wires visible in a view (view-scoped collector)"""
+    return list(
+        FilteredElementCollector(doc, view.Id)
+        .OfClass(Wire)
+        .ToElements()
+    )
+
+
+def collect_view_jobs(doc, views):
+    """
+    Wires per view, each wire only once (in the first view it shows in).
+    Returns ([(view, wires)], duplicate_count).
     """
-    Strip intermediate vertices that sit on the same H or V line as their
-    neighbors. Prevents duplicate/redundant points that can accumulate when
-    wires are processed more than once or when existing bends get rebuilt.
+    seen = set()
+    jobs = []
+    duplicates = 0
+    for view in views:
+        wires = []
+        for wire in get_view_wires(doc, view):
+            wire_id = wire.Id.IntegerValue
+            if wire_id in seen:
+                duplicates += 1
+                continue
+            seen.add(wire_id)
+            wires.append(wire)
+        jobs.append((view, wires))
+    return jobs, duplicates
+
+
+def build_obstacle_index(doc, view):
     """
-    if len(vertices) <= 2:
-        return list(vertices)
+    Spatial index of device and tag bounding boxes in the view (plan XY).
+    Built once per view; every diagonal segment is then tested against it.
+    """
+    category_filter = DB.ElementMulticategoryFilter(
+        List[DB.BuiltInCategory](OBSTACLE_CATEGORIES)
+    )
+    elements = list(
+        FilteredElementCollector(doc, view.Id)
+        .WherePasses(category_filter)
+        .WhereElementIsNotElementType()
+    )
+    elements.extend(
+        FilteredElementCollector(doc, view.Id)
+        .OfClass(DB.IndependentTag)
+    )
 
-    result = [vertices[0]]
+    keyed_boxes = []
+    for elem in elements:
+        bbox = elem.get_BoundingBox(view)
+        if bbox is None:
+            continue
+        keyed_boxes.append((
+            elem.Id.IntegerValue,
+            (bbox.Min.X, bbox.Min.Y, bbox.Max.X, bbox.Max.Y),
+        ))
+    return GridHash2D.from_boxes(keyed_boxes)
 
-    for i in range(1, len(vertices) - 1):
-        prev = result[-1]
-        curr = vertices[i]
-        nxt  = vertices[i + 1]
 
-        # Collinear vertically: prev, curr, and next all share the same X
-        col_v = (abs(curr.X - prev.X) < ORTHO_TOL and
-                 abs(curr.X - nxt.X)  < ORTHO_TOL)
-        # Collinear horizontally: share the same Y
-        col_h = (abs(curr.Y - prev.Y) < ORTHO_TOL and
-                 abs(curr.Y - nxt.Y)  < ORTHO_TOL)
+def get_obstacle_identity(obstacles):
+    """Hash of the obstacle boxes ("none" without obstacles), so moved fixtures or tags invalidate a plan"""
+    if obstacles is None:
+        return "none"
+    return source_identity("obstacles", [
+        "{}|{}".format(key, format_plan_points([box[:2], box[2:]])) for key, box in obstacles.boxes.items()
+    ])
 
-        if not (col_v or col_h):
-            result.append(curr)
 
-    result.append(vertices[-1])
-    return result
+# ══════════════════════════════════════════════════════════════════════════════
+#  GRID FRAMES
+# ══════════════════════════════════════════════════════════════════════════════
+
+def format_plan_points(points):
+    """Plan points as text for a frame identity"""
+    return ";".join("{:.4f},{:.4f}".format(x, y) for x, y in points)
 
 
-def orthogonalize_vertices(vertices, routing):
+def build_grid_frames(doc):
+    """
+    LineFrames from the straight building grids of the model, and their identity
+    (a hash of the grid lines, so moving a grid changes it)
     """
-    Full pipeline:
-      1. Walk each consecutive vertex pair
-      2. Insert elbow where diagonal is detected
-      3. Strip redundant collinear points
+    lines = []
+    for grid in FilteredElementCollector(doc).OfClass(DB.Grid):
+        curve = grid.Curve
+        if not isinstance(curve, DB.Line):
+            continue
+        start = curve.GetEndPoint(0)
+        end = curve.GetEndPoint(1)
+        lines.append((start.X, start.Y, end.X, end.Y))
+    identity = source_identity("grids", [format_plan_points([(x0, y0), (x1, y1)]) for x0, y0, x1, y1 in lines])
+    return LineFrames(lines), identity
+
+
+def get_scope_box_footprint(scope_box):
+    """(loops, angle) of a scope box's plan rectangle, or None"""
+    edges = [obj for obj in scope_box.get_Geometry(DB.Options()) if isinstance(obj, DB.Line)]
+    if not edges:
+        return None
+    bottom = min(min(e.GetEndPoint(0).Z, e.GetEndPoint(1).Z) for e in edges)
+    corners = []
+    angle = None
+    for edge in edges:
+        start = edge.GetEndPoint(0)
+        end = edge.GetEndPoint(1)
+        if abs(start.Z - bottom) > 1e-6 or abs(end.Z - bottom) > 1e-6:
+            continue
+        if angle is None:
+            angle = axis_angle(end.X - start.X, end.Y - start.Y)
+        for point in (start, end):
+            corner = (round(point.X, 6), round(point.Y, 6))
+            if corner not in corners:
+                corners.append(corner)
+    if angle is None or len(corners) < 3:
+        return None
+
+    # Order the corners around their centroid to get a closed rectangle
+    cx = sum(x for x, y in corners) / len(corners)
+    cy = sum(y for x, y in corners) / len(corners)
+    corners.sort(key=lambda c: math.atan2(c[1] - cy, c[0] - cx))
+    return [corners], angle
+
+
+def build_scope_box_frames(doc):
+    """
+    RegionFrames from scope boxes picked by the user, and their identity (box ids,
+    angles and footprints); None if cancelled
+    """
+    scope_boxes = dict(
+        (box.Name, box) for box in
+        FilteredElementCollector(doc)
+        .OfCategory(DB.BuiltInCategory.OST_VolumeOfInterest)
+        .WhereElementIsNotElementType()
+    )
+    if not scope_boxes:
+        forms.alert("No scope boxes in this model.", title="Orthogonal Wires")
+        return None
+
+    names = forms.SelectFromList.show(
+        sorted(scope_boxes.keys()),
+        title="Scope Boxes Defining the Grid Frame",
+        button_name="Use Scope Boxes",
+        multiselect=True
+    )
+    if not names:
+        return None
+
+    regions = []
+    parts = []
+    for name in names:
+        footprint = get_scope_box_footprint(scope_boxes[name])
+        if footprint is None:
+            logger.warning("Scope box '{}' has no readable footprint.".format(name))
+            continue
+        regions.append(footprint)
+        loops, angle = footprint
+        parts.append("{}|{:.6f}|{}".format(scope_boxes[name].Id.IntegerValue, angle, format_plan_points(loops[0])))
+    return RegionFrames(regions), source_identity("scope_boxes", parts)
 
-    Returns new list, or the original list unchanged if already all-orthogonal.
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  MAIN PROCESSING
+# ══════════════════════════════════════════════════════════════════════════════
+
+def ask_separation():
     """
-    if len(vertices) < 2:
-        return list(vertices)
-
-    # Step 1: insert elbows
-    result = [vertices[0]]
-    for i in range(1, len(vertices)):
-        a = result[-1]
-        b = vertices[i]
-        if is_orthogonal(a, b):
-            result.append(b)
-        else:
-            result.append(elbow_point(a, b, routing))
-            result.append(b)
+    Spacing between overlapping parallel wires in paper inches (0 = off),
+    remembered between runs. None if cancelled.
+    """
+    default = getattr(config, 'separation_paper_inches', DEFAULT_SEPARATION)
+    text = forms.ask_for_string(
+        default="{:g}".format(default),
+        prompt="Spacing between overlapping parallel wires\n(paper inches, 0 = don't separate):",
+        title="Orthogonal Wires",
+    )
+    if text is None:
+        return None
+    try:
+        paper_inches = float(text)
+    except ValueError:
+        forms.alert("'{}' is not a number.".format(text), title="Orthogonal Wires")
+        return None
 
-    # Step 2: remove any collinear points created by pre-existing bends
-    result = remove_collinear(result)
-    return result
+    config.separation_paper_inches = paper_inches
+    script.save_config()
+    return max(paper_inches, 0.0)
 
 
-def vertices_changed(old_verts, new_verts):
-    """True if the new vertex list differs meaningfully from the old one."""
-    if len(old_verts) != len(new_verts):
-        return True
-    for a, b in zip(old_verts, new_verts):
-        if (abs(a.X - b.X) > ORTHO_TOL or
-                abs(a.Y - b.Y) > ORTHO_TOL):
-            return True
-    return False
+def separation_in_view(paper_inches, view):
+    """Paper inches to model feet at the view scale"""
+    return paper_inches * view.Scale / 12.0
 
 
-# ══════════════════════════════════════════════════════════════════════════════
-#  WIRE COLLECTION
-# ══════════════════════════════════════════════════════════════════════════════
+def get_plan_cache():
+    """Computed plans kept between runs for the current Revit session"""
+    domain = System.AppDomain.CurrentDomain
+    cache = domain.GetData(PLAN_CACHE_KEY)
+    if cache is None:
+        cache = {}
+        domain.SetData(PLAN_CACHE_KEY, cache)
+    return cache
+
+
+def get_plan_key(doc, view):
+    """Plan cache key: one entry per document and view"""
+    return (doc.PathName or doc.Title, view.Id.IntegerValue)
 
-def collect_wires(doc, view):
+
+def get_mode(routing, separation, frame_id="axes"):
     """
-    Return a list of Wire elements to process.
-    Priority: current selection (wires only) → all wires in active view.
+    Settings that shape the result, as stored in the wire fingerprint.
+    frame_id identifies the frame geometry (grid hash, scope box ids and
+    footprints), not the menu choice, so changed frames re-square the wires.
     """
-    sel_ids = revit.get_selection().element_ids
-    sel_wires = []
-
-    for eid in sel_ids:
-        elem = doc.GetElement(eid)
-        if isinstance(elem, Wire):
-            sel_wires.append(elem)
+    return "{}|{:.4f}|{}".format(routing, separation, frame_id)
 
-    if sel_wires:
-        output.print_md("**Using {} selected wire(s).**".format(len(sel_wires)))
-        return sel_wires
 
-    all_wires = list(
-        FilteredElementCollector(doc, view.Id)
-        .OfClass(Wire)
-        .ToElements()
-    )
+def plan_wires(wires, routing, obstacles=None, separation=0.0, cache=None, full_check=False,
+               frames=None, frame_id="axes", plan_cache=None, plan_key=None):
+    """
+    Rebuild the vertex lists of all wires in one batch (no transaction).
+    obstacles: GridHash2D from build_obstacle_index ("avoid" routing only)
+    separation: spacing (feet) for overlapping parallel runs, 0 to skip
+    frames: LineFrames / RegionFrames giving each wire's grid rotation,
+            None for the project axes; frame_id (see get_mode) identifies them
+            in the fingerprint
+    cache: WireFingerprintCache; wires untouched since they were last written
+           are not re-routed (full_check reads them all and compares the full
+           fingerprint instead). With separation on, their vertices (the
+           session copy from the last stamp) are fixed tracks, so new wires
+           drawn over them are offset while they stay in place.
+    plan_cache / plan_key: session cache of computed plans; when every wire
+           still has the vertices it had when the plan was made (same
+           settings, frame geometry and obstacle boxes), the stored result
+           is reused instead of recomputed
+
+    Returns (changes, unchanged, error_count, separated_count, reused);
+    changes is a list of (wire, old_vertices, new_vertices, mode) for
+    apply_changes, unchanged the same for wires that need no new geometry
+    (new_vertices None), so they are only stamped. Cache hits are counted on
+    the cache and left out of both.
+    """
+    unchanged = []
+    errors    = 0
+    separated = 0
+    mode      = get_mode(routing, separation, frame_id)
+
+    # ── read all vertex lists, then run the geometry on plain tuples ──────────
+    readable_wires = []
+    vertex_lists = []
+    kept_wires = []     # untouched since the last run: fixed tracks for separation
+    kept_lists = []
+    for wire in wires:
+        try:
+            if cache is not None and not full_check and cache.is_untouched(wire, mode):
+                if separation > 0:
+                    kept_lists.append(cache.kept_vertices(wire))
+                    kept_wires.append(wire)
+                continue
+            vertices = to_tuples(wire.GetVertices())
+            if cache is not None and full_check:
+                cache.matches(wire, vertices, mode)
+            vertex_lists.append(vertices)
+            readable_wires.append(wire)
+        except Exception as e:
+            logger.error("Wire {} — {}: {}".format(wire.Id.IntegerValue, type(e).__name__, str(e)))
+            errors += 1
+
+    # ── reuse the plan from a previous preview if nothing changed since ───────
+    wire_ids = [wire.Id.IntegerValue for wire in readable_wires]
+    fingerprints = dict((wire.Id.IntegerValue, fingerprint(vertices, mode))
+                        for wire, vertices in zip(readable_wires + kept_wires, vertex_lists + kept_lists))
+    obstacle_id = get_obstacle_identity(obstacles) if plan_cache is not None else None
+    stored = plan_cache.get(plan_key) if plan_cache is not None else None
+    if (stored is not None and stored['mode'] == mode and stored.get('obstacles') == obstacle_id
+            and stored['fingerprints'] == fingerprints):
+        results = stored['results']
+        changes = []
+        for wire, wire_id, vertices in zip(readable_wires, wire_ids, vertex_lists):
+            if wire_id in results:
+                changes.append((wire, vertices, results[wire_id], mode))
+            else:
+                unchanged.append((wire, vertices, None, mode))
+        return changes, unchanged, errors, stored['separated'], True
+
+    # ── clean each grid frame in its own rotated coordinates ──────────────────
+    angles = wire_frame_angles(vertex_lists, frames)
+    frame_obstacles = {0.0: obstacles}
+
+    def route(local_lists, angle):
+        if obstacles is not None and angle not in frame_obstacles:
+            frame_obstacles[angle] = rotate_obstacles(obstacles, -angle)
+        return orthogonalize_batch(local_lists, routing, frame_obstacles.get(angle))
+
+    new_vertex_lists = map_in_frames(vertex_lists, angles, route)
+
+    # ── spread wires drawn on top of each other (runs over all wires at once) ─
+    # (untouched wires take part as fixed tracks, so they are never moved)
+    if separation > 0:
+        routed = [new or old for old, new in zip(vertex_lists, new_vertex_lists)] + kept_lists
+        routed_angles = angles + wire_frame_angles(kept_lists, frames)
+        fixed = set(range(len(vertex_lists), len(routed)))
+
+        def separate(local_lists, angle):
+            # map_in_frames hands over the wires of one angle in input order
+            indices = [i for i, a in enumerate(routed_angles) if a == angle]
+            local_fixed = set(n for n, i in enumerate(indices) if i in fixed)
+            return separate_parallel(local_lists, separation, local_fixed)
+
+        separated_lists = map_in_frames(routed, routed_angles, separate)[:len(vertex_lists)]
+        separated = sum(1 for verts in separated_lists if verts is not None)
+        new_vertex_lists = [sep or new for new, sep in zip(new_vertex_lists, separated_lists)]
+
+    changes = []
+    for wire, old_verts, new_verts in zip(readable_wires, vertex_lists, new_vertex_lists):
+        changes.append((wire, old_verts, new_verts, mode))
+    unchanged = [change for change in changes if change[2] is None]
+    changes = [change for change in changes if change[2] is not None]
+
+    if plan_cache is not None:
+        plan_cache[plan_key] = {
+            'mode': mode,
+            'obstacles': obstacle_id,
+            'fingerprints': fingerprints,
+            'results': dict((wire.Id.IntegerValue, new_verts) for wire, old_verts, new_verts, m in changes),
+            'separated': separated,
+        }
+
+    return changes, unchanged, errors, separated, False
+
+
+def summarize_changes(changes):
+    """Per-wire diff rows (wire, added, removed, length_delta) and their totals"""
+    rows = []
+    for wire, old_verts, new_verts, mode in changes:
+        added, removed, delta = vertex_diff(old_verts, new_verts)
+        rows.append((wire, added, removed, delta))
+    totals = (sum(r[1] for r in rows), sum(r[2] for r in rows), sum(r[3] for r in rows))
+    return rows, totals
+
+
+def report_preview(rows, totals):
+    """Dry-run report: what Apply would change, per wire"""
+    output.print_md("---")
+    output.print_md("## Orthogonal Wire Cleanup — Preview (nothing changed)")
+    output.print_md("{} wire(s) would change | +{} / −{} vertices | length {:+,.2f}'".format(
+        len(rows), totals[0], totals[1], totals[2]))
+    output.print_md("")
+    output.print_md("| Wire | Vertices added | Vertices removed | Length change |")
+    output.print_md("|---|---|---|---|")
+    for wire, added, removed, delta in rows[:MAX_PREVIEW_ROWS]:
+        output.print_md("| {} | {} | {} | {:+.2f}' |".format(
+            output.linkify(wire.Id), added, removed, delta))
+    if len(rows) > MAX_PREVIEW_ROWS:
+        output.print_md("\n_{} more wire(s) not listed._".format(len(rows) - MAX_PREVIEW_ROWS))
     output.print_md(
-        "**No selection — processing all {} wire(s) in active view.**"
-        .format(len(all_wires))
+        "\n> ℹ Run Wire Fix again with the same settings and choose **Apply** — "
+        "this result is reused if the wires haven't changed."
     )
-    return all_wires
 
 
-# ══════════════════════════════════════════════════════════════════════════════
-#  MAIN PROCESSING
-# ══════════════════════════════════════════════════════════════════════════════
-
-def process_wires(doc, wires, routing):
+def write_chunk(doc, chunk, cache=None):
     """
-    Iterate wires, rebuild their vertex lists, set WiringType = Chamfer.
-
-    Returns (modified_count, skipped_count, error_count).
+    Write one chunk of (wire, old_vertices, new_vertices, mode) in its own transaction.
+    Entries without new_vertices are wires that are already clean: nothing is
+    written, they are only stamped so later runs skip reading them.
+    When a cache is given, the chunk is regenerated and each wire is stamped
+    with the fingerprint of the vertices Revit kept.
+    A failing wire is logged and skipped; if the commit itself fails the
+    whole chunk is rolled back. Returns (modified_count, error_count).
     """
     modified = 0
-    skipped  = 0
     errors   = 0
 
+    written  = []
+
     with Transaction(doc, "Orthogonalize Wire Graphics") as t:
         t.Start()
+        try:
+            for wire, old_verts, new_verts, mode in chunk:
+                if new_verts is None:
+                    if cache is not None:
+                        written.append((wire, mode))
+                    continue
+                try:
+                    wire.SetVertices(List[XYZ]([XYZ(x, y, z) for x, y, z in new_verts]))
+                    wire.WiringType = WiringType.Chamfer
+                    written.append((wire, mode))
+                    modified += 1
+
+                except Exception as e:
+                    logger.error(
+                        "Wire {} — {}: {}".format(
+                            wire.Id.IntegerValue,
+                            type(e).__name__,
+                            str(e)
+                        )
+                    )
+                    errors += 1
 
-        for wire in wires:
-            try:
-                old_verts = list(wire.GetVertices())
+            # Stamp what Revit kept (connector ends, Z and vertex count may be adjusted)
+            if cache is not None and written:
+                if modified:
+                    doc.Regenerate()
+                for wire, mode in written:
+                    try:
+                        cache.stamp(wire, mode)
+                    except Exception as e:
+                        logger.warning("Wire {} not stamped — {}: {}".format(
+                            wire.Id.IntegerValue, type(e).__name__, str(e)))
 
-                if len(old_verts) < 2:
-                    skipped += 1
-                    continue
+            status = t.Commit()
 
-                new_verts = orthogonalize_vertices(old_verts, routing)
+        except Exception as e:
+            logger.error("Chunk rolled back — {}: {}".format(type(e).__name__, str(e)))
+            status = None
 
-                if not vertices_changed(old_verts, new_verts):
-                    skipped += 1
-                    continue
+        if status != TransactionStatus.Committed:
+            if t.HasStarted() and not t.HasEnded():
+                t.RollBack()
+            return 0, sum(1 for change in chunk if change[2] is not None)
 
-                wire.SetVertices(new_verts)
-                wire.WiringType = WiringType.Chamfer
-                modified += 1
+    return modified, errors
 
-            except Exception as e:
-                logger.error(
-                    "Wire {} — {}: {}".format(
-                        wire.Id.IntegerValue,
-                        type(e).__name__,
-                        str(e)
-                    )
-                )
-                errors += 1
 
-        t.Commit()
+def apply_changes(doc, changes, cache=None, chunk_size=CHUNK_SIZE):
+    """
+    Write all changes in chunks of chunk_size wires with a cancellable
+    progress bar. The chunks are assimilated into one undo step.
+    Stamp-only entries (new_vertices None) go last and are not counted.
+
+    Returns (modified_count, error_count, cancelled_count).
+    """
+    modified = 0
+    errors   = 0
+    written  = 0
+
+    if not changes:
+        return modified, errors, 0
+
+    with TransactionGroup(doc, "Orthogonalize Wire Graphics") as tg:
+        tg.Start()
+        with forms.ProgressBar(title="Fixing wires ({value} of {max_value})", cancellable=True) as pb:
+            for chunk_start in range(0, len(changes), chunk_size):
+                if pb.cancelled:
+                    break
 
-    return modified, skipped, errors
+                chunk_modified, chunk_errors = write_chunk(doc, changes[chunk_start:chunk_start + chunk_size], cache)
+                modified += chunk_modified
+                errors   += chunk_errors
+
+                written = min(chunk_start + chunk_size, len(changes))
+                pb.update_progress(written, len(changes))
+        tg.Assimilate()
+
+    return modified, errors, sum(1 for change in changes[written:] if change[2] is not None)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -271,15 +656,57 @@ def main():
     uidoc = revit.uidoc
     view  = uidoc.ActiveView
 
-    # ── guard: plan views only ────────────────────────────────────────────────
-    if view.ViewType not in VALID_VIEW_TYPES:
+    # ── scope: active view (or selection) vs. several plan views ──────────────
+    scope = forms.CommandSwitchWindow.show(
+        SCOPE_OPTIONS,
+        message="Fix wires in:",
+    )
+    if not scope:
+        return  # user cancelled
+
+    duplicates = 0
+    if scope == SCOPE_OPTIONS[0]:
+        # ── guard: plan views only ────────────────────────────────────────────
+        if view.ViewType not in VALID_VIEW_TYPES:
+            forms.alert(
+                "This tool only works on plan views.\n\n"
+                "Active view type: {}\n\n"
+                "Switch to a Floor Plan or Engineering Plan and try again."
+                .format(view.ViewType),
+                title="Orthogonal Wires — Wrong View Type",
+                warn_icon=True,
+            )
+            return
+
+        sel_wires = get_selected_wires(doc)
+        if sel_wires:
+            output.print_md("**Using {} selected wire(s).**".format(len(sel_wires)))
+            jobs = [(view, sel_wires)]
+        else:
+            jobs = [(view, get_view_wires(doc, view))]
+            output.print_md(
+                "**No selection — processing all {} wire(s) in active view.**"
+                .format(len(jobs[0][1]))
+            )
+    else:
+        views = forms.select_views(
+            title="Select Plan Views",
+            multiple=True,
+            filterfunc=lambda v: v.ViewType in VALID_VIEW_TYPES and not v.IsTemplate,
+        )
+        if not views:
+            return
+        jobs, duplicates = collect_view_jobs(doc, views)
+        output.print_md(
+            "**Processing {} wire(s) in {} view(s).**"
+            .format(sum(len(wires) for v, wires in jobs), len(jobs))
+        )
+
+    if not any(wires for v, wires in jobs):
         forms.alert(
-            "This tool only works on plan views.\n\n"
-            "Active view type: {}\n\n"
-            "Switch to a Floor Plan or Engineering Plan and try again."
-            .format(view.ViewType),
-            title="Orthogonal Wires — Wrong View Type",
-            warn_icon=True,
+            "No wires found in the chosen view(s).\n"
+            "Make sure you're on a view that contains electrical wire graphics.",
+            title="Orthogonal Wires",
         )
         return
 
@@ -288,6 +715,7 @@ def main():
         "Auto (smart per-wire)",
         "Horizontal First  [→ then ↑]  force all",
         "Vertical First    [↑ then →]  force all",
+        "Avoid Obstacles   (fixtures, devices, tags)",
     ]
 
     choice = forms.CommandSwitchWindow.show(
@@ -298,6 +726,8 @@ def main():
             "                  dominant axis. Best for warehouse/grid layouts.\n\n"
             "  Horizontal First — all wires run east/west first, then north/south.\n\n"
             "  Vertical First   — all wires run north/south first, then east/west.\n\n"
+            "  Avoid Obstacles  — each diagonal takes the L or Z route that\n"
+            "                     crosses the fewest fixtures, devices and tags.\n\n"
             "Tip: for lighting circuits on a building grid (like the H1/H1E\n"
             "     pattern in plan views), Auto usually gives the cleanest result."
         ),
@@ -310,21 +740,88 @@ def main():
         options[0]: "auto",
         options[1]: "h_first",
         options[2]: "v_first",
+        options[3]: "avoid",
     }
     routing = routing_map[choice]
 
-    # ── collect & process ─────────────────────────────────────────────────────
-    wires = collect_wires(doc, view)
+    frame_name = forms.CommandSwitchWindow.show(
+        FRAME_OPTIONS,
+        message="Square the wires to:",
+    )
+    if not frame_name:
+        return  # user cancelled
 
-    if not wires:
-        forms.alert(
-            "No wires found in the active view.\n"
-            "Make sure you're on a view that contains electrical wire graphics.",
-            title="Orthogonal Wires",
+    frames = None
+    frame_id = "axes"
+    if frame_name == FRAME_OPTIONS[1]:
+        frames, frame_id = build_grid_frames(doc)
+        if not frames.lines:
+            forms.alert("No straight grid lines in this model — using the project axes.",
+                        title="Orthogonal Wires")
+            frames, frame_id = None, "axes"
+    elif frame_name == FRAME_OPTIONS[2]:
+        scope_box_frames = build_scope_box_frames(doc)
+        if scope_box_frames is None:
+            return
+        frames, frame_id = scope_box_frames
+
+    separation = ask_separation()
+    if separation is None:
+        return  # user cancelled
+
+    # ── plan every view (geometry only), then write in chunks ─────────────────
+    # Shift+Click: re-read every wire instead of trusting the cheap fingerprint check
+    full_check = EXEC_PARAMS.config_mode
+    cache      = WireFingerprintCache()
+    plan_cache = get_plan_cache()
+    reused     = 0
+    changes    = []
+    unchanged  = []     # already clean: stamped on Apply so later runs skip them
+    errors     = 0
+    separated  = 0
+    obstacle_count = 0
+    view_rows  = []
+
+    for job_view, wires in jobs:
+        if not wires:
+            continue
+        obstacles = build_obstacle_index(doc, job_view) if routing == "avoid" else None
+        if obstacles is not None:
+            obstacle_count += len(obstacles)
+
+        view_changes, view_unchanged, view_errors, view_separated, view_reused = plan_wires(
+            wires, routing, obstacles, separation_in_view(separation, job_view), cache, full_check,
+            frames, frame_id, plan_cache, get_plan_key(doc, job_view)
         )
-        return
+        reused    += view_reused
+        changes.extend(view_changes)
+        unchanged.extend(view_unchanged)
+        errors    += view_errors
+        separated += view_separated
+        view_rows.append((job_view.Name, len(wires), len(view_changes)))
+
+    # ── apply or preview (dry run) ────────────────────────────────────────────
+    if changes:
+        diff_rows, diff_totals = summarize_changes(changes)
+        action = forms.CommandSwitchWindow.show(
+            ACTION_OPTIONS,
+            message=(
+                "{} wire(s) to change: +{} / −{} vertices, length {:+,.1f}'."
+                .format(len(changes), diff_totals[0], diff_totals[1], diff_totals[2])
+            ),
+        )
+        if not action:
+            return  # user cancelled (the plan stays cached)
+        if action == ACTION_OPTIONS[1]:
+            report_preview(diff_rows, diff_totals)
+            return
+
+    modified, write_errors, cancelled = apply_changes(doc, changes + unchanged, cache)
+    errors += write_errors
 
-    modified, skipped, errors = process_wires(doc, wires, routing)
+    # Written plans are stale now
+    for job_view, wires in jobs:
+        plan_cache.pop(get_plan_key(doc, job_view), None)
 
     # ── results summary ───────────────────────────────────────────────────────
     output.print_md("---")
@@ -333,10 +830,30 @@ def main():
     output.print_md("| | |")
     output.print_md("|---|---|")
     output.print_md("| **Wires straightened** | {} |".format(modified))
-    output.print_md("| Already orthogonal (skipped) | {} |".format(skipped))
+    output.print_md("| Already orthogonal (skipped) | {} |".format(len(unchanged)))
+    output.print_md("| Untouched since last run ({}) | {} of {} ({:.0%}) |".format(
+        "full check" if full_check else "fingerprint", cache.hits, cache.checked, cache.hit_rate))
+    output.print_md("| Offset from overlapping wires | {} |".format(separated))
+    if reused:
+        output.print_md("| Views reusing the previewed result | {} |".format(reused))
     output.print_md("| Errors | {} |".format(errors))
+    if cancelled:
+        output.print_md("| Not written (cancelled) | {} |".format(cancelled))
     output.print_md("| Routing mode | {} |".format(choice))
-    output.print_md("| View | {} |".format(view.Name))
+    output.print_md("| Grid frame | {} |".format(frame_name))
+    if routing == "avoid":
+        output.print_md("| Obstacles indexed | {} |".format(obstacle_count))
+    if len(jobs) == 1:
+        output.print_md("| View | {} |".format(jobs[0][0].Name))
+    else:
+        output.print_md("| Views | {} |".format(len(jobs)))
+        output.print_md("| Wires shown in more than one view (done once) | {} |".format(duplicates))
+
+        output.print_md("")
+        output.print_md("| View | Wires | To fix |")
+        output.print_md("|---|---|---|")
+        for name, wire_count, change_count in view_rows:
+            output.print_md("| {} | {} | {} |".format(name, wire_count, change_count))
 
     if errors:
         output.print_md(
@@ -345,6 +862,10 @@ def main():
             "connector constraints. Check the pyRevit output log for details."
             .format(errors)
         )
+    elif cancelled:
+        output.print_md(
+            "\n> ℹ Cancelled — {} wire(s) were left as they were.".format(cancelled)
+        )
     elif modified == 0:
         output.print_md(
             "\n> ℹ All wires were already orthogonal — nothing to fix."
@@ -356,4 +877,4 @@ def main():
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-main()
\ No newline at end of file
+main()
@@ -4,6 +4,7 @@ __author__ = "Christopher Berndt"
 __doc__ = "Counts all Electrical Fixtures in the host and linked models, grouped by Family + Type, and exports to CSV or Excel."
 
 from pyrevit import revit, DB, script, forms
+from Snippets._links import LinkRegistry
 import os
 import csv
 from datetime import datetime
@@ -550,11 +551,9 @@ def get_fixture_system(fixture):
 host_fixtures = get_fixtures_from_doc(doc)
 linked_fixtures = []
 
-for link_instance in DB.FilteredElementCollector(doc).OfClass(DB.RevitLinkInstance):
-    link_doc = link_instance.GetLinkDocument()
-    if not link_doc:
-        continue
-    linked_fixtures.extend(get_fixtures_from_doc(link_doc))
+# Each placed link instance is counted (a link placed twice counts twice)
+for link in LinkRegistry(doc).loaded():
+    linked_fixtures.extend(get_fixtures_from_doc(link.document))
 
 
 # -----------------------------
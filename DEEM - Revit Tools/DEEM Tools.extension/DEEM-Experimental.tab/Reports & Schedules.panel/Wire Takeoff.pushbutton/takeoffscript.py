@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""Wire Length Takeoff"""
+__title__ = "Wire\nTakeoff"
+__author__ = "Christopher Berndt"
+__doc__ = "Wire length takeoff from the drawn wire graphics: plan length plus vertical drops, totalled by panel, circuit and wire type. Exports to CSV or Excel."
+
+import csv
+import time
+from datetime import datetime
+
+from pyrevit import revit, DB, forms, script
+from Autodesk.Revit.DB.Electrical import Wire
+
+from Snippets._wires import plan_lengths, to_tuples
+
+output = script.get_output()
+config = script.get_config(section='WireTakeoff')
+
+SCOPE_OPTIONS = [
+    "Active View  (or selected wires)",
+    "Entire Model",
+]
+
+EXPORT_OPTIONS = [
+    "Export to CSV",
+    "Export to Excel",
+    "Done",
+]
+
+# Default vertical drops (feet)
+DEFAULT_DEVICE_DROP = 0.0     # per wire end connected to a device
+DEFAULT_HOMERUN_DROP = 10.0   # per homerun (wire end left open towards the panel)
+
+NOT_CIRCUITED = "(none)"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Collection
+# ─────────────────────────────────────────────────────────────────────────────
+def get_wires(doc, scope):
+    """Selected wires, else all wires in the active view, or the whole model"""
+    if scope == SCOPE_OPTIONS[1]:
+        return list(DB.FilteredElementCollector(doc).OfClass(Wire).WhereElementIsNotElementType())
+
+    selected = [doc.GetElement(eid) for eid in revit.get_selection().element_ids]
+    selected = [elem for elem in selected if isinstance(elem, Wire)]
+    if selected:
+        return selected
+    return list(DB.FilteredElementCollector(doc, doc.ActiveView.Id).OfClass(Wire))
+
+
+def get_param_text(element, built_in_param, name):
+    """Parameter value as text, by built-in parameter then by name"""
+    param = element.get_Parameter(built_in_param) or element.LookupParameter(name)
+    if param is None or not param.HasValue:
+        return ""
+    return param.AsString() or param.AsValueString() or ""
+
+
+def count_connected_ends(wire):
+    """Number of wire ends connected to a device or panel"""
+    try:
+        return sum(1 for connector in wire.ConnectorManager.Connectors if connector.IsConnected)
+    except:
+        return 0
+
+
+def read_wires(doc, wires):
+    """
+    Vertices and grouping keys of every wire.
+    Returns (rows, vertex_lists, failed); rows are dicts aligned with vertex_lists.
+    """
+    type_names = {}
+    rows = []
+    vertex_lists = []
+    failed = 0
+    for wire in wires:
+        try:
+            vertices = to_tuples(wire.GetVertices())
+        except Exception:
+            failed += 1
+            continue
+
+        type_id = wire.GetTypeId()
+        key = type_id.IntegerValue
+        if key not in type_names:
+            wire_type = doc.GetElement(type_id)
+            type_names[key] = DB.Element.Name.GetValue(wire_type) if wire_type else ""
+
+        connected = count_connected_ends(wire)
+        rows.append({
+            'panel': get_param_text(wire, DB.BuiltInParameter.RBS_ELEC_CIRCUIT_PANEL_PARAM, "Panel") or NOT_CIRCUITED,
+            'circuit': get_param_text(wire, DB.BuiltInParameter.RBS_ELEC_CIRCUIT_NUMBER, "Circuits") or NOT_CIRCUITED,
+            'wire_type': type_names[key],
+            'connected': connected,
+            # A homerun is drawn from the last device with its far end open (arrow to the panel)
+            'homerun': connected == 1,
+        })
+        vertex_lists.append(vertices)
+    return rows, vertex_lists, failed
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Takeoff
+# ─────────────────────────────────────────────────────────────────────────────
+def ask_drop(attr_name, default, prompt):
+    """Vertical drop in feet, remembered between runs; None if cancelled or invalid"""
+    text = forms.ask_for_string(
+        default="{:g}".format(getattr(config, attr_name, default)),
+        prompt=prompt,
+        title="Wire Takeoff"
+    )
+    if text is None:
+        return None
+    try:
+        value = max(float(text), 0.0)
+    except ValueError:
+        forms.alert("'{}' is not a number.".format(text), title="Wire Takeoff")
+        return None
+    setattr(config, attr_name, value)
+    return value
+
+
+def aggregate(rows, lengths, device_drop, homerun_drop):
+    """
+    Totals per (panel, circuit, wire type).
+    Returns a sorted list of dicts with wires, homeruns, plan, drops and total (feet).
+    """
+    groups = {}
+    for row, length in zip(rows, lengths):
+        key = (row['panel'], row['circuit'], row['wire_type'])
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {'panel': key[0], 'circuit': key[1], 'wire_type': key[2],
+                                   'wires': 0, 'homeruns': 0, 'plan': 0.0, 'drops': 0.0}
+        group['wires'] += 1
+        group['plan'] += length
+        group['drops'] += row['connected'] * device_drop
+        if row['homerun']:
+            group['homeruns'] += 1
+            group['drops'] += homerun_drop
+
+    result = sorted(groups.values(), key=lambda g: (g['panel'], g['circuit'], g['wire_type']))
+    for group in result:
+        group['total'] = group['plan'] + group['drops']
+    return result
+
+
+def subtotal(groups, field):
+    """Totals per value of one field (e.g. 'panel' or 'wire_type')"""
+    totals = {}
+    for group in groups:
+        entry = totals.setdefault(group[field], {'wires': 0, 'homeruns': 0, 'total': 0.0})
+        entry['wires'] += group['wires']
+        entry['homeruns'] += group['homeruns']
+        entry['total'] += group['total']
+    return sorted(totals.items())
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Export
+# ─────────────────────────────────────────────────────────────────────────────
+EXPORT_HEADERS = ["Panel", "Circuit", "Wire Type", "Wires", "Homeruns", "Plan (ft)", "Drops (ft)", "Total (ft)"]
+
+
+def export_row(group):
+    return [group['panel'], group['circuit'], group['wire_type'], group['wires'], group['homeruns'],
+            round(group['plan'], 2), round(group['drops'], 2), round(group['total'], 2)]
+
+
+def safe_encode(item):
+    """Safely encode string for CSV export"""
+    try:
+        if hasattr(item, 'encode'):
+            return item.encode("utf-8")
+        return str(item)
+    except:
+        return str(item)
+
+
+def export_csv(groups, project_name):
+    timestamp = datetime.now().strftime("%Y-%m-%d")
+    save_path = forms.save_file(
+        file_ext="csv",
+        title="Save Wire Takeoff As CSV",
+        default_name="Wire_Takeoff_{}_{}.csv".format(project_name, timestamp)
+    )
+    if not save_path:
+        return
+
+    try:
+        f = open(save_path, "wb")  # binary mode for IronPython
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_HEADERS)
+        for group in groups:
+            writer.writerow([safe_encode(value) for value in export_row(group)])
+        f.close()
+        forms.alert("CSV exported successfully:\n{}".format(save_path), title="Export Successful")
+    except Exception as e:
+        forms.alert("CSV export failed:\n{}".format(e), title="Export Failed")
+
+
+def export_excel(groups, project_name):
+    timestamp = datetime.now().strftime("%Y-%m-%d")
+    save_path = forms.save_file(
+        file_ext="xlsx",
+        title="Save Wire Takeoff As Excel",
+        default_name="Wire_Takeoff_{}_{}.xlsx".format(project_name, timestamp)
+    )
+    if not save_path:
+        return
+
+    try:
+        import xlsxwriter
+
+        workbook = xlsxwriter.Workbook(save_path)
+        worksheet = workbook.add_worksheet("Wire Takeoff")
+        header_format = workbook.add_format({'bold': True, 'bg_color': '#DCE6F1', 'border': 1})
+        normal_format = workbook.add_format({'border': 1})
+        total_format = workbook.add_format({'bold': True, 'border': 1, 'bg_color': '#FFF2CC'})
+
+        for col_num, header in enumerate(EXPORT_HEADERS):
+            worksheet.write(0, col_num, header, header_format)
+        row_num = 1
+        for group in groups:
+            for col_num, value in enumerate(export_row(group)):
+                worksheet.write(row_num, col_num, value, normal_format)
+            row_num += 1
+
+        worksheet.write(row_num, 0, "TOTAL", total_format)
+        for col_num in range(1, 3):
+            worksheet.write(row_num, col_num, "", total_format)
+        worksheet.write(row_num, 3, sum(g['wires'] for g in groups), total_format)
+        worksheet.write(row_num, 4, sum(g['homeruns'] for g in groups), total_format)
+        worksheet.write(row_num, 5, round(sum(g['plan'] for g in groups), 2), total_format)
+        worksheet.write(row_num, 6, round(sum(g['drops'] for g in groups), 2), total_format)
+        worksheet.write(row_num, 7, round(sum(g['total'] for g in groups), 2), total_format)
+
+        worksheet.set_column(0, 2, 20)
+        worksheet.set_column(3, 7, 12)
+        workbook.close()
+        forms.alert("Excel exported successfully:\n{}".format(save_path), title="Export Successful")
+
+    except ImportError:
+        forms.alert("XlsxWriter not installed. Try exporting as CSV instead.", title="Export Failed")
+    except Exception as e:
+        forms.alert("Excel export failed:\n{}".format(e), title="Export Failed")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+def main():
+    doc = revit.doc
+
+    scope = forms.CommandSwitchWindow.show(SCOPE_OPTIONS, message="Take off wires in:")
+    if not scope:
+        return
+
+    device_drop = ask_drop('device_drop', DEFAULT_DEVICE_DROP,
+                           "Vertical drop per connected wire end (feet):")
+    if device_drop is None:
+        return
+    homerun_drop = ask_drop('homerun_drop', DEFAULT_HOMERUN_DROP,
+                            "Vertical drop per homerun, to the panel (feet):")
+    if homerun_drop is None:
+        return
+    script.save_config()
+
+    start_time = time.time()
+    wires = get_wires(doc, scope)
+    if not wires:
+        forms.alert("No wires found.", title="Wire Takeoff")
+        return
+
+    rows, vertex_lists, failed = read_wires(doc, wires)
+    lengths = plan_lengths(vertex_lists)
+    groups = aggregate(rows, lengths, device_drop, homerun_drop)
+    elapsed = time.time() - start_time
+
+    # ── report ───────────────────────────────────────────────────────────────
+    output.print_md("## Wire Length Takeoff")
+    output.print_md("{} wire(s) | {} | Drops: {:g}' per device end, {:g}' per homerun | {:.2f}s".format(
+        len(rows), scope.strip(), device_drop, homerun_drop, elapsed))
+    if failed:
+        output.print_md("> ⚠ {} wire(s) could not be read and are not included.".format(failed))
+
+    output.print_md("\n### By Panel")
+    output.print_md("| Panel | Wires | Homeruns | Total (ft) |")
+    output.print_md("|---|---|---|---|")
+    for panel, entry in subtotal(groups, 'panel'):
+        output.print_md("| {} | {} | {} | {:,.1f} |".format(panel, entry['wires'], entry['homeruns'], entry['total']))
+
+    output.print_md("\n### By Wire Type")
+    output.print_md("| Wire Type | Wires | Homeruns | Total (ft) |")
+    output.print_md("|---|---|---|---|")
+    for wire_type, entry in subtotal(groups, 'wire_type'):
+        output.print_md("| {} | {} | {} | {:,.1f} |".format(wire_type, entry['wires'], entry['homeruns'], entry['total']))
+
+    output.print_md("\n### By Circuit")
+    output.print_md("| " + " | ".join(EXPORT_HEADERS) + " |")
+    output.print_md("|" + "---|" * len(EXPORT_HEADERS))
+    for group in groups:
+        output.print_md("| {} | {} | {} | {} | {} | {:,.1f} | {:,.1f} | {:,.1f} |".format(
+            group['panel'], group['circuit'], group['wire_type'], group['wires'], group['homeruns'],
+            group['plan'], group['drops'], group['total']))
+    output.print_md("| **TOTAL** | | | **{}** | **{}** | **{:,.1f}** | **{:,.1f}** | **{:,.1f}** |".format(
+        sum(g['wires'] for g in groups), sum(g['homeruns'] for g in groups),
+        sum(g['plan'] for g in groups), sum(g['drops'] for g in groups), sum(g['total'] for g in groups)))
+
+    # ── export ───────────────────────────────────────────────────────────────
+    project_name = doc.Title.replace(".rvt", "")
+    choice = forms.CommandSwitchWindow.show(EXPORT_OPTIONS, message="Export the takeoff?")
+    if choice == EXPORT_OPTIONS[0]:
+        export_csv(groups, project_name)
+    elif choice == EXPORT_OPTIONS[1]:
+        export_excel(groups, project_name)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+main()
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Ceiling Grid Calibration Store
+Saved ceiling grid calibrations for the lighting tools, kept in one JSON file
+in the pyRevit data folder. The whole table is read and written in one go.
+
+Layout:
+    {"version": 1,
+     "links": {<link document GUID>: {"name": <link name>,
+                                      "ceilings": {<ceiling UniqueId>: {"offset_x": .., "offset_y": ..,
+                                                                        "spacing_x": .., "spacing_y": .., "angle": ..}}}}}
+"""
+
+import json
+import os
+
+from pyrevit import script, DB
+from Snippets._links import get_link_document_key
+
+STORE_FILE_ID = 'DEEM_LightCenterCalibration'
+STORE_VERSION = 1
+
+# Order of values in a calibration tuple (angle in radians, 0 for grids aligned to the link axes)
+GRID_FIELDS = ('offset_x', 'offset_y', 'spacing_x', 'spacing_y', 'angle')
+GRID_DEFAULTS = {'angle': 0.0}
+
+# Flat pyRevit config attributes used before the store existed
+LEGACY_PREFIXES = ('grid_offset_', 'grid_spacing_')
+
+
+def get_link_key(link_doc):
+    """Stable identity of a linked document (survives renaming and reloading the link)"""
+    return get_link_document_key(link_doc)
+
+
+class CalibrationStore(object):
+    """Ceiling grid calibrations keyed by link document GUID and ceiling UniqueId"""
+
+    def __init__(self, file_path=None):
+        self.file_path = file_path or script.get_universal_data_file(STORE_FILE_ID, 'json')
+        self.links = {}
+        self.load()
+
+    def load(self):
+        """Read the whole table from disk (missing or unreadable file gives an empty store)"""
+        self.links = {}
+        if not os.path.exists(self.file_path):
+            return
+        try:
+            with open(self.file_path, 'r') as store_file:
+                data = json.load(store_file)
+            self.links = data.get('links', {})
+        except Exception as load_error:
+            print("WARNING: Could not read calibration store {}: {}".format(self.file_path, load_error))
+
+    def save(self):
+        """Write the whole table to disk"""
+        with open(self.file_path, 'w') as store_file:
+            json.dump({'version': STORE_VERSION, 'links': self.links}, store_file, indent=1, sort_keys=True)
+
+    # -----------------------------
+    # Links
+    # -----------------------------
+    def get_link_names(self):
+        """Dictionary: link key -> link name as last seen"""
+        return dict((key, entry.get('name', key)) for key, entry in self.links.items())
+
+    def get_link_entry(self, link_doc, link_name=None, create=False):
+        """Stored entry for a link document, optionally created"""
+        key = get_link_key(link_doc)
+        entry = self.links.get(key)
+        if entry is None and create:
+            entry = {'name': link_name or link_doc.Title, 'ceilings': {}}
+            self.links[key] = entry
+        elif entry is not None and link_name:
+            entry['name'] = link_name
+        return entry
+
+    def reset_link(self, link_key):
+        """Remove all calibrations of one link. Returns number of ceilings removed."""
+        entry = self.links.pop(link_key, None)
+        return len(entry.get('ceilings', {})) if entry else 0
+
+    def reset_all(self):
+        """Remove every calibration. Returns number of ceilings removed."""
+        count = sum(len(entry.get('ceilings', {})) for entry in self.links.values())
+        self.links = {}
+        return count
+
+    # -----------------------------
+    # Ceilings
+    # -----------------------------
+    def get_ceiling_grids(self, link_doc):
+        """Dictionary: ceiling UniqueId -> (offset_x, offset_y, spacing_x, spacing_y, angle)"""
+        entry = self.get_link_entry(link_doc)
+        if not entry:
+            return {}
+        grids = {}
+        for unique_id, values in entry.get('ceilings', {}).items():
+            try:
+                grids[unique_id] = tuple(float(values.get(field, GRID_DEFAULTS.get(field))) for field in GRID_FIELDS)
+            except (KeyError, TypeError, ValueError):
+                continue
+        return grids
+
+    def set_ceiling_grid(self, link_doc, ceiling_unique_id, grid, link_name=None):
+        """Store (offset_x, offset_y, spacing_x, spacing_y, angle) for a ceiling (call save() afterwards)"""
+        entry = self.get_link_entry(link_doc, link_name, create=True)
+        entry.setdefault('ceilings', {})[ceiling_unique_id] = dict(zip(GRID_FIELDS, grid))
+
+
+def is_legacy_attribute(attr_name):
+    """True for the old per-ceiling config attributes (grid_offset_ceiling_<link>_<id>_x, ...)"""
+    return attr_name.startswith(LEGACY_PREFIXES)
+
+
+def get_legacy_attributes(config, link_name=None):
+    """
+    Names of the old flat config attributes, all of them or those of one link
+    (grid_offset_ceiling_<link>_<id>_x, grid_spacing_ceiling_<link>_<id>_y, ...)
+    """
+    if link_name is None:
+        return [a for a in dir(config) if is_legacy_attribute(a)]
+    # "<link>_<id>_x" must follow the prefix, so link "A" does not claim the attributes of link "A_B"
+    prefixes = tuple('{}ceiling_{}_'.format(prefix, link_name) for prefix in LEGACY_PREFIXES)
+    names = []
+    for attr_name in dir(config):
+        for prefix in prefixes:
+            if attr_name.startswith(prefix) and attr_name[len(prefix):-2].isdigit() and attr_name[-2:] in ('_x', '_y'):
+                names.append(attr_name)
+                break
+    return names
+
+
+def import_legacy_config(config, store, link_name, link_doc):
+    """
+    Move the old flat config calibrations of one link into the store and delete them.
+    The link name is matched as a whole prefix, so names containing underscores work.
+    Returns number of ceilings imported (call store.save() and script.save_config() afterwards).
+    """
+    offset_prefix = 'grid_offset_ceiling_{}_'.format(link_name)
+    imported = 0
+    for attr_name in [a for a in dir(config) if a.startswith(offset_prefix) and a.endswith('_x')]:
+        id_text = attr_name[len(offset_prefix):-2]
+        keys = ['grid_offset_ceiling_{}_{}_x'.format(link_name, id_text),
+                'grid_offset_ceiling_{}_{}_y'.format(link_name, id_text),
+                'grid_spacing_ceiling_{}_{}_x'.format(link_name, id_text),
+                'grid_spacing_ceiling_{}_{}_y'.format(link_name, id_text)]
+        values = [getattr(config, key, None) for key in keys]
+        try:
+            ceiling = link_doc.GetElement(DB.ElementId(int(id_text)))
+        except ValueError:
+            continue
+        if ceiling is not None and all(v is not None for v in values):
+            store.set_ceiling_grid(link_doc, ceiling.UniqueId, values + [0.0], link_name)
+            imported += 1
+        for key in keys:
+            try:
+                delattr(config, key)
+            except:
+                pass
+    return imported
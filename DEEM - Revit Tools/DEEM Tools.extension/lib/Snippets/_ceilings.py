@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+Ceiling Index
+Spatial index of ceilings in a linked model, used by the lighting tools to find
+the ceiling above a fixture without scanning every ceiling for every fixture.
+
+The index is built once per link document. Bounding boxes only pick the
+candidates; the ceiling is chosen by testing the point against its boundary
+polygon, so L-shaped and overlapping ceilings resolve correctly. Ceiling ids,
+boxes and boundaries (plain data, no elements) are kept for the rest of the
+Revit session, so running the tool again on the same link skips the geometry
+reads. Entries of closed or reloaded documents are evicted on the next access.
+"""
+
+import math
+
+import System
+from Autodesk.Revit import DB
+
+from Snippets._spatial import GridHash2D
+from Snippets._geometry import PlanRegion, chain_polylines
+from Snippets._links import LinkInfo
+
+# AppDomain slot shared by every script run in this Revit session
+SESSION_CACHE_KEY = "DEEM.CeilingIndexCache"
+
+# Fill grids within this angle (radians) of 0/90 degrees count as axis aligned
+ANGLE_TOLERANCE = 1e-6
+
+
+def get_session_cache():
+    """Dictionary that survives between script runs for the current Revit session"""
+    domain = System.AppDomain.CurrentDomain
+    cache = domain.GetData(SESSION_CACHE_KEY)
+    if cache is None:
+        cache = {}
+        domain.SetData(SESSION_CACHE_KEY, cache)
+    return cache
+
+
+def get_document_key(document):
+    """Identity of a loaded document. Reloading a link gives a new document object."""
+    return (document.PathName, document.GetHashCode())
+
+
+def evict_closed_documents(cache, application):
+    """Drop cache entries of documents that are no longer open (closed or reloaded links)"""
+    open_keys = set(get_document_key(document) for document in application.Documents)
+    for key in list(cache.keys()):
+        if key not in open_keys:
+            del cache[key]
+
+
+def read_ceiling_boxes(document):
+    """
+    Collect all ceilings and their plan bounding boxes (document coordinates).
+    Returns list of (ceiling id, (min_x, min_y, max_x, max_y))
+    """
+    entries = []
+    for ceiling in DB.FilteredElementCollector(document).OfClass(DB.Ceiling):
+        try:
+            bbox = ceiling.get_BoundingBox(None)
+            if bbox:
+                entries.append((ceiling.Id.IntegerValue,
+                                (bbox.Min.X, bbox.Min.Y, bbox.Max.X, bbox.Max.Y)))
+        except:
+            continue
+    return entries
+
+
+def curve_loop_points(curves):
+    """Plan (x, y) points along a chain of curves ordered head-to-tail, arcs tessellated"""
+    points = []
+    for curve in curves:
+        tessellated = list(curve.Tessellate())
+        # Each curve's end is the next curve's start
+        for point in tessellated[:-1]:
+            points.append((point.X, point.Y))
+    return points
+
+
+def curve_polyline(curve):
+    """Plan (x, y) points of one curve, arcs tessellated, end point included"""
+    return [(point.X, point.Y) for point in curve.Tessellate()]
+
+
+def get_sketch_loops(ceiling):
+    """
+    Boundary loops from the ceiling sketch (Revit 2022+), or None.
+    Profile curves are not guaranteed to be ordered or oriented head-to-tail,
+    so they are chained by matching end points.
+    """
+    try:
+        sketch_id = ceiling.SketchId
+    except AttributeError:
+        return None
+    if sketch_id is None or sketch_id == DB.ElementId.InvalidElementId:
+        return None
+    sketch = ceiling.Document.GetElement(sketch_id)
+    if sketch is None:
+        return None
+    loops = []
+    for curve_array in sketch.Profile:
+        loops.extend(chain_polylines([curve_polyline(curve) for curve in curve_array]))
+    return loops
+
+
+def get_bottom_face_loops(ceiling):
+    """Boundary loops from the ceiling's bottom face (ordered curve loops), or None"""
+    loops = []
+    for reference in DB.HostObjectUtils.GetBottomFaces(ceiling):
+        face = ceiling.GetGeometryObjectFromReference(reference)
+        if not isinstance(face, DB.PlanarFace):
+            continue
+        for curve_loop in face.GetEdgesAsCurveLoops():
+            loops.append(curve_loop_points(curve_loop))
+    return loops or None
+
+
+def get_ceiling_region(ceiling):
+    """Plan boundary of a ceiling as a PlanRegion (bottom face first, then sketch)"""
+    for read_loops in (get_bottom_face_loops, get_sketch_loops):
+        try:
+            loops = read_loops(ceiling)
+        except:
+            loops = None
+        if loops:
+            region = PlanRegion(loops)
+            if region:
+                return region
+    return None
+
+
+def get_ceiling_cache(document):
+    """
+    Session cache entry for a document: (ids, [(ceiling id, bbox), ...], {ceiling id: region})
+    Rebuilt when the set of ceiling ids changes.
+    """
+    cache = get_session_cache()
+    evict_closed_documents(cache, document.Application)
+    key = get_document_key(document)
+    ids = frozenset(element_id.IntegerValue for element_id in
+                    DB.FilteredElementCollector(document).OfClass(DB.Ceiling).ToElementIds())
+
+    cached = cache.get(key)
+    if cached is not None and cached[0] == ids:
+        return cached
+
+    cached = (ids, read_ceiling_boxes(document), {})
+    cache[key] = cached
+    return cached
+
+
+def get_ceiling_boxes(document):
+    """Ceiling bounding boxes for a document, cached per session"""
+    return get_ceiling_cache(document)[1]
+
+
+class CeilingIndex(object):
+    """
+    2D spatial index of the ceilings in a linked model.
+    Points are queried in link coordinates; use to_link() to convert host points.
+    """
+
+    def __init__(self, link):
+        # Accept a LinkInfo from the link registry or a plain RevitLinkInstance
+        if isinstance(link, DB.RevitLinkInstance):
+            link = LinkInfo(link)
+        self.link = link
+        self.link_instance = link.instance
+        self.link_doc = link.document
+
+        # Transform and its inverse are cached on the link, not computed per fixture
+        self.transform = link.transform
+        self.inverse_transform = link.inverse_transform
+
+        self.ceilings = {}  # ceiling id -> ceiling element (resolved for this run only)
+        self.regions = {}   # ceiling id -> PlanRegion (None if no boundary), filled on first use
+        keyed_boxes = []
+        if self.link_doc:
+            ids, entries, self.regions = get_ceiling_cache(self.link_doc)
+            for ceiling_id, box in entries:
+                ceiling = self.link_doc.GetElement(DB.ElementId(ceiling_id))
+                if ceiling is None or not ceiling.IsValidObject:
+                    continue
+                self.ceilings[ceiling_id] = ceiling
+                keyed_boxes.append((ceiling_id, box))
+
+        self.grid = GridHash2D.from_boxes(keyed_boxes)
+
+    def __len__(self):
+        return len(self.ceilings)
+
+    def to_link(self, host_point):
+        """Convert a host model point to link coordinates"""
+        return self.inverse_transform.OfPoint(host_point)
+
+    def to_host(self, link_point):
+        """Convert a link coordinate point to host model coordinates"""
+        return self.transform.OfPoint(link_point)
+
+    def get_region(self, ceiling_id):
+        """Boundary region of a ceiling, extracted once and cached"""
+        if ceiling_id not in self.regions:
+            self.regions[ceiling_id] = get_ceiling_region(self.ceilings[ceiling_id])
+        return self.regions[ceiling_id]
+
+    def ceilings_at_link_point(self, link_point):
+        """All ceilings whose boundary contains the point (link coordinates)"""
+        x, y = link_point.X, link_point.Y
+        result = []
+        for ceiling_id in self.grid.query_point(x, y):
+            region = self.get_region(ceiling_id)
+            # Ceilings without a readable boundary fall back to their bounding box
+            if region is None or region.contains(x, y):
+                result.append(self.ceilings[ceiling_id])
+        return result
+
+    def ceiling_at_point(self, host_point):
+        """Ceiling containing a host model point, or None"""
+        link_point = self.to_link(host_point)
+        x, y = link_point.X, link_point.Y
+        fallback = None
+        for ceiling_id in self.grid.query_point(x, y):
+            region = self.get_region(ceiling_id)
+            if region is None:
+                if fallback is None:
+                    fallback = self.ceilings[ceiling_id]
+            elif region.contains(x, y):
+                return self.ceilings[ceiling_id]
+        return fallback
+
+
+# -----------------------------
+# Grid detection from surface patterns
+# -----------------------------
+def get_bottom_face_material_id(ceiling):
+    """Material of the ceiling's bottom face, or None"""
+    for reference in DB.HostObjectUtils.GetBottomFaces(ceiling):
+        face = ceiling.GetGeometryObjectFromReference(reference)
+        if face is not None and face.MaterialElementId != DB.ElementId.InvalidElementId:
+            return face.MaterialElementId
+    return None
+
+
+def get_pattern_group_key(ceiling):
+    """
+    (material id, plane) of the ceiling's bottom face, or None. Ceilings with the
+    same key share one pattern on one plane, so a grid picked on one of them
+    places the pattern on the others (unless it was moved or rotated there).
+    """
+    for reference in DB.HostObjectUtils.GetBottomFaces(ceiling):
+        face = ceiling.GetGeometryObjectFromReference(reference)
+        if not isinstance(face, DB.PlanarFace) or face.MaterialElementId == DB.ElementId.InvalidElementId:
+            continue
+        normal = face.FaceNormal
+        plane = (round(normal.X, 3), round(normal.Y, 3), round(normal.Z, 3),
+                 round(normal.DotProduct(face.Origin), 3))
+        return face.MaterialElementId.IntegerValue, plane
+    return None
+
+
+def get_surface_pattern_id(material):
+    """Surface (foreground) fill pattern of a material, or None"""
+    pattern_id = getattr(material, 'SurfaceForegroundPatternId', None)  # Revit 2019+
+    if pattern_id is None:
+        pattern_id = getattr(material, 'SurfacePatternId', None)
+    if pattern_id is None or pattern_id == DB.ElementId.InvalidElementId:
+        return None
+    return pattern_id
+
+
+def pick_line_family(fill_grids):
+    """Grid line family to snap to: continuous lines first, then the tightest spacing"""
+    return min(fill_grids, key=lambda g: (len(list(g.GetSegments())) > 0, g.Offset))
+
+
+def get_pattern_grid(fill_pattern):
+    """
+    Spacing and direction of a model fill pattern as (spacing_x, spacing_y, angle),
+    spacing in feet. None if the pattern is not a rectangular model grid.
+    The angle is the pattern definition's: where the grid lines fall on a face
+    and how the pattern is rotated there are set per ceiling (align/rotate) and
+    the API does not expose them, so both have to be picked.
+    """
+    if fill_pattern is None or fill_pattern.IsSolid or fill_pattern.Target != DB.FillPatternTarget.Model:
+        return None
+
+    # Group line families by direction modulo 90 degrees into "along" (0) and "across" (90)
+    along = []
+    across = []
+    base_angle = None
+    for fill_grid in fill_pattern.GetFillGrids():
+        if fill_grid.Offset <= 0:
+            continue
+        angle = fill_grid.Angle % math.pi
+        if base_angle is None:
+            base_angle = angle % (math.pi / 2)
+            if math.pi / 2 - base_angle < ANGLE_TOLERANCE:
+                base_angle = 0.0
+        relative = (angle - base_angle) % math.pi
+        if abs(relative) < ANGLE_TOLERANCE or abs(relative - math.pi) < ANGLE_TOLERANCE:
+            along.append(fill_grid)
+        elif abs(relative - math.pi / 2) < ANGLE_TOLERANCE:
+            across.append(fill_grid)
+
+    if not along or not across:
+        return None
+
+    lines_x = pick_line_family(along)    # Lines along the grid X axis, spaced in Y
+    lines_y = pick_line_family(across)   # Lines along the grid Y axis, spaced in X
+    return (lines_y.Offset, lines_x.Offset, base_angle)
+
+
+def detect_ceiling_grids(ceilings):
+    """
+    Read grid spacing and angle from the surface pattern of each ceiling's bottom face.
+    The grid origin and its rotation on the face are not detected; they are picked
+    once per group of ceilings sharing material and plane (see get_pattern_group_key).
+    Returns dict: ceiling id -> (spacing_x, spacing_y, angle)
+    Ceilings without a usable pattern are left out.
+    """
+    grids_by_material = {}  # Material id -> pattern grid (or None), read once per material
+    result = {}
+    for ceiling in ceilings:
+        try:
+            material_id = get_bottom_face_material_id(ceiling)
+        except:
+            continue
+        if material_id is None:
+            continue
+
+        key = material_id.IntegerValue
+        if key not in grids_by_material:
+            grid = None
+            try:
+                material = ceiling.Document.GetElement(material_id)
+                pattern_id = get_surface_pattern_id(material) if material else None
+                if pattern_id is not None:
+                    pattern_element = ceiling.Document.GetElement(pattern_id)
+                    grid = get_pattern_grid(pattern_element.GetFillPattern())
+            except:
+                grid = None
+            grids_by_material[key] = grid
+
+        if grids_by_material[key] is not None:
+            result[ceiling.Id.IntegerValue] = grids_by_material[key]
+    return result
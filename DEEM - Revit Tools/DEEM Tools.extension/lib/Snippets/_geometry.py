@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Plan Geometry
+Pure-Python 2D polygon and grid helpers (no Revit API). Polygons are lists of
+(x, y) tuples; a region is a list of polygon loops (outer boundary plus any holes).
+"""
+
+import math
+
+
+def polygon_bbox(loops):
+    """Bounding box (min_x, min_y, max_x, max_y) of one or more loops"""
+    xs = [x for loop in loops for x, y in loop]
+    ys = [y for loop in loops for x, y in loop]
+    if not xs:
+        return None
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def point_on_segment(x, y, ax, ay, bx, by, tolerance=1e-9):
+    """True if (x, y) lies on segment a-b"""
+    cross = (bx - ax) * (y - ay) - (by - ay) * (x - ax)
+    if abs(cross) > tolerance * max(1.0, abs(bx - ax) + abs(by - ay)):
+        return False
+    return (min(ax, bx) - tolerance <= x <= max(ax, bx) + tolerance and
+            min(ay, by) - tolerance <= y <= max(ay, by) + tolerance)
+
+
+def point_in_loops(x, y, loops):
+    """
+    Even-odd point in polygon test over all loops, so holes are excluded.
+    Points exactly on an edge count as inside.
+    """
+    inside = False
+    for loop in loops:
+        count = len(loop)
+        if count < 3:
+            continue
+        ax, ay = loop[-1]
+        for bx, by in loop:
+            if point_on_segment(x, y, ax, ay, bx, by):
+                return True
+            # Ray cast towards +X
+            if (ay > y) != (by > y):
+                cross_x = ax + (y - ay) * (bx - ax) / (by - ay)
+                if x < cross_x:
+                    inside = not inside
+            ax, ay = bx, by
+    return inside
+
+
+def _same_point(a, b, tolerance):
+    return abs(a[0] - b[0]) <= tolerance and abs(a[1] - b[1]) <= tolerance
+
+
+def chain_polylines(polylines, tolerance=1e-6):
+    """
+    Join open polylines (lists of (x, y)) into closed loops by matching end points,
+    reversing pieces that run the wrong way. The pieces may come in any order.
+    Returns a list of loops without the repeated closing point.
+    """
+    remaining = [list(polyline) for polyline in polylines if len(polyline) >= 2]
+    loops = []
+    while remaining:
+        loop = remaining.pop(0)
+        while not _same_point(loop[0], loop[-1], tolerance):
+            for index, piece in enumerate(remaining):
+                if _same_point(piece[0], loop[-1], tolerance):
+                    loop.extend(piece[1:])
+                elif _same_point(piece[-1], loop[-1], tolerance):
+                    loop.extend(reversed(piece[:-1]))
+                else:
+                    continue
+                del remaining[index]
+                break
+            else:
+                break   # Open chain: close it as it is
+        if len(loop) > 1 and _same_point(loop[0], loop[-1], tolerance):
+            loop.pop()
+        loops.append(loop)
+    return loops
+
+
+class PlanRegion(object):
+    """Polygon loops with a cached bounding box for quick rejection"""
+
+    def __init__(self, loops):
+        self.loops = [list(loop) for loop in loops if len(loop) >= 3]
+        self.bbox = polygon_bbox(self.loops)
+
+    def __nonzero__(self):
+        return bool(self.loops)
+
+    __bool__ = __nonzero__
+
+    def contains(self, x, y):
+        """True if the point is inside the region (bounding box prefilter first)"""
+        if not self.bbox:
+            return False
+        min_x, min_y, max_x, max_y = self.bbox
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return False
+        return point_in_loops(x, y, self.loops)
+
+
+# -----------------------------
+# Rotated grids
+# -----------------------------
+def rotate_points(points, angle):
+    """Rotate (x, y) points about the origin by angle (radians)"""
+    cos_a = math.cos(angle)
+    sin_a = math.sin(angle)
+    return [(x * cos_a - y * sin_a, x * sin_a + y * cos_a) for x, y in points]
+
+
+def locate_cells(points, offset_x, offset_y, spacing_x, spacing_y, angle=0.0):
+    """
+    Grid cell (cell_x, cell_y) containing each (x, y) point.
+    The grid is rotated by angle about the origin; offsets are measured in the
+    rotated (grid-local) frame. All points are converted in one pass.
+    """
+    cells = []
+    for local_x, local_y in rotate_points(points, -angle):
+        # Floor keeps fixtures near cell boundaries in the cell they are already in
+        cells.append((int(math.floor((local_x - offset_x) / spacing_x)),
+                      int(math.floor((local_y - offset_y) / spacing_y))))
+    return cells
+
+
+def cell_centers(cells, offset_x, offset_y, spacing_x, spacing_y, angle=0.0):
+    """(x, y) center of each grid cell, back in the unrotated frame"""
+    half_x = spacing_x / 2.0
+    half_y = spacing_y / 2.0
+    centers = [(cell_x * spacing_x + offset_x + half_x, cell_y * spacing_y + offset_y + half_y)
+               for cell_x, cell_y in cells]
+    return rotate_points(centers, angle)
+
+
+def snap_to_cell_centers(points, offset_x, offset_y, spacing_x, spacing_y, angle=0.0):
+    """Snap (x, y) points to the center of the grid cell they are in"""
+    cells = locate_cells(points, offset_x, offset_y, spacing_x, spacing_y, angle)
+    return cell_centers(cells, offset_x, offset_y, spacing_x, spacing_y, angle)
+
+
+def grid_angle(dx, dy):
+    """Rotation of a grid with (dx, dy) along one of its axes, folded into [0, 90°)"""
+    return math.atan2(dy, dx) % (math.pi / 2)
+
+
+def angle_difference(angle_a, angle_b):
+    """Smallest difference between two grid angles, modulo 90°"""
+    difference = (angle_a - angle_b) % (math.pi / 2)
+    return min(difference, math.pi / 2 - difference)
+
+
+def dominant_edge_angle(loops):
+    """Grid angle of the longest edge of a boundary (None without edges)"""
+    best = None
+    for loop in loops:
+        for k in range(len(loop)):
+            ax, ay = loop[k - 1]
+            bx, by = loop[k]
+            length = math.hypot(bx - ax, by - ay)
+            if best is None or length > best[0]:
+                best = (length, bx - ax, by - ay)
+    if best is None or best[0] == 0:
+        return None
+    return grid_angle(best[1], best[2])
+
+
+def grid_from_picks(first, second, spacings, tolerance=0.1):
+    """
+    Grid (offset_x, offset_y, spacing_x, spacing_y, angle) from two neighbouring
+    intersections picked along one grid line and the pattern's two spacings.
+    The distance between the picks tells which spacing runs along which axis;
+    None if it matches neither spacing (within tolerance, as a fraction).
+    """
+    dx = second[0] - first[0]
+    dy = second[1] - first[1]
+    distance = math.hypot(dx, dy)
+    angle = grid_angle(dx, dy)
+    (origin_x, origin_y), (local_dx, local_dy) = rotate_points([first, (dx, dy)], -angle)
+
+    along, across = sorted(spacings, key=lambda spacing: abs(spacing - distance))
+    if abs(along - distance) > tolerance * along:
+        return None
+    # After rotating by -angle the picked step lies on the local X or Y axis
+    if abs(local_dx) >= abs(local_dy):
+        spacing_x, spacing_y = along, across
+    else:
+        spacing_x, spacing_y = across, along
+    return (origin_x % spacing_x, origin_y % spacing_y, spacing_x, spacing_y, angle)
+
+
+def nearest_cells(cell, spacing_x, spacing_y, max_radius):
+    """Cells around cell (excluding it) up to max_radius cells away, nearest first"""
+    cell_x, cell_y = cell
+    neighbours = []
+    for dx in range(-max_radius, max_radius + 1):
+        for dy in range(-max_radius, max_radius + 1):
+            if dx or dy:
+                distance = (dx * spacing_x) ** 2 + (dy * spacing_y) ** 2
+                neighbours.append((distance, abs(dy), dx, dy))
+    neighbours.sort()
+    return [(cell_x + dx, cell_y + dy) for _, _, dx, dy in neighbours]
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Link Registry
+Enumerates the Revit links of a document once and caches what the tools keep
+asking for: the link document, its transform and the inverse transform.
+
+Links are keyed by the RevitLinkInstance UniqueId, which survives renaming,
+reloading and reopening the host model (display names do not).
+
+Usage:
+    from Snippets._links import LinkRegistry
+
+    registry = LinkRegistry(doc)
+    for link in registry.loaded():
+        link_points = link.to_link_points(host_points)
+"""
+
+from Autodesk.Revit import DB
+
+
+def get_link_document_key(link_doc):
+    """Stable identity of a linked document (same for every instance of the link)"""
+    try:
+        return str(link_doc.CreationGUID)
+    except:
+        return link_doc.PathName or link_doc.Title
+
+
+def transform_coordinates(coordinates, transform):
+    """
+    Apply a Transform to (x, y, z) tuples in pure Python.
+    The matrix is read from the API once, so large point lists avoid one API call per point.
+    """
+    basis_x, basis_y, basis_z, origin = transform.BasisX, transform.BasisY, transform.BasisZ, transform.Origin
+    xx, xy, xz = basis_x.X, basis_x.Y, basis_x.Z
+    yx, yy, yz = basis_y.X, basis_y.Y, basis_y.Z
+    zx, zy, zz = basis_z.X, basis_z.Y, basis_z.Z
+    ox, oy, oz = origin.X, origin.Y, origin.Z
+    return [(ox + x * xx + y * yx + z * zx,
+             oy + x * xy + y * yy + z * zy,
+             oz + x * xz + y * yz + z * zz) for x, y, z in coordinates]
+
+
+class LinkInfo(object):
+    """One RevitLinkInstance with its document and transforms cached"""
+
+    def __init__(self, link_instance):
+        self.instance = link_instance
+        self.key = link_instance.UniqueId
+        self.instance_id = link_instance.Id
+        self.type_id = link_instance.GetTypeId()
+        self.name = link_instance.Name
+
+        self.document = link_instance.GetLinkDocument()
+        self.document_key = get_link_document_key(self.document) if self.document else None
+
+        # Transform and its inverse are computed once per command
+        self.transform = link_instance.GetTransform()
+        self.inverse_transform = self.transform.Inverse
+
+    @property
+    def is_loaded(self):
+        return self.document is not None
+
+    # -----------------------------
+    # Single points (XYZ)
+    # -----------------------------
+    def to_link(self, host_point):
+        """Convert a host model point to link coordinates"""
+        return self.inverse_transform.OfPoint(host_point)
+
+    def to_host(self, link_point):
+        """Convert a link coordinate point to host model coordinates"""
+        return self.transform.OfPoint(link_point)
+
+    # -----------------------------
+    # Bulk conversion
+    # -----------------------------
+    def to_link_points(self, host_points):
+        """Convert a list of host XYZ points to link coordinates"""
+        return [DB.XYZ(x, y, z) for x, y, z in self.to_link_coordinates([(p.X, p.Y, p.Z) for p in host_points])]
+
+    def to_host_points(self, link_points):
+        """Convert a list of link XYZ points to host coordinates"""
+        return [DB.XYZ(x, y, z) for x, y, z in self.to_host_coordinates([(p.X, p.Y, p.Z) for p in link_points])]
+
+    def to_link_coordinates(self, coordinates):
+        """Convert (x, y, z) tuples from host to link coordinates"""
+        return transform_coordinates(coordinates, self.inverse_transform)
+
+    def to_host_coordinates(self, coordinates):
+        """Convert (x, y, z) tuples from link to host coordinates"""
+        return transform_coordinates(coordinates, self.transform)
+
+
+class LinkRegistry(object):
+    """All Revit links of a document, enumerated once"""
+
+    def __init__(self, document):
+        self.document = document
+        self.links = [LinkInfo(link_instance) for link_instance in
+                      DB.FilteredElementCollector(document).OfClass(DB.RevitLinkInstance)]
+        self.by_key = dict((link.key, link) for link in self.links)
+        self.by_name = dict((link.name, link) for link in self.links)
+
+    def __iter__(self):
+        return iter(self.links)
+
+    def __len__(self):
+        return len(self.links)
+
+    def loaded(self):
+        """Links whose document is loaded"""
+        return [link for link in self.links if link.is_loaded]
+
+    def get(self, key, default=None):
+        """Link by instance UniqueId"""
+        return self.by_key.get(key, default)
+
+    def find(self, key=None, name=None):
+        """Link by UniqueId, falling back to display name (for values saved before keys were used)"""
+        if key and key in self.by_key:
+            return self.by_key[key]
+        if name:
+            return self.by_name.get(name)
+        return None
+
+    def documents(self):
+        """Loaded link documents, one per linked file even if it is placed several times
+        Returns: dict of document key -> LinkInfo of the first instance"""
+        result = {}
+        for link in self.loaded():
+            result.setdefault(link.document_key, link)
+        return result
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Revision Index
+One pass over the viewports and revision clouds of a document, so the revision
+tools can look up each sheet instead of scanning every cloud and viewport per sheet.
+
+    viewport -> sheet        sheet_views / view_sheets (both directions)
+    view     -> primary      dependent views resolved to the view that owns their annotation
+    cloud    -> owner view   clouds_by_owner
+    cloud visibility         clouds a view-scoped collector returns (crop and hide), once per view
+
+Ids are stored as integer values (pyrevit.compat, works on every Revit version).
+
+Usage:
+    from Snippets._revisions import RevisionIndex
+
+    index = RevisionIndex(doc)
+    for sheet in sheets:
+        clouds = index.clouds_on_sheet(sheet)
+"""
+
+from Autodesk.Revit import DB
+from pyrevit.compat import get_elementid_value_func
+
+get_elementid_value = get_elementid_value_func()
+
+
+def get_sheet_revision_ids(sheet):
+    """Integer ids of all revisions listed on a sheet (clouded and additional)"""
+    revision_ids = set(get_elementid_value(rev_id) for rev_id in sheet.GetAllRevisionIds())
+    revision_ids.update(get_elementid_value(rev_id) for rev_id in sheet.GetAdditionalRevisionIds())
+    return revision_ids
+
+
+class RevisionIndex(object):
+    """Viewport, dependent view and revision cloud maps of a document, built once"""
+
+    def __init__(self, document):
+        self.document = document
+        self.views = {}            # view id -> View (placed views and sheets, filled on demand)
+        self.sheet_views = {}      # sheet id -> [view id, ...] placed on it
+        self.view_sheets = {}      # view id -> [sheet id, ...] it is placed on
+        self.dependents_of = {}    # primary view id -> [placed dependent view id, ...]
+        self.clouds_by_owner = {}  # owner view id -> [RevisionCloud, ...]
+        self._primary_of = {}      # view id -> primary view id or None
+        self._visible_clouds = {}  # view id -> set of cloud ids shown in it
+
+        for viewport in DB.FilteredElementCollector(document).OfClass(DB.Viewport):
+            sheet_id = get_elementid_value(viewport.SheetId)
+            view_id = get_elementid_value(viewport.ViewId)
+            self.sheet_views.setdefault(sheet_id, []).append(view_id)
+            self.view_sheets.setdefault(view_id, []).append(sheet_id)
+
+        for view_id in self.view_sheets:
+            primary_id = self.get_primary(view_id)
+            if primary_id is not None:
+                self.dependents_of.setdefault(primary_id, []).append(view_id)
+
+        clouds = (DB.FilteredElementCollector(document)
+                  .OfCategory(DB.BuiltInCategory.OST_RevisionClouds)
+                  .WhereElementIsNotElementType())
+        for cloud in clouds:
+            self.clouds_by_owner.setdefault(get_elementid_value(cloud.OwnerViewId), []).append(cloud)
+
+    # -----------------------------
+    # Views
+    # -----------------------------
+    def get_view(self, view_id):
+        """View by integer id (cached)"""
+        view = self.views.get(view_id)
+        if view is None:
+            view = self.views[view_id] = self.document.GetElement(DB.ElementId(view_id))
+        return view
+
+    def get_primary(self, view_id):
+        """Primary view id of a dependent view, None for independent views"""
+        if view_id not in self._primary_of:
+            view = self.get_view(view_id)
+            primary = view.GetPrimaryViewId() if isinstance(view, DB.View) else DB.ElementId.InvalidElementId
+            self._primary_of[view_id] = (get_elementid_value(primary)
+                                         if primary != DB.ElementId.InvalidElementId else None)
+        return self._primary_of[view_id]
+
+    def placed_views_showing(self, view_id):
+        """
+        Ids of placed views that show the contents of a view: the view itself,
+        its placed dependent views and its primary view (when placed).
+        """
+        view_ids = []
+        if view_id in self.view_sheets:
+            view_ids.append(view_id)
+        view_ids.extend(self.dependents_of.get(view_id, ()))
+        primary_id = self.get_primary(view_id)
+        if primary_id is not None and primary_id in self.view_sheets:
+            view_ids.append(primary_id)
+        return view_ids
+
+    def sheets_showing_view(self, view_id):
+        """
+        Sheet ids on which the contents of a view appear: sheets it is placed on,
+        sheets its dependent views are placed on, and sheets of its primary view.
+        Does not check what each placed view crops out; see is_cloud_visible.
+        """
+        sheet_ids = set()
+        for placed_id in self.placed_views_showing(view_id):
+            sheet_ids.update(self.view_sheets[placed_id])
+        return sheet_ids
+
+    # -----------------------------
+    # Clouds
+    # -----------------------------
+    def get_visible_cloud_ids(self, view):
+        """
+        Ids of the revision clouds shown in a view. A view-scoped collector leaves
+        out clouds that are hidden or outside the crop region. Collected once per view.
+        """
+        view_id = get_elementid_value(view.Id)
+        cloud_ids = self._visible_clouds.get(view_id)
+        if cloud_ids is None:
+            clouds = (DB.FilteredElementCollector(self.document, view.Id)
+                      .OfCategory(DB.BuiltInCategory.OST_RevisionClouds)
+                      .WhereElementIsNotElementType()
+                      .ToElementIds())
+            cloud_ids = self._visible_clouds[view_id] = set(get_elementid_value(x) for x in clouds)
+        return cloud_ids
+
+    def is_cloud_visible(self, cloud, view):
+        """True if the cloud shows in the view (not hidden, not cropped out)"""
+        return get_elementid_value(cloud.Id) in self.get_visible_cloud_ids(view)
+
+    def clouds_on_sheet(self, sheet, revision_ids=None):
+        """
+        Revision clouds shown on a sheet: drawn on the sheet itself, or in a view
+        placed on it (or in the primary of a placed dependent view), visible in
+        that view and belonging to one of the sheet's revisions.
+        revision_ids: integer revision ids to accept (default: the sheet's own)
+        """
+        if revision_ids is None:
+            revision_ids = get_sheet_revision_ids(sheet)
+        sheet_id = get_elementid_value(sheet.Id)
+
+        # Each owner view is checked in the view that shows it on this sheet
+        owners = [(sheet_id, sheet)]
+        for view_id in self.sheet_views.get(sheet_id, ()):
+            view = self.get_view(view_id)
+            owners.append((view_id, view))
+            primary_id = self.get_primary(view_id)
+            if primary_id is not None:
+                owners.append((primary_id, view))
+
+        result = []
+        seen = set()
+        for owner_id, view in owners:
+            for cloud in self.clouds_by_owner.get(owner_id, ()):
+                cloud_id = get_elementid_value(cloud.Id)
+                if cloud_id in seen:
+                    continue
+                if (get_elementid_value(cloud.RevisionId) in revision_ids
+                        and self.is_cloud_visible(cloud, view)):
+                    seen.add(cloud_id)
+                    result.append(cloud)
+        return result
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Selectable List
+Virtualizing multi-select list shared by the WPF picker windows.
+Supports Click, Ctrl+Click (toggle), Shift+Click (range) and drag selection.
+
+Usage:
+    from Snippets._selectable_list import SelectableItem, SelectableList
+
+    class ViewData(SelectableItem):
+        def __init__(self, view_name, view):
+            SelectableItem.__init__(self, view_name)
+            self.view = view
+
+    view_list = SelectableList()
+    view_list.set_items(sorted_view_data)
+    main_grid.Children.Add(view_list.control)
+"""
+
+import clr
+clr.AddReference('PresentationFramework')
+clr.AddReference('PresentationCore')
+clr.AddReference('WindowsBase')
+import System
+from System.Windows import Thickness, HorizontalAlignment
+from System.Windows.Controls import ListBox, ScrollViewer, ScrollBarVisibility, ItemsControl
+from System.Windows.Controls import VirtualizingStackPanel, VirtualizationMode
+from System.Windows.Controls.Primitives import ButtonBase
+from System.Windows.Input import ModifierKeys, Keyboard, Mouse
+from System.Windows.Markup import XamlReader
+from System.Windows.Media import VisualTreeHelper
+
+from pyrevit import forms
+
+# Minimum time between drag hit-tests while the mouse button is held (milliseconds)
+DRAG_THROTTLE_MS = 30
+
+XAML_NAMESPACES = (
+    'xmlns="http://schemas.microsoft.com/winfx/2006/xaml/presentation" '
+    'xmlns:x="http://schemas.microsoft.com/winfx/2006/xaml"'
+)
+
+# Row container: white rows, light blue when selected, gray headers for non-selectable rows
+ROW_CONTAINER_STYLE = """
+<Style TargetType="ListBoxItem" {ns}>
+    <Setter Property="Background" Value="White"/>
+    <Setter Property="Margin" Value="0,1,0,1"/>
+    <Setter Property="Padding" Value="0"/>
+    <Setter Property="BorderThickness" Value="0"/>
+    <Setter Property="Focusable" Value="False"/>
+    <Setter Property="HorizontalContentAlignment" Value="Stretch"/>
+    <Setter Property="Template">
+        <Setter.Value>
+            <ControlTemplate TargetType="ListBoxItem">
+                <Border Background="{{TemplateBinding Background}}"
+                        BorderBrush="{{TemplateBinding BorderBrush}}"
+                        BorderThickness="{{TemplateBinding BorderThickness}}"
+                        Padding="{{TemplateBinding Padding}}">
+                    <ContentPresenter/>
+                </Border>
+            </ControlTemplate>
+        </Setter.Value>
+    </Setter>
+    <Style.Triggers>
+        <DataTrigger Binding="{{Binding is_selected}}" Value="True">
+            <Setter Property="Background" Value="#ADD8E6"/>
+        </DataTrigger>
+        <DataTrigger Binding="{{Binding is_selectable}}" Value="False">
+            <Setter Property="Background" Value="#F0F0F0"/>
+            <Setter Property="BorderBrush" Value="Gray"/>
+            <Setter Property="BorderThickness" Value="0,1,0,0"/>
+            <Setter Property="Margin" Value="0,5,0,2"/>
+        </DataTrigger>
+    </Style.Triggers>
+</Style>
+"""
+
+# Default row content: the item label, bold for non-selectable header rows
+TEXT_ROW_TEMPLATE = """
+<TextBlock Text="{{Binding {member}}}" VerticalAlignment="Center">
+    <TextBlock.Style>
+        <Style TargetType="TextBlock">
+            <Setter Property="Padding" Value="{padding}"/>
+            <Style.Triggers>
+                <DataTrigger Binding="{{Binding is_selectable}}" Value="False">
+                    <Setter Property="FontWeight" Value="Bold"/>
+                    <Setter Property="FontSize" Value="12"/>
+                    <Setter Property="Padding" Value="5,8,5,5"/>
+                </DataTrigger>
+            </Style.Triggers>
+        </Style>
+    </TextBlock.Style>
+</TextBlock>
+"""
+
+
+def make_row_template(row_xaml):
+    """Build a DataTemplate from the XAML of a single row element"""
+    return XamlReader.Parse('<DataTemplate {}>{}</DataTemplate>'.format(XAML_NAMESPACES, row_xaml))
+
+
+def make_text_template(member='label', padding='5'):
+    """DataTemplate showing one text property of the item"""
+    return make_row_template(TEXT_ROW_TEMPLATE.format(member=member, padding=padding))
+
+
+class SelectableItem(forms.Reactive):
+    """Base class for list rows. Changing is_selected updates the row highlight."""
+    def __init__(self, label, is_selectable=True):
+        self.label = label
+        self.is_selectable = is_selectable
+        self.is_selected = False
+
+    @forms.reactive
+    def is_selected(self):
+        return self._is_selected
+
+    @is_selected.setter
+    def is_selected(self, value):
+        self._is_selected = value
+
+
+class SelectableList(object):
+    """
+    Virtualizing ListBox with custom multi-select behaviour.
+    Only rows on screen get WPF containers, so thousands of items stay responsive.
+    Item positions are kept in a dictionary, so click and range lookups are O(1).
+    """
+
+    def __init__(self, item_template=None, keep_hidden_selection=True):
+        self.items = []                     # Items currently shown, in display order
+        self.index_by_id = {}               # id(item) -> position in self.items
+        self.selected = {}                  # id(item) -> item for every selected item
+        self.keep_hidden_selection = keep_hidden_selection  # Plain click keeps filtered-out selections
+
+        # Track selection state
+        self.last_selected_index = -1
+        self.is_dragging = False
+        self.drag_start_selected = False
+        self.drag_index = -1
+        self.last_hit_test_tick = 0
+
+        list_box = ListBox()
+        list_box.BorderThickness = Thickness(0)
+        list_box.HorizontalContentAlignment = HorizontalAlignment.Stretch
+        list_box.ItemContainerStyle = XamlReader.Parse(ROW_CONTAINER_STYLE.format(ns=XAML_NAMESPACES))
+        list_box.ItemTemplate = item_template or make_text_template()
+
+        # Item based scrolling keeps virtualization active
+        ScrollViewer.SetCanContentScroll(list_box, True)
+        ScrollViewer.SetHorizontalScrollBarVisibility(list_box, ScrollBarVisibility.Disabled)
+        VirtualizingStackPanel.SetIsVirtualizing(list_box, True)
+        VirtualizingStackPanel.SetVirtualizationMode(list_box, VirtualizationMode.Recycling)
+
+        list_box.PreviewMouseLeftButtonDown += self.mouse_down
+        list_box.PreviewMouseMove += self.mouse_move
+        list_box.PreviewMouseLeftButtonUp += self.mouse_up
+        list_box.LostMouseCapture += self.mouse_up
+
+        self.control = list_box
+
+    # -----------------------------
+    # Items
+    # -----------------------------
+    def set_items(self, items):
+        """Show a new list of items (already sorted/filtered by the caller)"""
+        self.items = list(items)
+        self.index_by_id = dict((id(item), i) for i, item in enumerate(self.items))
+        self.last_selected_index = -1
+        self.control.ItemsSource = self.items
+
+    def index_of(self, item):
+        """Position of an item in the current display order, or -1"""
+        return self.index_by_id.get(id(item), -1)
+
+    # -----------------------------
+    # Selection
+    # -----------------------------
+    def set_selected(self, item, value):
+        """Select or deselect a single item"""
+        if not item.is_selectable:
+            return
+        if item.is_selected != value:
+            item.is_selected = value
+        if value:
+            self.selected[id(item)] = item
+        else:
+            self.selected.pop(id(item), None)
+
+    def select_range(self, start_index, end_index, value=True):
+        """Select or deselect every item between two display positions (inclusive)"""
+        if start_index > end_index:
+            start_index, end_index = end_index, start_index
+        for i in range(max(start_index, 0), min(end_index, len(self.items) - 1) + 1):
+            self.set_selected(self.items[i], value)
+
+    def select_all(self):
+        """Select all shown items"""
+        self.select_range(0, len(self.items) - 1, True)
+
+    def deselect_all(self):
+        """Deselect all shown items"""
+        for item in list(self.selected.values()):
+            if id(item) in self.index_by_id:
+                self.set_selected(item, False)
+
+    def get_selected(self):
+        """Selected items, shown ones first in display order"""
+        shown = [item for item in self.items if id(item) in self.selected]
+        hidden = [item for key, item in self.selected.items() if key not in self.index_by_id]
+        return shown + hidden
+
+    # -----------------------------
+    # Mouse handling
+    # -----------------------------
+    def row_index_from_element(self, element):
+        """Display position of the row containing element, or -1"""
+        if element is None:
+            return -1
+        container = ItemsControl.ContainerFromElement(self.control, element)
+        if container is None:
+            return -1
+        return self.index_of(container.DataContext)
+
+    def is_inside_button(self, element):
+        """True if element is (inside) an enabled button/checkbox within a row"""
+        current = element
+        while current is not None and current is not self.control:
+            if isinstance(current, ButtonBase):
+                return current.IsEnabled
+            try:
+                current = VisualTreeHelper.GetParent(current)
+            except:
+                return False
+        return False
+
+    def mouse_down(self, sender, args):
+        """Handle row click with Shift/Ctrl support and start drag selection"""
+        # Let checkboxes inside rows handle their own clicks
+        if self.is_inside_button(args.OriginalSource):
+            return
+
+        clicked_index = self.row_index_from_element(args.OriginalSource)
+        if clicked_index < 0:
+            return  # Scrollbar or empty space
+
+        clicked_item = self.items[clicked_index]
+        args.Handled = True
+        if not clicked_item.is_selectable:
+            return
+
+        modifiers = Keyboard.Modifiers
+
+        if modifiers == ModifierKeys.Control:
+            # Ctrl+Click: Toggle selection of clicked row, drag in toggle mode
+            self.set_selected(clicked_item, not clicked_item.is_selected)
+            self.last_selected_index = clicked_index
+            self.start_drag(clicked_index, clicked_item.is_selected)
+
+        elif modifiers == ModifierKeys.Shift and self.last_selected_index >= 0:
+            # Shift+Click: Select range from last selected to current
+            self.select_range(self.last_selected_index, clicked_index, True)
+
+        else:
+            # Normal click: Select only this row, drag in select mode
+            if self.keep_hidden_selection:
+                self.deselect_all()
+            else:
+                for item in list(self.selected.values()):
+                    self.set_selected(item, False)
+            self.set_selected(clicked_item, True)
+            self.last_selected_index = clicked_index
+            self.start_drag(clicked_index, True)
+
+    def start_drag(self, index, select_value):
+        """Start drag selection from a row"""
+        self.is_dragging = True
+        self.drag_start_selected = select_value
+        self.drag_index = index
+        Mouse.Capture(self.control)
+
+    def mouse_move(self, sender, args):
+        """Handle mouse move for drag selection (hit-testing is throttled)"""
+        if not self.is_dragging:
+            return
+
+        tick = System.Environment.TickCount
+        if tick - self.last_hit_test_tick < DRAG_THROTTLE_MS:
+            return
+        self.last_hit_test_tick = tick
+
+        element = self.control.InputHitTest(args.GetPosition(self.control))
+        index = self.row_index_from_element(element)
+        if index < 0 or index == self.drag_index:
+            return
+
+        # Fill the whole span so fast drags don't skip rows
+        self.select_range(self.drag_index, index, self.drag_start_selected)
+        self.drag_index = index
+
+    def mouse_up(self, sender, args):
+        """Handle mouse up to end drag selection"""
+        if self.is_dragging:
+            self.is_dragging = False
+            self.drag_index = -1
+            if self.control.IsMouseCaptured:
+                Mouse.Capture(None)
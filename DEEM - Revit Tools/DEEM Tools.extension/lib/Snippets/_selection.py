@@ -4,6 +4,8 @@
 # imports
 #==================================================
 from Autodesk.Revit.DB import *
+from Autodesk.Revit.UI.Selection import ISelectionFilter, ObjectType
+from System.Collections.Generic import List
 
 # Variables
 #==================================================
@@ -28,3 +30,100 @@ def get_selected_elements(filter_types=None):
         return [el for el in selected_elements if type(el) in filter_types]
     return selected_elements
 
+
+# Selection Filters
+#==================================================
+class CategorySelectionFilter(ISelectionFilter):
+    """ISelectionFilter that only allows elements of one BuiltInCategory.
+    With allow_linked=True, elements of that category inside Revit links can be picked too
+    (use ObjectType.LinkedElement when picking)."""
+
+    def __init__(self, built_in_category, allow_linked=False):
+        self.category_id = int(built_in_category)
+        self.allow_linked = allow_linked
+
+    def is_category(self, element):
+        return element is not None and element.Category is not None and \
+               element.Category.Id.IntegerValue == self.category_id
+
+    def AllowElement(self, element):
+        # Links must be allowed so Revit asks AllowReference for the element inside them
+        if self.allow_linked and isinstance(element, RevitLinkInstance):
+            return True
+        return self.is_category(element)
+
+    def AllowReference(self, reference, position):
+        if not self.allow_linked or reference.LinkedElementId == ElementId.InvalidElementId:
+            return False
+        link_instance = doc.GetElement(reference.ElementId)
+        link_doc = link_instance.GetLinkDocument() if link_instance else None
+        if not link_doc:
+            return False
+        return self.is_category(link_doc.GetElement(reference.LinkedElementId))
+
+
+class LightingFixtureSelectionFilter(CategorySelectionFilter):
+    """ISelectionFilter for Lighting Fixtures (host model, optionally linked models)"""
+
+    def __init__(self, allow_linked=False):
+        CategorySelectionFilter.__init__(self, BuiltInCategory.OST_LightingFixtures, allow_linked)
+
+
+# Fast Category Filtering
+#==================================================
+def filter_ids_by_category(element_ids, built_in_category, document=None):
+    """Return elements of built_in_category from a collection of ElementIds.
+    Filtering runs inside one FilteredElementCollector instead of a GetElement call per id."""
+    document = document or doc
+    id_list = List[ElementId](element_ids)
+    if id_list.Count == 0:
+        return []
+
+    collector = FilteredElementCollector(document, id_list)\
+        .OfCategory(built_in_category)\
+        .WhereElementIsNotElementType()
+    return list(collector)
+
+
+def get_selected_by_category(built_in_category):
+    """Get pre-selected elements of built_in_category in Revit UI."""
+    return filter_ids_by_category(uidoc.Selection.GetElementIds(), built_in_category)
+
+
+def pick_by_category(built_in_category, prompt="Select elements"):
+    """Let user pick (or box-select) elements in the host model.
+    Only elements of built_in_category can be picked.
+    Raises Autodesk.Revit.Exceptions.OperationCanceledException if user cancels."""
+    refs = uidoc.Selection.PickObjects(ObjectType.Element, CategorySelectionFilter(built_in_category), prompt)
+    return filter_ids_by_category([ref.ElementId for ref in refs], built_in_category)
+
+
+def pick_linked_by_category(built_in_category, prompt="Select linked elements"):
+    """Let user pick elements of built_in_category inside Revit links.
+    Returns list of (link_instance, linked_element) tuples."""
+    refs = uidoc.Selection.PickObjects(ObjectType.LinkedElement,
+                                       CategorySelectionFilter(built_in_category, allow_linked=True), prompt)
+
+    # Group ids per link so each link document is filtered in one pass
+    linked_ids = {}
+    for ref in refs:
+        linked_ids.setdefault(ref.ElementId, []).append(ref.LinkedElementId)
+
+    picked = []
+    for link_id, element_ids in linked_ids.items():
+        link_instance = doc.GetElement(link_id)
+        link_doc = link_instance.GetLinkDocument()
+        if link_doc:
+            for element in filter_ids_by_category(element_ids, built_in_category, link_doc):
+                picked.append((link_instance, element))
+    return picked
+
+
+def get_selected_lighting_fixtures():
+    """Get pre-selected Lighting Fixtures."""
+    return get_selected_by_category(BuiltInCategory.OST_LightingFixtures)
+
+
+def pick_lighting_fixtures(prompt="Select light fixtures"):
+    """Let user pick Lighting Fixtures. Box-selecting only returns fixtures."""
+    return pick_by_category(BuiltInCategory.OST_LightingFixtures, prompt)
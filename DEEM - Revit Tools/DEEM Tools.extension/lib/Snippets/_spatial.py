@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Spatial Index
+Pure-Python 2D spatial hashing (no Revit API), so it can be used on plain
+coordinates from any tool and run outside Revit.
+
+GridHash2D
+    Uniform grid of axis-aligned boxes. Each box is registered in every cell it
+    overlaps, so a point query only looks at the boxes of one cell.
+
+PointHash2D
+    Uniform grid of points for nearest-neighbour queries. The search grows ring
+    by ring from the query cell and stops as soon as no closer point can exist.
+"""
+
+import math
+
+
+def auto_cell_size(boxes, minimum=1.0):
+    """Pick a cell size from the median box size (boxes: (min_x, min_y, max_x, max_y))"""
+    sizes = sorted(max(b[2] - b[0], b[3] - b[1]) for b in boxes)
+    if not sizes:
+        return minimum
+    return max(sizes[len(sizes) // 2], minimum)
+
+
+class GridHash2D(object):
+    """Uniform grid hash of 2D axis-aligned boxes for near O(1) point queries"""
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.cells = {}   # (i, j) -> [key, ...] in insertion order
+        self.boxes = {}   # key -> (min_x, min_y, max_x, max_y)
+
+    @classmethod
+    def from_boxes(cls, keyed_boxes, cell_size=None):
+        """Build from an iterable of (key, (min_x, min_y, max_x, max_y))"""
+        keyed_boxes = list(keyed_boxes)
+        if cell_size is None:
+            cell_size = auto_cell_size([box for key, box in keyed_boxes])
+        index = cls(cell_size)
+        for key, box in keyed_boxes:
+            index.insert(key, box)
+        return index
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def cell_of(self, x, y):
+        """Cell coordinates containing a point"""
+        return (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))
+
+    def insert(self, key, box):
+        """Register a box under key in every cell it overlaps"""
+        self.boxes[key] = box
+        i0, j0 = self.cell_of(box[0], box[1])
+        i1, j1 = self.cell_of(box[2], box[3])
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = self.cells.get((i, j))
+                if cell is None:
+                    self.cells[(i, j)] = [key]
+                else:
+                    cell.append(key)
+
+    def query_point(self, x, y):
+        """Keys of boxes containing the point, in insertion order"""
+        result = []
+        for key in self.cells.get(self.cell_of(x, y), ()):
+            min_x, min_y, max_x, max_y = self.boxes[key]
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                result.append(key)
+        return result
+
+    def query_box(self, min_x, min_y, max_x, max_y):
+        """Keys of boxes overlapping the query box, each once (in cell scan order)"""
+        i0, j0 = self.cell_of(min_x, min_y)
+        i1, j1 = self.cell_of(max_x, max_y)
+        seen = set()
+        result = []
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                for key in self.cells.get((i, j), ()):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    b = self.boxes[key]
+                    if b[0] <= max_x and min_x <= b[2] and b[1] <= max_y and min_y <= b[3]:
+                        result.append(key)
+        return result
+
+
+def auto_point_cell_size(points, minimum=1.0):
+    """Pick a cell size close to the average point spacing (points: (x, y))"""
+    if len(points) < 2:
+        return minimum
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    area = (max(xs) - min(xs)) * (max(ys) - min(ys))
+    return max(math.sqrt(area / len(points)), minimum)
+
+
+class PointHash2D(object):
+    """Uniform grid hash of 2D points for nearest-neighbour queries"""
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.cells = {}    # (i, j) -> [key, ...]
+        self.points = {}   # key -> (x, y)
+        self.bounds = None  # (min_i, min_j, max_i, max_j) of occupied cells
+
+    @classmethod
+    def from_points(cls, keyed_points, cell_size=None):
+        """Build from an iterable of (key, (x, y))"""
+        keyed_points = list(keyed_points)
+        if cell_size is None:
+            cell_size = auto_point_cell_size([point for key, point in keyed_points])
+        index = cls(cell_size)
+        for key, point in keyed_points:
+            index.insert(key, point[0], point[1])
+        return index
+
+    def __len__(self):
+        return len(self.points)
+
+    def cell_of(self, x, y):
+        """Cell coordinates containing a point"""
+        return (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))
+
+    def insert(self, key, x, y):
+        """Register a point under key"""
+        self.points[key] = (x, y)
+        i, j = self.cell_of(x, y)
+        self.cells.setdefault((i, j), []).append(key)
+        if self.bounds is None:
+            self.bounds = (i, j, i, j)
+        else:
+            min_i, min_j, max_i, max_j = self.bounds
+            self.bounds = (min(min_i, i), min(min_j, j), max(max_i, i), max(max_j, j))
+
+    def ring(self, i, j, radius):
+        """Cells at exactly radius cells (Chebyshev distance) from (i, j)"""
+        if radius == 0:
+            yield (i, j)
+            return
+        for di in range(-radius, radius + 1):
+            yield (i + di, j - radius)
+            yield (i + di, j + radius)
+        for dj in range(-radius + 1, radius):
+            yield (i - radius, j + dj)
+            yield (i + radius, j + dj)
+
+    def nearest(self, x, y, exclude=None, max_distance=None):
+        """
+        Nearest point to (x, y), skipping the key exclude.
+        Returns (key, distance), or (None, None) if there is no point (within max_distance).
+        """
+        if self.bounds is None:
+            return None, None
+
+        i, j = self.cell_of(x, y)
+        min_i, min_j, max_i, max_j = self.bounds
+        max_radius = max(abs(i - min_i), abs(i - max_i), abs(j - min_j), abs(j - max_j))
+
+        best_key = None
+        best_distance_sq = None
+        radius = 0
+        while radius <= max_radius:
+            # Every point in this ring or beyond is at least (radius - 1) cells away
+            ring_distance = (radius - 1) * self.cell_size
+            if radius > 0 and best_distance_sq is not None and ring_distance * ring_distance > best_distance_sq:
+                break
+            if max_distance is not None and ring_distance > max_distance:
+                break
+
+            for cell in self.ring(i, j, radius):
+                for key in self.cells.get(cell, ()):
+                    if key == exclude:
+                        continue
+                    px, py = self.points[key]
+                    distance_sq = (px - x) ** 2 + (py - y) ** 2
+                    if best_distance_sq is None or distance_sq < best_distance_sq:
+                        best_key = key
+                        best_distance_sq = distance_sq
+            radius += 1
+
+        if best_key is None:
+            return None, None
+        distance = math.sqrt(best_distance_sq)
+        if max_distance is not None and distance > max_distance:
+            return None, None
+        return best_key, distance
+
+    def nearest_neighbours(self):
+        """Dictionary: key -> (nearest other key, distance) for every point"""
+        return dict((key, self.nearest(x, y, exclude=key)) for key, (x, y) in self.points.items())
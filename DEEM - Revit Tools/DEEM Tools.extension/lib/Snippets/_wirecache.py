@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Wire Fingerprint Cache
+Stamps wires written by Wire Fix with a fingerprint in extensible storage, so
+later runs can skip wires that were not touched since.
+
+Two hashes are stored per wire (see Snippets._wires):
+    Ends         vertex count + end points + mode. Checked without GetVertices(),
+                 so a hit skips the wire entirely. Moving a device changes the
+                 end points; dragging an interior vertex does not.
+    Fingerprint  the full vertex list + mode. Checked after a full read (forced
+                 re-check), which also catches interior edits.
+
+The vertices read back when stamping are also kept for the Revit session
+(AppDomain), so untouched wires that are still needed as geometry (e.g. fixed
+tracks for parallel separation) are not read again with GetVertices().
+
+Usage:
+    from Snippets._wirecache import WireFingerprintCache
+
+    mode = "auto|0.5000"                   # settings that shape the result
+    cache = WireFingerprintCache()
+    if cache.is_untouched(wire, mode):
+        vertices = cache.kept_vertices(wire)   # session copy, no GetVertices()
+    wire.SetVertices(...)
+    doc.Regenerate()
+    cache.stamp(wire, mode)                # inside a transaction, after the write
+"""
+
+import System
+from System import Guid, String
+from Autodesk.Revit.DB.ExtensibleStorage import (
+    Schema, SchemaBuilder, Entity, AccessLevel
+)
+
+from Snippets._wires import fingerprint, ends_fingerprint, to_tuples
+
+SCHEMA_GUID = Guid("6d0f3c2a-8e4b-4b7e-9a51-2f4c7d9e1b36")
+SCHEMA_NAME = "DEEMWireFingerprint"
+
+FIELD_ENDS = "Ends"
+FIELD_FINGERPRINT = "Fingerprint"
+
+# AppDomain slot: wire UniqueId -> (ends fingerprint, vertex tuples) of the last stamp
+VERTEX_CACHE_KEY = "DEEM.WireVertexCache"
+
+
+def get_vertex_cache():
+    """Stamped vertex lists kept between runs for the current Revit session"""
+    domain = System.AppDomain.CurrentDomain
+    cache = domain.GetData(VERTEX_CACHE_KEY)
+    if cache is None:
+        cache = {}
+        domain.SetData(VERTEX_CACHE_KEY, cache)
+    return cache
+
+
+def get_schema():
+    """Wire fingerprint schema, created the first time it is needed"""
+    schema = Schema.Lookup(SCHEMA_GUID)
+    if schema is not None:
+        return schema
+
+    builder = SchemaBuilder(SCHEMA_GUID)
+    builder.SetSchemaName(SCHEMA_NAME)
+    builder.SetReadAccessLevel(AccessLevel.Public)
+    builder.SetWriteAccessLevel(AccessLevel.Public)
+    builder.SetDocumentation("Vertex fingerprint written by DEEM Wire Fix")
+    builder.AddSimpleField(FIELD_ENDS, String)
+    builder.AddSimpleField(FIELD_FINGERPRINT, String)
+    return builder.Finish()
+
+
+def read_ends(wire):
+    """(count, first, last) as tuples, read without GetVertices()"""
+    count = wire.NumberOfVertices
+    first = wire.GetVertex(0)
+    last = wire.GetVertex(count - 1)
+    return count, (first.X, first.Y, first.Z), (last.X, last.Y, last.Z)
+
+
+class WireFingerprintCache(object):
+    """Reads and writes wire fingerprints for one run and counts the hits"""
+
+    def __init__(self):
+        self.schema = Schema.Lookup(SCHEMA_GUID)   # None until the first stamp
+        self.vertex_copies = get_vertex_cache()
+        self.hit_ends = {}                          # UniqueId -> stored ends of this run's hits
+        self.hits = 0
+        self.checked = 0
+
+    def get_stored(self, wire):
+        """(ends, fingerprint) stored on a wire, or None"""
+        if self.schema is None:
+            return None
+        entity = wire.GetEntity(self.schema)
+        if entity is None or not entity.IsValid():
+            return None
+        return entity.Get[String](FIELD_ENDS), entity.Get[String](FIELD_FINGERPRINT)
+
+    def is_untouched(self, wire, mode):
+        """Cheap check: end points, vertex count and mode match the last stamp"""
+        self.checked += 1
+        stored = self.get_stored(wire)
+        if stored is None:
+            return False
+        count, first, last = read_ends(wire)
+        if count < 2 or ends_fingerprint(count, first, last, mode) != stored[0]:
+            return False
+        self.hit_ends[wire.UniqueId] = stored[0]
+        self.hits += 1
+        return True
+
+    def kept_vertices(self, wire):
+        """
+        Vertex tuples of a wire that passed is_untouched: the session copy taken
+        when it was stamped, read (and kept) only if there is none.
+        """
+        ends = self.hit_ends.get(wire.UniqueId)
+        copy = self.vertex_copies.get(wire.UniqueId)
+        if ends is not None and copy is not None and copy[0] == ends:
+            return copy[1]
+        vertices = to_tuples(wire.GetVertices())
+        if ends is not None:
+            self.vertex_copies[wire.UniqueId] = (ends, vertices)
+        return vertices
+
+    def matches(self, wire, vertices, mode):
+        """Full check against an already read vertex list"""
+        self.checked += 1
+        stored = self.get_stored(wire)
+        if stored is None or fingerprint(vertices, mode) != stored[1]:
+            return False
+        self.hits += 1
+        return True
+
+    def stamp(self, wire, mode):
+        """
+        Store the fingerprint of the wire as Revit kept it (needs an open transaction).
+        Read back after the write, since Revit may adjust connector ends, Z or the
+        vertex count; stamping what was sent would never match is_untouched.
+        """
+        if self.schema is None:
+            self.schema = get_schema()
+        count, first, last = read_ends(wire)
+        ends = ends_fingerprint(count, first, last, mode)
+        vertices = to_tuples(wire.GetVertices())
+        entity = Entity(self.schema)
+        entity.Set[String](FIELD_ENDS, ends)
+        entity.Set[String](FIELD_FINGERPRINT, fingerprint(vertices, mode))
+        wire.SetEntity(entity)
+        self.vertex_copies[wire.UniqueId] = (ends, vertices)
+
+    @property
+    def hit_rate(self):
+        return float(self.hits) / self.checked if self.checked else 0.0
@@ -0,0 +1,608 @@
+# -*- coding: utf-8 -*-
+"""
+Wire Geometry
+Revit-free core of the Wire Fix tool. Vertices are plain (x, y, z) tuples in
+feet, so everything here can be imported and benchmarked outside Revit.
+
+Usage:
+    from Snippets._wires import orthogonalize_batch
+
+    # vertex_lists: one [(x, y, z), ...] per wire
+    for new_vertices in orthogonalize_batch(vertex_lists, "auto"):
+        if new_vertices is not None:
+            ...  # wire needs updating
+"""
+
+import bisect
+import hashlib
+import heapq
+import math
+
+from Snippets._geometry import PlanRegion
+from Snippets._spatial import GridHash2D
+
+ORTHO_TOL = 0.01   # feet — segments within this of H or V are already "clean"
+
+ROUTING_MODES = ("auto", "h_first", "v_first", "avoid")
+
+# Frame angles closer than this (radians) to the project axes count as unrotated
+FRAME_ANGLE_TOL = 1e-6
+
+# Decimal places (feet) kept when fingerprinting vertices
+FINGERPRINT_DIGITS = 4
+
+# Where the middle leg of a Z-shaped route may sit, as a fraction of the span
+Z_SPLITS = (0.5, 0.25, 0.75)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  SEGMENT TESTS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def is_horizontal(a, b):
+    return abs(b[1] - a[1]) < ORTHO_TOL
+
+
+def is_vertical(a, b):
+    return abs(b[0] - a[0]) < ORTHO_TOL
+
+
+def is_orthogonal(a, b):
+    return is_horizontal(a, b) or is_vertical(a, b)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  VERTEX LIST OPERATIONS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def elbow_point(a, b, routing):
+    """
+    Return the single intermediate vertex that converts the diagonal
+    segment A→B into two orthogonal legs.
+
+    routing: "auto" | "h_first" | "v_first"  ("avoid" without obstacles acts as "auto")
+    """
+    dx = abs(b[0] - a[0])
+    dy = abs(b[1] - a[1])
+    z  = a[2]  # keep in the same plan elevation
+
+    if routing == "h_first" or (routing in ("auto", "avoid") and dx >= dy):
+        # Horizontal leg first: move to b.X while keeping a.Y
+        return (b[0], a[1], z)
+    else:
+        # Vertical leg first: move to b.Y while keeping a.X
+        return (a[0], b[1], z)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  OBSTACLE-AWARE ROUTING
+# ══════════════════════════════════════════════════════════════════════════════
+
+def count_conflicts(path, obstacles, ignore):
+    """
+    Number of obstacle boxes touched by an orthogonal path.
+    path: vertices [(x, y, z), ...]; each leg is axis aligned, so it is its own bounding box.
+    ignore: obstacle keys that don't count (the devices the wire connects)
+    """
+    hit = set()
+    for a, b in zip(path, path[1:]):
+        for key in obstacles.query_box(min(a[0], b[0]), min(a[1], b[1]), max(a[0], b[0]), max(a[1], b[1])):
+            if key not in ignore:
+                hit.add(key)
+    return len(hit)
+
+
+def candidate_routes(a, b):
+    """
+    Orthogonal ways from a to b, as lists of intermediate vertices:
+    the two L-shapes first, then Z-shapes (H-V-H and V-H-V) at Z_SPLITS.
+    """
+    z = a[2]
+    l_routes = [[(b[0], a[1], z)], [(a[0], b[1], z)]]
+    z_routes = []
+    for split in Z_SPLITS:
+        mid_x = a[0] + (b[0] - a[0]) * split
+        mid_y = a[1] + (b[1] - a[1]) * split
+        z_routes.append([(mid_x, a[1], z), (mid_x, b[1], z)])
+        z_routes.append([(a[0], mid_y, z), (b[0], mid_y, z)])
+    return l_routes, z_routes
+
+
+def route_around(a, b, obstacles, ignore=None):
+    """
+    Intermediate vertices for the diagonal A→B with the fewest obstacle conflicts.
+    Both L-shapes are tried (the dominant-axis one wins ties); Z-shapes are only
+    tried when both L-shapes are blocked.
+
+    obstacles: GridHash2D of obstacle boxes (Snippets._spatial)
+    ignore: obstacle keys that don't count; defaults to boxes containing a or b
+    """
+    if ignore is None:
+        ignore = set(key for key in obstacles.query_point(a[0], a[1]))
+        ignore.update(obstacles.query_point(b[0], b[1]))
+
+    l_routes, z_routes = candidate_routes(a, b)
+    # Same preference as "auto" when there is no difference in conflicts
+    if abs(b[0] - a[0]) < abs(b[1] - a[1]):
+        l_routes.reverse()
+
+    best_route = None
+    best_conflicts = None
+    for route in l_routes:
+        conflicts = count_conflicts([a] + route + [b], obstacles, ignore)
+        if best_conflicts is None or conflicts < best_conflicts:
+            best_route, best_conflicts = route, conflicts
+    if best_conflicts == 0:
+        return best_route
+
+    for route in z_routes:
+        conflicts = count_conflicts([a] + route + [b], obstacles, ignore)
+        if conflicts < best_conflicts:
+            best_route, best_conflicts = route, conflicts
+            if conflicts == 0:
+                break
+    return best_route
+
+
+def remove_collinear(vertices):
+    """
+    Strip intermediate vertices that sit on the same H or V line as their
+    neighbors. Prevents duplicate/redundant points that can accumulate when
+    wires are processed more than once or when existing bends get rebuilt.
+    """
+    if len(vertices) <= 2:
+        return list(vertices)
+
+    result = [vertices[0]]
+
+    for i in range(1, len(vertices) - 1):
+        prev = result[-1]
+        curr = vertices[i]
+        nxt  = vertices[i + 1]
+
+        # Collinear vertically: prev, curr, and next all share the same X
+        col_v = (abs(curr[0] - prev[0]) < ORTHO_TOL and
+                 abs(curr[0] - nxt[0])  < ORTHO_TOL)
+        # Collinear horizontally: share the same Y
+        col_h = (abs(curr[1] - prev[1]) < ORTHO_TOL and
+                 abs(curr[1] - nxt[1])  < ORTHO_TOL)
+
+        if not (col_v or col_h):
+            result.append(curr)
+
+    result.append(vertices[-1])
+    return result
+
+
+def orthogonalize_vertices(vertices, routing, obstacles=None):
+    """
+    Full pipeline:
+      1. Walk each consecutive vertex pair
+      2. Insert elbow where diagonal is detected
+         ("avoid" routing picks the L or Z shape with the fewest obstacle conflicts)
+      3. Strip redundant collinear points
+
+    Returns new list (equal to the input if already all-orthogonal).
+    """
+    if len(vertices) < 2:
+        return list(vertices)
+
+    # Step 1: insert elbows
+    result = [vertices[0]]
+    for i in range(1, len(vertices)):
+        a = result[-1]
+        b = vertices[i]
+        if is_orthogonal(a, b):
+            result.append(b)
+        elif routing == "avoid" and obstacles is not None:
+            result.extend(route_around(a, b, obstacles))
+            result.append(b)
+        else:
+            result.append(elbow_point(a, b, routing))
+            result.append(b)
+
+    # Step 2: remove any collinear points created by pre-existing bends
+    return remove_collinear(result)
+
+
+def vertices_changed(old_verts, new_verts):
+    """True if the new vertex list differs meaningfully from the old one."""
+    if len(old_verts) != len(new_verts):
+        return True
+    for a, b in zip(old_verts, new_verts):
+        if (abs(a[0] - b[0]) > ORTHO_TOL or
+                abs(a[1] - b[1]) > ORTHO_TOL):
+            return True
+    return False
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  PARALLEL SEPARATION
+# ══════════════════════════════════════════════════════════════════════════════
+
+def track_offset(track, spacing):
+    """Offset of a track from the shared line: 0, +s, -s, +2s, -2s, ..."""
+    step = (track + 1) // 2
+    return step * spacing if track % 2 else -step * spacing
+
+
+def collect_segments(vertex_lists):
+    """
+    Orthogonal segments of all wires, split by direction.
+    Each segment is (fixed, start, end, wire_index, segment_index):
+    fixed is Y for horizontal runs and X for vertical ones, start < end along the run.
+    """
+    horizontal = []
+    vertical = []
+    for w, vertices in enumerate(vertex_lists):
+        for k in range(len(vertices) - 1):
+            a = vertices[k]
+            b = vertices[k + 1]
+            if is_horizontal(a, b) and abs(b[0] - a[0]) > ORTHO_TOL:
+                horizontal.append((a[1], min(a[0], b[0]), max(a[0], b[0]), w, k))
+            elif is_vertical(a, b) and abs(b[1] - a[1]) > ORTHO_TOL:
+                vertical.append((a[0], min(a[1], b[1]), max(a[1], b[1]), w, k))
+    return horizontal, vertical
+
+
+class SegmentBlockers(object):
+    """
+    Segments that must not be moved or overlapped (wires left in place), sorted by
+    fixed coordinate so the ones on a given line are found by bisection.
+    """
+
+    def __init__(self, segments):
+        self.segments = sorted(seg[:3] for seg in segments)
+        self.coordinates = [seg[0] for seg in self.segments]
+
+    def __len__(self):
+        return len(self.segments)
+
+    def blocks(self, fixed, start, end):
+        """True if a blocker on the line at fixed overlaps start..end"""
+        i = bisect.bisect_left(self.coordinates, fixed - ORTHO_TOL)
+        while i < len(self.segments) and self.coordinates[i] < fixed + ORTHO_TOL:
+            blocker_fixed, blocker_start, blocker_end = self.segments[i]
+            if blocker_start < end - ORTHO_TOL and start < blocker_end - ORTHO_TOL:
+                return True
+            i += 1
+        return False
+
+
+def assign_tracks(segments, blockers=None, spacing=0.0):
+    """
+    Sweep over segments sorted by fixed coordinate, then start.
+    Segments on the same line (fixed within ORTHO_TOL) that overlap get different
+    tracks (interval colouring with a heap, so O(n log n) overall).
+    blockers: SegmentBlockers of wires that stay where they are; a track whose
+    line (fixed + track_offset(track, spacing)) overlaps one is not used.
+    Returns {(wire_index, segment_index): track} for segments off track 0.
+    """
+    tracks = {}
+    segments = sorted(segments)
+    if blockers is not None and not len(blockers):
+        blockers = None
+    i = 0
+    while i < len(segments):
+        # One line: consecutive segments whose fixed coordinate stays within tolerance
+        j = i + 1
+        while j < len(segments) and segments[j][0] - segments[j - 1][0] < ORTHO_TOL:
+            j += 1
+        line = sorted(segments[i:j], key=lambda seg: (seg[1], seg[3]))
+
+        active = []      # heap of (end, track)
+        free = []        # heap of released tracks
+        next_track = 0
+        for fixed, start, end, w, k in line:
+            # Segments that only touch (e.g. at a shared fixture) don't overlap
+            while active and active[0][0] <= start + ORTHO_TOL:
+                heapq.heappush(free, heapq.heappop(active)[1])
+            taken = []   # free tracks blocked by wires left in place
+            while True:
+                if free:
+                    track = heapq.heappop(free)
+                else:
+                    track = next_track
+                    next_track += 1
+                if blockers is None or not blockers.blocks(fixed + track_offset(track, spacing), start, end):
+                    break
+                taken.append(track)
+            for blocked in taken:
+                heapq.heappush(free, blocked)
+            heapq.heappush(active, (end, track))
+            if track:
+                tracks[(w, k)] = track
+        i = j
+    return tracks
+
+
+def offset_vertices(vertices, offsets):
+    """
+    Rebuild a wire with some segments shifted sideways.
+    offsets: {segment_index: (dx, dy)}. A corner between perpendicular legs takes
+    both shifts; anywhere else two different shifts are joined with a short jog.
+    The first/last vertex (connectors) never move — a stub jog is added instead.
+    """
+    no_shift = (0.0, 0.0)
+    last = len(vertices) - 1
+    result = [vertices[0]]
+    for k in range(last + 1):
+        x, y, z = vertices[k]
+        before = offsets.get(k - 1, no_shift) if k > 0 else no_shift
+        after = offsets.get(k, no_shift) if k < last else no_shift
+        if before == no_shift and after == no_shift:
+            if k:
+                result.append(vertices[k])
+            continue
+
+        corner = (0 < k < last and
+                  ((is_horizontal(vertices[k - 1], vertices[k]) and is_vertical(vertices[k], vertices[k + 1])) or
+                   (is_vertical(vertices[k - 1], vertices[k]) and is_horizontal(vertices[k], vertices[k + 1]))))
+        if corner:
+            result.append((x + before[0] + after[0], y + before[1] + after[1], z))
+            continue
+
+        # Jog: end of the shifted leg before, then start of the shifted leg after
+        if k:
+            result.append((x + before[0], y + before[1], z))
+        if k < last and (k == 0 or after != before):
+            result.append((x + after[0], y + after[1], z))
+        else:
+            result.append(vertices[k])
+    return result
+
+
+def separate_parallel(vertex_lists, spacing, fixed=None):
+    """
+    Offset wires drawn on top of each other so each one reads on the plans.
+
+    Collinear, overlapping orthogonal segments of different runs are found with a
+    sweep (O(n log n) over all segments) and moved to tracks spacing apart.
+    Wire endpoints stay on their connectors.
+    fixed: indices of wires that must stay where they are (e.g. wires already
+    written by an earlier run); the others are moved off their runs.
+
+    Returns a list aligned with the input: the new vertex list for wires that
+    were moved, None for the rest (always None for fixed wires).
+    """
+    horizontal, vertical = collect_segments(vertex_lists)
+    fixed = fixed or ()
+
+    wire_offsets = {}   # wire_index -> {segment_index: (dx, dy)}
+    for segments, shift in ((horizontal, lambda offset: (0.0, offset)),
+                            (vertical, lambda offset: (offset, 0.0))):
+        if fixed:
+            moving = [seg for seg in segments if seg[3] not in fixed]
+            blockers = SegmentBlockers(seg for seg in segments if seg[3] in fixed)
+        else:
+            moving, blockers = segments, None
+        for (w, k), track in assign_tracks(moving, blockers, spacing).items():
+            wire_offsets.setdefault(w, {})[k] = shift(track_offset(track, spacing))
+
+    results = [None] * len(vertex_lists)
+    for w, offsets in wire_offsets.items():
+        results[w] = remove_collinear(offset_vertices(vertex_lists[w], offsets))
+    return results
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  LOCAL GRID FRAMES
+# ══════════════════════════════════════════════════════════════════════════════
+
+def axis_angle(dx, dy):
+    """
+    Rotation of the grid frame that has (dx, dy) as one of its axes, folded into
+    [-45°, 45°) so grids at 0°/90°/180° all give 0.
+    """
+    quarter = math.pi / 2
+    angle = math.atan2(dy, dx) % quarter
+    if angle >= quarter / 2:
+        angle -= quarter
+    return 0.0 if abs(angle) < FRAME_ANGLE_TOL else angle
+
+
+def rotate_vertex_lists(vertex_lists, angle):
+    """Rotate (x, y, z) vertex lists about the Z axis (cos/sin computed once)"""
+    cos_a = math.cos(angle)
+    sin_a = math.sin(angle)
+    return [[(x * cos_a - y * sin_a, x * sin_a + y * cos_a, z) for x, y, z in vertices]
+            for vertices in vertex_lists]
+
+
+def rotate_obstacles(obstacles, angle):
+    """Obstacle index in a rotated frame: each box is replaced by the bounds of its rotated corners"""
+    cos_a = math.cos(angle)
+    sin_a = math.sin(angle)
+    keyed_boxes = []
+    for key, (min_x, min_y, max_x, max_y) in obstacles.boxes.items():
+        corners = [(x * cos_a - y * sin_a, x * sin_a + y * cos_a)
+                   for x, y in ((min_x, min_y), (max_x, min_y), (max_x, max_y), (min_x, max_y))]
+        xs = [c[0] for c in corners]
+        ys = [c[1] for c in corners]
+        keyed_boxes.append((key, (min(xs), min(ys), max(xs), max(ys))))
+    return GridHash2D.from_boxes(keyed_boxes, obstacles.cell_size)
+
+
+class LineFrames(object):
+    """
+    Frame angle from the nearest grid line.
+    lines: [(x0, y0, x1, y1), ...] plan segments (e.g. the building grids)
+    """
+
+    def __init__(self, lines):
+        self.lines = [(x0, y0, x1, y1, axis_angle(x1 - x0, y1 - y0))
+                      for x0, y0, x1, y1 in lines
+                      if abs(x1 - x0) + abs(y1 - y0) > ORTHO_TOL]
+
+    def angle_at(self, x, y):
+        best_angle = 0.0
+        best_distance = None
+        for x0, y0, x1, y1, angle in self.lines:
+            dx = x1 - x0
+            dy = y1 - y0
+            t = ((x - x0) * dx + (y - y0) * dy) / (dx * dx + dy * dy)
+            t = min(1.0, max(0.0, t))
+            distance = math.hypot(x - (x0 + t * dx), y - (y0 + t * dy))
+            if best_distance is None or distance < best_distance:
+                best_angle, best_distance = angle, distance
+        return best_angle
+
+
+class RegionFrames(object):
+    """
+    Frame angle from the region containing the point (e.g. scope boxes), 0 elsewhere.
+    regions: [(loops, angle), ...] with loops as for PlanRegion; first match wins
+    """
+
+    def __init__(self, regions):
+        self.regions = [(PlanRegion(loops), angle) for loops, angle in regions]
+
+    def angle_at(self, x, y):
+        for region, angle in self.regions:
+            if region.contains(x, y):
+                return angle
+        return 0.0
+
+
+def wire_frame_angles(vertex_lists, frames):
+    """Frame angle per wire, taken at the midpoint between its end points"""
+    if frames is None:
+        return [0.0] * len(vertex_lists)
+    return [frames.angle_at((v[0][0] + v[-1][0]) / 2.0, (v[0][1] + v[-1][1]) / 2.0) if v else 0.0
+            for v in vertex_lists]
+
+
+def map_in_frames(vertex_lists, angles, batch):
+    """
+    Run batch(local_vertex_lists, angle) once per distinct frame angle on the
+    wires of that frame (in input order), rotated so the frame's axes are the X/Y axes, and rotate
+    the results back. batch returns a list aligned with its input (None = unchanged).
+    End points are restored exactly so they stay on their connectors.
+    """
+    groups = {}
+    for index, angle in enumerate(angles):
+        groups.setdefault(angle, []).append(index)
+
+    results = [None] * len(vertex_lists)
+    for angle, indices in groups.items():
+        wires = [vertex_lists[i] for i in indices]
+        if not angle:
+            local_results = batch(wires, 0.0)
+        else:
+            local_results = batch(rotate_vertex_lists(wires, -angle), angle)
+            changed = [n for n, r in enumerate(local_results) if r is not None]
+            rotated_back = rotate_vertex_lists([local_results[n] for n in changed], angle)
+            for n, vertices in zip(changed, rotated_back):
+                vertices[0] = wires[n][0]
+                vertices[-1] = wires[n][-1]
+                local_results[n] = vertices
+        for i, result in zip(indices, local_results):
+            results[i] = result
+    return results
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  FINGERPRINTS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _digest(text):
+    return hashlib.md5(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _format_point(point):
+    return "{0:.{3}f},{1:.{3}f},{2:.{3}f}".format(point[0], point[1], point[2], FINGERPRINT_DIGITS)
+
+
+def fingerprint(vertices, mode):
+    """Compact hash of a vertex list and the settings (mode) that produced it"""
+    return _digest(mode + "|" + ";".join(_format_point(p) for p in vertices))
+
+
+def ends_fingerprint(count, first, last, mode):
+    """
+    Compact hash of vertex count, end points and mode. These three values can be
+    read without fetching the whole vertex list, so this is the cheap check.
+    """
+    return _digest("{}|{}|{}|{}".format(mode, count, _format_point(first), _format_point(last)))
+
+
+def source_identity(kind, parts):
+    """
+    Identity of the geometry a result depends on (grid lines, scope boxes,
+    obstacles) for the mode string: kind plus a hash of the parts, so a moved
+    grid or a different set of boxes gives a different mode.
+    """
+    if not parts:
+        return kind
+    return "{}:{}".format(kind, _digest(";".join(sorted(parts))))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  LENGTHS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def vertex_diff(old_vertices, new_vertices):
+    """
+    Change summary for one wire: (vertices_added, vertices_removed, length_delta).
+    Vertices are compared by position (FINGERPRINT_DIGITS), not by index.
+    """
+    def keys(vertices):
+        counts = {}
+        for x, y, z in vertices:
+            key = (round(x, FINGERPRINT_DIGITS), round(y, FINGERPRINT_DIGITS))
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    old_keys = keys(old_vertices)
+    new_keys = keys(new_vertices)
+    added = sum(max(0, n - old_keys.get(key, 0)) for key, n in new_keys.items())
+    removed = sum(max(0, n - new_keys.get(key, 0)) for key, n in old_keys.items())
+    old_length, new_length = plan_lengths([old_vertices, new_vertices])
+    return added, removed, new_length - old_length
+
+
+def plan_lengths(vertex_lists):
+    """
+    Drawn plan (XY) length of each wire, in one pass over all vertex lists.
+    Returns a list of lengths in feet aligned with the input.
+    """
+    hypot = math.hypot
+    lengths = []
+    append = lengths.append
+    for vertices in vertex_lists:
+        total = 0.0
+        if vertices:
+            px, py = vertices[0][0], vertices[0][1]
+            for x, y, z in vertices:
+                total += hypot(x - px, y - py)
+                px, py = x, y
+        append(total)
+    return lengths
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  BATCH API
+# ══════════════════════════════════════════════════════════════════════════════
+
+def orthogonalize_batch(vertex_lists, routing, obstacles=None):
+    """
+    Orthogonalize many wires in one call.
+
+    vertex_lists: iterable of vertex lists, one per wire
+    obstacles: GridHash2D of obstacle boxes for "avoid" routing, built once per run
+    Returns a list aligned with the input: the new vertex list for wires
+    that change, None for wires that are already clean (or too short).
+    """
+    results = []
+    for vertices in vertex_lists:
+        if len(vertices) < 2:
+            results.append(None)
+            continue
+        new_vertices = orthogonalize_vertices(vertices, routing, obstacles)
+        results.append(new_vertices if vertices_changed(vertices, new_vertices) else None)
+    return results
+
+
+def to_tuples(points):
+    """XYZ-like objects (anything with .X/.Y/.Z) to (x, y, z) tuples"""
+    return [(p.X, p.Y, p.Z) for p in points]
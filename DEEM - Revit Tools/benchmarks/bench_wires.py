@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Wire Fix benchmark
+Times the Revit-free wire geometry core (Snippets._wires) on synthetic
+warehouse lighting layouts. Runs with plain CPython, no Revit needed:
+
+    python bench_wires.py
+    python bench_wires.py --wires 20000 --repeat 5 --seed 7
+
+Layouts are rows of fixtures on a column grid with a little placement jitter.
+Each wire chains 2-4 neighbouring fixtures, so most segments are slightly
+diagonal like wires drawn between fixtures that are not perfectly aligned.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+LIB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DEEM Tools.extension", "lib")
+sys.path.insert(0, os.path.normpath(LIB_PATH))
+
+import math  # noqa: E402
+
+from Snippets._wires import (  # noqa: E402
+    orthogonalize_batch, separate_parallel, map_in_frames, rotate_vertex_lists, plan_lengths, ROUTING_MODES
+)
+from Snippets._spatial import GridHash2D  # noqa: E402
+
+
+# ── synthetic layouts ─────────────────────────────────────────────────────────
+def warehouse_fixtures(rows, columns, spacing_x=20.0, spacing_y=25.0, jitter=1.5, rng=None):
+    """Fixture points (x, y, z) on a warehouse grid, with placement jitter (feet)"""
+    rng = rng or random.Random(0)
+    fixtures = []
+    for row in range(rows):
+        for column in range(columns):
+            fixtures.append((column * spacing_x + rng.uniform(-jitter, jitter),
+                             row * spacing_y + rng.uniform(-jitter, jitter),
+                             0.0))
+    return fixtures
+
+
+def warehouse_wires(wire_count, rng=None):
+    """Vertex lists for wire_count wires between neighbouring fixtures"""
+    rng = rng or random.Random(0)
+    columns = 40
+    rows = max(2, wire_count // columns + 1)
+    fixtures = warehouse_fixtures(rows, columns, rng=rng)
+
+    wires = []
+    for _ in range(wire_count):
+        row = rng.randrange(rows)
+        column = rng.randrange(columns)
+        vertices = [fixtures[row * columns + column]]
+        for _ in range(rng.randint(1, 3)):
+            # Step to a neighbouring fixture in the same row, or to the next row
+            if rng.random() < 0.7:
+                column = min(columns - 1, column + 1)
+            else:
+                row = min(rows - 1, row + 1)
+            vertices.append(fixtures[row * columns + column])
+        wires.append(vertices)
+    return wires
+
+
+def fixture_obstacles(wires, width=2.0, length=4.0):
+    """Obstacle index with a 2'x4' fixture box on every distinct wire vertex"""
+    centers = set((x, y) for vertices in wires for x, y, z in vertices)
+    return GridHash2D.from_boxes(
+        (n, (x - width / 2, y - length / 2, x + width / 2, y + length / 2))
+        for n, (x, y) in enumerate(sorted(centers)))
+
+
+# ── benchmark cases ───────────────────────────────────────────────────────────
+def case_orthogonalize(routing):
+    """Benchmark case: orthogonalize_batch with one routing mode"""
+    def run(wires):
+        return orthogonalize_batch(wires, routing)
+    return run
+
+
+def case_avoid():
+    """Benchmark case: obstacle-aware routing, index build included (once per run, like the tool)"""
+    def run(wires):
+        return orthogonalize_batch(wires, "avoid", fixture_obstacles(wires))
+    return run
+
+
+def case_separate(spacing=0.5):
+    """Benchmark case: orthogonalize ("auto") then separate overlapping parallel runs"""
+    def run(wires):
+        routed = [new or old for old, new in zip(wires, orthogonalize_batch(wires, "auto"))]
+        return separate_parallel(routed, spacing)
+    return run
+
+
+def case_rotated_frame(degrees=30.0):
+    """Benchmark case: the layout turned by degrees, cleaned in the matching grid frame"""
+    angle = math.radians(degrees)
+    cache = {}
+
+    def run(wires):
+        # Rotating the layout itself is set-up, not part of the timed work
+        key = id(wires)
+        if key not in cache:
+            cache[key] = rotate_vertex_lists(wires, angle)
+        rotated = cache[key]
+        return map_in_frames(rotated, [angle] * len(rotated),
+                             lambda local_lists, a: orthogonalize_batch(local_lists, "auto"))
+    return run
+
+
+CASES = [("orthogonalize[{}]".format(routing), case_orthogonalize(routing))
+         for routing in ROUTING_MODES if routing != "avoid"]
+CASES.append(("orthogonalize[avoid]", case_avoid()))
+CASES.append(("auto+separate", case_separate()))
+CASES.append(("auto@30deg frame", case_rotated_frame()))
+CASES.append(("plan_lengths", plan_lengths))
+
+
+def time_case(run, wires, repeat):
+    """Best wall time of repeat runs (seconds) and the last result"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter() if hasattr(time, "perf_counter") else time.time()
+        result = run(wires)
+        end = time.perf_counter() if hasattr(time, "perf_counter") else time.time()
+        best = end - start if best is None else min(best, end - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--wires", type=int, default=5000, help="wires per layout (default 5000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, best is reported (default 3)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the layout (default 0)")
+    args = parser.parse_args(argv)
+
+    wires = warehouse_wires(args.wires, random.Random(args.seed))
+    vertex_count = sum(len(w) for w in wires)
+    print("Layout: {} wires, {} vertices (seed {})".format(len(wires), vertex_count, args.seed))
+    print("{:<28} {:>10} {:>14} {:>10}".format("case", "best (s)", "wires/s", "changed"))
+
+    for name, run in CASES:
+        best, result = time_case(run, wires, args.repeat)
+        changed = sum(1 for r in result if r is not None) if isinstance(result, list) else "-"
+        rate = len(wires) / best if best else float("inf")
+        print("{:<28} {:>10.4f} {:>14,.0f} {:>10}".format(name, best, rate, changed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the ceiling grid calibration store (Snippets._calibration).
+The store only touches Revit through DB.ElementId and the link document, so
+plain CPython runs it with minimal pyrevit / Autodesk.Revit modules standing in:
+
+    python -m pytest tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+
+LIB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DEEM Tools.extension", "lib")
+sys.path.insert(0, os.path.normpath(LIB_PATH))
+
+
+class ElementId(object):
+    def __init__(self, value):
+        self.IntegerValue = int(value)
+
+
+if "Autodesk.Revit" not in sys.modules:
+    revit_db = types.ModuleType("Autodesk.Revit.DB")
+    revit_db.ElementId = ElementId
+    sys.modules["Autodesk"] = types.ModuleType("Autodesk")
+    sys.modules["Autodesk.Revit"] = types.ModuleType("Autodesk.Revit")
+    sys.modules["Autodesk.Revit"].DB = revit_db
+    sys.modules["Autodesk.Revit.DB"] = revit_db
+if "pyrevit" not in sys.modules:
+    sys.modules["pyrevit"] = types.ModuleType("pyrevit")
+    sys.modules["pyrevit"].DB = sys.modules["Autodesk.Revit.DB"]
+    sys.modules["pyrevit"].script = types.ModuleType("pyrevit.script")
+
+from Snippets._calibration import (  # noqa: E402
+    CalibrationStore, get_legacy_attributes, import_legacy_config, is_legacy_attribute
+)
+
+
+class Ceiling(object):
+    def __init__(self, element_id):
+        self.UniqueId = "ceiling-{}".format(element_id)
+
+
+class LinkDocument(object):
+    """Link document with ceilings for the given element ids"""
+
+    def __init__(self, guid, title, ceiling_ids=()):
+        self.CreationGUID = guid
+        self.Title = title
+        self.ceiling_ids = set(ceiling_ids)
+
+    def GetElement(self, element_id):
+        if element_id.IntegerValue in self.ceiling_ids:
+            return Ceiling(element_id.IntegerValue)
+        return None
+
+
+class Config(object):
+    """pyRevit config section: plain attributes"""
+
+
+def legacy_config(link_name, element_id, offset, spacing):
+    config = Config()
+    for axis, offset_value, spacing_value in zip(("x", "y"), offset, spacing):
+        setattr(config, "grid_offset_ceiling_{}_{}_{}".format(link_name, element_id, axis), offset_value)
+        setattr(config, "grid_spacing_ceiling_{}_{}_{}".format(link_name, element_id, axis), spacing_value)
+    return config
+
+
+class CalibrationStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "calibration.json")
+        self.link = LinkDocument("guid-a", "Architecture", [101, 102])
+        self.other_link = LinkDocument("guid-b", "Architecture", [101])
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_missing_file_gives_empty_store(self):
+        store = CalibrationStore(self.path)
+        self.assertEqual(store.links, {})
+        self.assertEqual(store.get_ceiling_grids(self.link), {})
+
+    def test_save_load_round_trip(self):
+        store = CalibrationStore(self.path)
+        store.set_ceiling_grid(self.link, "ceiling-101", (0.5, 1.0, 2.0, 4.0, 0.25), "Arch Link")
+        store.set_ceiling_grid(self.link, "ceiling-102", (0.0, 0.0, 2.0, 2.0, 0.0))
+        store.save()
+
+        reloaded = CalibrationStore(self.path)
+        self.assertEqual(reloaded.get_ceiling_grids(self.link), {
+            "ceiling-101": (0.5, 1.0, 2.0, 4.0, 0.25),
+            "ceiling-102": (0.0, 0.0, 2.0, 2.0, 0.0),
+        })
+        self.assertEqual(reloaded.get_link_names(), {"guid-a": "Arch Link"})
+
+    def test_lookup_by_link_and_ceiling_key(self):
+        store = CalibrationStore(self.path)
+        store.set_ceiling_grid(self.link, "ceiling-101", (1.0, 1.0, 2.0, 4.0, 0.0))
+        store.set_ceiling_grid(self.other_link, "ceiling-101", (3.0, 3.0, 2.0, 2.0, 0.0))
+        # Same title and ceiling id in two links: the link document GUID keeps them apart
+        self.assertEqual(store.get_ceiling_grids(self.link), {"ceiling-101": (1.0, 1.0, 2.0, 4.0, 0.0)})
+        self.assertEqual(store.get_ceiling_grids(self.other_link), {"ceiling-101": (3.0, 3.0, 2.0, 2.0, 0.0)})
+        self.assertEqual(store.get_ceiling_grids(LinkDocument("guid-c", "Architecture")), {})
+
+    def test_missing_angle_defaults_to_zero(self):
+        store = CalibrationStore(self.path)
+        store.links = {"guid-a": {"name": "Arch", "ceilings": {"ceiling-101": {
+            "offset_x": 1.0, "offset_y": 2.0, "spacing_x": 2.0, "spacing_y": 4.0}}}}
+        self.assertEqual(store.get_ceiling_grids(self.link), {"ceiling-101": (1.0, 2.0, 2.0, 4.0, 0.0)})
+
+    def test_reset_link(self):
+        store = CalibrationStore(self.path)
+        store.set_ceiling_grid(self.link, "ceiling-101", (1.0, 1.0, 2.0, 4.0, 0.0))
+        store.set_ceiling_grid(self.link, "ceiling-102", (1.0, 1.0, 2.0, 4.0, 0.0))
+        store.set_ceiling_grid(self.other_link, "ceiling-101", (1.0, 1.0, 2.0, 4.0, 0.0))
+        self.assertEqual(store.reset_link("guid-a"), 2)
+        self.assertEqual(store.reset_link("guid-a"), 0)
+        self.assertEqual(list(store.get_link_names()), ["guid-b"])
+        self.assertEqual(store.reset_all(), 1)
+
+
+class LegacyConfigTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.store = CalibrationStore(os.path.join(self.folder, "calibration.json"))
+        self.link = LinkDocument("guid-a", "Architecture", [101])
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_legacy_attributes_map_to_new_keys(self):
+        config = legacy_config("Arch_Link", 101, (0.5, 1.5), (2.0, 4.0))
+        self.assertEqual(import_legacy_config(config, self.store, "Arch_Link", self.link), 1)
+        self.assertEqual(self.store.get_ceiling_grids(self.link), {"ceiling-101": (0.5, 1.5, 2.0, 4.0, 0.0)})
+        self.assertEqual(self.store.get_link_names(), {"guid-a": "Arch_Link"})
+        self.assertEqual(get_legacy_attributes(config), [])
+
+    def test_other_links_are_left_alone(self):
+        config = legacy_config("Arch", 101, (0.5, 1.5), (2.0, 4.0))
+        other = legacy_config("Arch_Link", 101, (0.0, 0.0), (2.0, 2.0))
+        for name in dir(other):
+            if is_legacy_attribute(name):
+                setattr(config, name, getattr(other, name))
+        self.assertEqual(import_legacy_config(config, self.store, "Arch", self.link), 1)
+        self.assertEqual(len(get_legacy_attributes(config, "Arch_Link")), 4)
+        self.assertEqual(get_legacy_attributes(config, "Arch"), [])
+
+    def test_incomplete_or_unknown_ceiling_is_dropped(self):
+        config = legacy_config("Arch", 999, (0.5, 1.5), (2.0, 4.0))
+        partial = legacy_config("Arch", 101, (0.5, 1.5), (2.0, 4.0))
+        delattr(partial, "grid_spacing_ceiling_Arch_101_y")
+        for name in dir(partial):
+            if is_legacy_attribute(name):
+                setattr(config, name, getattr(partial, name))
+        self.assertEqual(import_legacy_config(config, self.store, "Arch", self.link), 0)
+        self.assertEqual(self.store.get_ceiling_grids(self.link), {})
+        self.assertEqual(get_legacy_attributes(config), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the Revit-free plan geometry helpers (Snippets._geometry).
+Runs with plain CPython, no Revit needed:
+
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+
+import math
+import os
+import sys
+import unittest
+
+LIB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DEEM Tools.extension", "lib")
+sys.path.insert(0, os.path.normpath(LIB_PATH))
+
+from Snippets._geometry import (  # noqa: E402
+    PlanRegion, chain_polylines, point_in_loops, point_on_segment, polygon_bbox,
+    angle_difference, dominant_edge_angle, grid_from_picks,
+    cell_centers, locate_cells, nearest_cells, rotate_points, snap_to_cell_centers
+)
+
+SQUARE = [(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)]
+HOLE = [(4.0, 4.0), (6.0, 4.0), (6.0, 6.0), (4.0, 6.0)]
+# L-shape: 10 x 10 square with the top-right 5 x 5 quarter cut away
+L_SHAPE = [(0.0, 0.0), (10.0, 0.0), (10.0, 5.0), (5.0, 5.0), (5.0, 10.0), (0.0, 10.0)]
+
+
+class PointOnSegmentTest(unittest.TestCase):
+
+    def test_interior_and_ends(self):
+        self.assertTrue(point_on_segment(5.0, 0.0, 0.0, 0.0, 10.0, 0.0))
+        self.assertTrue(point_on_segment(0.0, 0.0, 0.0, 0.0, 10.0, 0.0))
+        self.assertTrue(point_on_segment(10.0, 0.0, 0.0, 0.0, 10.0, 0.0))
+
+    def test_collinear_beyond_ends(self):
+        self.assertFalse(point_on_segment(11.0, 0.0, 0.0, 0.0, 10.0, 0.0))
+        self.assertFalse(point_on_segment(-1.0, 0.0, 0.0, 0.0, 10.0, 0.0))
+
+    def test_off_line(self):
+        self.assertFalse(point_on_segment(5.0, 0.1, 0.0, 0.0, 10.0, 0.0))
+
+
+class PointInLoopsTest(unittest.TestCase):
+
+    def test_square(self):
+        self.assertTrue(point_in_loops(5.0, 5.0, [SQUARE]))
+        self.assertFalse(point_in_loops(15.0, 5.0, [SQUARE]))
+        self.assertFalse(point_in_loops(-0.1, 5.0, [SQUARE]))
+
+    def test_l_shape(self):
+        self.assertTrue(point_in_loops(2.0, 8.0, [L_SHAPE]))     # upper arm
+        self.assertTrue(point_in_loops(8.0, 2.0, [L_SHAPE]))     # right arm
+        self.assertTrue(point_in_loops(2.0, 2.0, [L_SHAPE]))     # corner block
+        self.assertFalse(point_in_loops(8.0, 8.0, [L_SHAPE]))    # the notch, inside the bbox
+
+    def test_l_shape_ray_through_reflex_vertex(self):
+        # Horizontal ray from (2, 5) passes exactly through the reflex vertex (5, 5)
+        self.assertTrue(point_in_loops(2.0, 5.0, [L_SHAPE]))
+        self.assertFalse(point_in_loops(8.0, 5.0001, [L_SHAPE]))
+
+    def test_hole(self):
+        loops = [SQUARE, HOLE]
+        self.assertFalse(point_in_loops(5.0, 5.0, loops))
+        self.assertTrue(point_in_loops(2.0, 5.0, loops))
+        self.assertTrue(point_in_loops(8.0, 8.0, loops))
+
+    def test_hole_orientation_does_not_matter(self):
+        loops = [SQUARE, list(reversed(HOLE))]
+        self.assertFalse(point_in_loops(5.0, 5.0, loops))
+        self.assertTrue(point_in_loops(1.0, 1.0, loops))
+
+    def test_points_on_edges_count_as_inside(self):
+        self.assertTrue(point_in_loops(5.0, 0.0, [SQUARE]))
+        self.assertTrue(point_in_loops(10.0, 5.0, [SQUARE]))
+        self.assertTrue(point_in_loops(7.0, 5.0, [L_SHAPE]))     # notch edge
+        self.assertTrue(point_in_loops(5.0, 4.0, [SQUARE, HOLE]))  # hole edge
+
+    def test_points_on_vertices_count_as_inside(self):
+        for x, y in SQUARE:
+            self.assertTrue(point_in_loops(x, y, [SQUARE]))
+        for x, y in L_SHAPE:
+            self.assertTrue(point_in_loops(x, y, [L_SHAPE]))
+        self.assertTrue(point_in_loops(4.0, 4.0, [SQUARE, HOLE]))
+
+    def test_degenerate_loops_are_ignored(self):
+        self.assertFalse(point_in_loops(0.5, 0.0, [[(0.0, 0.0), (1.0, 0.0)]]))
+        self.assertFalse(point_in_loops(0.0, 0.0, []))
+
+
+class PlanRegionTest(unittest.TestCase):
+
+    def test_bbox(self):
+        region = PlanRegion([L_SHAPE])
+        self.assertEqual(region.bbox, (0.0, 0.0, 10.0, 10.0))
+        self.assertEqual(polygon_bbox([SQUARE, HOLE]), (0.0, 0.0, 10.0, 10.0))
+
+    def test_contains(self):
+        region = PlanRegion([SQUARE, HOLE])
+        self.assertTrue(region.contains(1.0, 1.0))
+        self.assertFalse(region.contains(5.0, 5.0))
+        self.assertTrue(region.contains(10.0, 10.0))
+
+    def test_bbox_prefilter_rejects_without_polygon_test(self):
+        region = PlanRegion([SQUARE])
+        # Loops that would report everything inside: only the bbox can reject
+        region.loops = [[(-100.0, -100.0), (100.0, -100.0), (100.0, 100.0), (-100.0, 100.0)]]
+        self.assertFalse(region.contains(20.0, 5.0))
+        self.assertFalse(region.contains(5.0, -0.001))
+        self.assertTrue(region.contains(5.0, 5.0))
+
+    def test_empty_region(self):
+        region = PlanRegion([[(0.0, 0.0), (1.0, 1.0)]])
+        self.assertFalse(region)
+        self.assertIsNone(region.bbox)
+        self.assertFalse(region.contains(0.0, 0.0))
+
+
+class ChainPolylinesTest(unittest.TestCase):
+
+    def test_unordered_and_reversed_pieces(self):
+        pieces = [
+            [(0.0, 0.0), (10.0, 0.0)],
+            [(0.0, 10.0), (5.0, 10.0)],     # reversed
+            [(10.0, 0.0), (10.0, 5.0)],
+            [(0.0, 0.0), (0.0, 10.0)],      # reversed
+            [(5.0, 5.0), (5.0, 10.0)],      # reversed
+            [(10.0, 5.0), (5.0, 5.0)],
+        ]
+        loops = chain_polylines(pieces)
+        self.assertEqual(len(loops), 1)
+        self.assertEqual(len(loops[0]), 6)
+        self.assertEqual(set(loops[0]), set(L_SHAPE))
+        region = PlanRegion(loops)
+        self.assertTrue(region.contains(2.0, 8.0))
+        self.assertFalse(region.contains(8.0, 8.0))
+
+    def test_tessellated_pieces_keep_inner_points(self):
+        arc = [(10.0, 0.0), (12.0, 5.0), (10.0, 10.0)]
+        pieces = [[(0.0, 10.0), (10.0, 10.0)], arc, [(0.0, 0.0), (10.0, 0.0)], [(0.0, 10.0), (0.0, 0.0)]]
+        loops = chain_polylines(pieces)
+        self.assertEqual(len(loops), 1)
+        self.assertIn((12.0, 5.0), loops[0])
+        self.assertTrue(PlanRegion(loops).contains(11.0, 5.0))
+
+    def test_separate_loops(self):
+        outer = [[(0.0, 0.0), (10.0, 0.0)], [(10.0, 0.0), (10.0, 10.0)],
+                 [(10.0, 10.0), (0.0, 10.0)], [(0.0, 10.0), (0.0, 0.0)]]
+        hole = [[(4.0, 4.0), (4.0, 6.0)], [(6.0, 6.0), (6.0, 4.0)],
+                [(4.0, 6.0), (6.0, 6.0)], [(6.0, 4.0), (4.0, 4.0)]]
+        loops = chain_polylines(hole[:2] + outer + hole[2:])
+        self.assertEqual(len(loops), 2)
+        region = PlanRegion(loops)
+        self.assertFalse(region.contains(5.0, 5.0))
+        self.assertTrue(region.contains(2.0, 2.0))
+
+    def test_end_points_within_tolerance(self):
+        pieces = [[(0.0, 0.0), (1.0, 0.0)], [(1.0 + 1e-9, 0.0), (1.0, 1.0)], [(1.0, 1.0), (0.0, 0.0)]]
+        self.assertEqual(len(chain_polylines(pieces)[0]), 3)
+
+
+class GridFromPicksTest(unittest.TestCase):
+
+    def test_step_along_x(self):
+        self.assertEqual(grid_from_picks((1.0, 0.5), (3.0, 0.5), (2.0, 4.0)), (1.0, 0.5, 2.0, 4.0, 0.0))
+
+    def test_long_side_picked_along_y(self):
+        self.assertEqual(grid_from_picks((1.0, 0.5), (1.0, 4.5), (4.0, 2.0)), (1.0, 0.5, 2.0, 4.0, 0.0))
+
+    def test_rotated_wing(self):
+        angle = math.radians(120.0)
+        grid = grid_from_picks((0.0, 0.0), (4.0 * math.cos(angle), 4.0 * math.sin(angle)), (2.0, 4.0))
+        # 120 degrees folds to 30: the 4' step now runs along the local Y axis
+        self.assertAlmostEqual(grid[4], math.radians(30.0))
+        self.assertEqual(grid[2:4], (2.0, 4.0))
+
+    def test_picks_not_matching_the_pattern(self):
+        self.assertIsNone(grid_from_picks((0.0, 0.0), (3.0, 0.0), (2.0, 4.0)))
+
+
+class EdgeAngleTest(unittest.TestCase):
+
+    def test_longest_edge_wins(self):
+        angle = math.radians(20.0)
+        rectangle = [(0.0, 0.0), (10.0 * math.cos(angle), 10.0 * math.sin(angle)),
+                     (10.0 * math.cos(angle) - math.sin(angle), 10.0 * math.sin(angle) + math.cos(angle)),
+                     (-math.sin(angle), math.cos(angle))]
+        self.assertAlmostEqual(dominant_edge_angle([rectangle]), angle)
+        self.assertEqual(dominant_edge_angle([SQUARE]), 0.0)
+        self.assertIsNone(dominant_edge_angle([]))
+
+    def test_angle_difference_is_modulo_90(self):
+        self.assertAlmostEqual(angle_difference(math.radians(1.0), math.radians(89.0)), math.radians(2.0))
+        self.assertAlmostEqual(angle_difference(0.0, math.pi / 2), 0.0)
+
+
+class GridCellsTest(unittest.TestCase):
+    # 2' x 4' grid offset by (0.5, 0.25) in its own frame, rotated 30 degrees
+    GRID = (0.5, 0.25, 2.0, 4.0, math.radians(30.0))
+
+    def world(self, local_points):
+        return rotate_points(local_points, self.GRID[4])
+
+    def test_locate_in_rotated_grid(self):
+        points = self.world([(0.5 + 2.0 * 3 + 1.0, 0.25 - 4.0 * 2 + 1.0),    # inside cell (3, -2)
+                             (0.5 + 0.1, 0.25 + 0.1),                      # just past the origin
+                             (0.5 - 0.1, 0.25 - 0.1)])                     # just before it
+        self.assertEqual(locate_cells(points, *self.GRID), [(3, -2), (0, 0), (-1, -1)])
+
+    def test_rotation_matters(self):
+        # The same world point lands in a different cell of the unrotated grid
+        point = self.world([(0.5 + 2.0 * 3 + 1.0, 0.25 + 4.0 * 2 + 1.0)])
+        self.assertEqual(locate_cells(point, *self.GRID), [(3, 2)])
+        self.assertNotEqual(locate_cells(point, *self.GRID[:4]), [(3, 2)])
+
+    def test_points_on_grid_lines_go_to_the_upper_cell(self):
+        self.assertEqual(locate_cells([(2.5, 4.25), (0.5, 0.25)], 0.5, 0.25, 2.0, 4.0), [(1, 1), (0, 0)])
+
+    def test_centers_in_rotated_grid(self):
+        centers = cell_centers([(3, -2), (0, 0)], *self.GRID)
+        expected = self.world([(0.5 + 6.0 + 1.0, 0.25 - 8.0 + 2.0), (1.5, 2.25)])
+        for center, point in zip(centers, expected):
+            self.assertAlmostEqual(center[0], point[0])
+            self.assertAlmostEqual(center[1], point[1])
+        # A center lies in its own cell
+        self.assertEqual(locate_cells(centers, *self.GRID), [(3, -2), (0, 0)])
+
+    def test_snap_centers_points_of_one_cell(self):
+        points = self.world([(2.6, 4.3), (4.4, 8.2), (3.5, 6.25)])
+        snapped = snap_to_cell_centers(points, *self.GRID)
+        center = self.world([(3.5, 6.25)])[0]
+        for x, y in snapped:
+            self.assertAlmostEqual(x, center[0])
+            self.assertAlmostEqual(y, center[1])
+
+
+class NearestCellsTest(unittest.TestCase):
+
+    def test_square_cells_ties(self):
+        # Equal distances: along X before along Y, then by dx, dy
+        self.assertEqual(nearest_cells((0, 0), 2.0, 2.0, 1), [
+            (-1, 0), (1, 0), (0, -1), (0, 1),
+            (-1, -1), (-1, 1), (1, -1), (1, 1)])
+
+    def test_ordered_by_distance_with_unequal_spacing(self):
+        cells = nearest_cells((5, 5), 4.0, 2.0, 2)
+        # (4, 5) and (5, 3) are both 4' away: the tie goes to the X neighbour
+        self.assertEqual(cells[:6], [(5, 4), (5, 6), (4, 5), (6, 5), (5, 3), (5, 7)])
+        distances = [((x - 5) * 4.0) ** 2 + ((y - 5) * 2.0) ** 2 for x, y in cells]
+        self.assertEqual(distances, sorted(distances))
+
+    def test_excludes_the_cell_itself(self):
+        cells = nearest_cells((1, -1), 2.0, 4.0, 2)
+        self.assertEqual(len(cells), 24)
+        self.assertEqual(len(set(cells)), 24)
+        self.assertNotIn((1, -1), cells)
+        self.assertEqual(nearest_cells((0, 0), 2.0, 4.0, 0), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
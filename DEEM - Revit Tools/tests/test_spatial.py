@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the Revit-free spatial hashes (Snippets._spatial), checked against
+brute force. Runs with plain CPython, no Revit needed:
+
+    python -m pytest tests
+"""
+
+import math
+import os
+import random
+import sys
+import unittest
+
+LIB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DEEM Tools.extension", "lib")
+sys.path.insert(0, os.path.normpath(LIB_PATH))
+
+from Snippets._spatial import GridHash2D, PointHash2D  # noqa: E402
+
+
+def brute_point(boxes, x, y):
+    return [key for key, b in boxes if b[0] <= x <= b[2] and b[1] <= y <= b[3]]
+
+
+def brute_box(boxes, query):
+    return [key for key, b in boxes
+            if b[0] <= query[2] and query[0] <= b[2] and b[1] <= query[3] and query[1] <= b[3]]
+
+
+def brute_nearest_distance(points, x, y, exclude=None):
+    distances = [math.hypot(px - x, py - y) for key, (px, py) in points if key != exclude]
+    return min(distances) if distances else None
+
+
+def random_boxes(rng, count, extent=100.0, max_size=12.0):
+    boxes = []
+    for key in range(count):
+        x, y = rng.uniform(-extent, extent), rng.uniform(-extent, extent)
+        boxes.append((key, (x, y, x + rng.uniform(0.0, max_size), y + rng.uniform(0.0, max_size))))
+    return boxes
+
+
+class GridHash2DTest(unittest.TestCase):
+
+    def test_point_queries_match_brute_force(self):
+        rng = random.Random(7)
+        boxes = random_boxes(rng, 200)
+        index = GridHash2D.from_boxes(boxes)
+        for _ in range(500):
+            x, y = rng.uniform(-110.0, 110.0), rng.uniform(-110.0, 110.0)
+            self.assertEqual(index.query_point(x, y), brute_point(boxes, x, y))
+
+    def test_box_queries_match_brute_force(self):
+        rng = random.Random(11)
+        boxes = random_boxes(rng, 200)
+        index = GridHash2D.from_boxes(boxes, cell_size=5.0)
+        for _ in range(300):
+            x, y = rng.uniform(-110.0, 110.0), rng.uniform(-110.0, 110.0)
+            query = (x, y, x + rng.uniform(0.0, 30.0), y + rng.uniform(0.0, 30.0))
+            self.assertEqual(sorted(index.query_box(*query)), brute_box(boxes, query))
+
+    def test_points_and_boxes_on_cell_boundaries(self):
+        # Edges exactly on cell lines (cell size 10), including negative cells
+        boxes = [("a", (0.0, 0.0, 10.0, 10.0)), ("b", (-10.0, -10.0, 0.0, 0.0)),
+                 ("c", (10.0, 0.0, 20.0, 10.0)), ("d", (5.0, 10.0, 5.0, 10.0))]
+        index = GridHash2D.from_boxes(boxes, cell_size=10.0)
+        for x in (-10.0, -5.0, 0.0, 5.0, 10.0, 15.0, 20.0):
+            for y in (-10.0, 0.0, 10.0):
+                self.assertEqual(index.query_point(x, y), brute_point(boxes, x, y))
+        self.assertEqual(sorted(index.query_box(10.0, 10.0, 10.0, 10.0)), ["a", "c"])
+        self.assertEqual(sorted(index.query_box(5.0, 10.0, 10.0, 10.0)), ["a", "c", "d"])
+        self.assertEqual(sorted(index.query_box(0.0, 0.0, 0.0, 0.0)), ["a", "b"])
+
+    def test_empty_cells_and_empty_index(self):
+        index = GridHash2D.from_boxes([("far", (1000.0, 1000.0, 1001.0, 1001.0))], cell_size=1.0)
+        self.assertEqual(index.query_point(0.0, 0.0), [])
+        self.assertEqual(index.query_box(-5.0, -5.0, 5.0, 5.0), [])
+        empty = GridHash2D.from_boxes([])
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(empty.query_point(0.0, 0.0), [])
+
+
+class PointHash2DTest(unittest.TestCase):
+
+    def assert_nearest(self, index, points, x, y, exclude=None):
+        key, distance = index.nearest(x, y, exclude=exclude)
+        expected = brute_nearest_distance(points, x, y, exclude)
+        if expected is None:
+            self.assertEqual((key, distance), (None, None))
+            return
+        self.assertAlmostEqual(distance, expected)
+        self.assertAlmostEqual(math.hypot(index.points[key][0] - x, index.points[key][1] - y), expected)
+
+    def test_nearest_matches_brute_force(self):
+        rng = random.Random(3)
+        points = [(key, (rng.uniform(-50.0, 50.0), rng.uniform(-50.0, 50.0))) for key in range(300)]
+        index = PointHash2D.from_points(points)
+        for _ in range(500):
+            self.assert_nearest(index, points, rng.uniform(-80.0, 80.0), rng.uniform(-80.0, 80.0))
+
+    def test_clusters_with_empty_cells_between(self):
+        # Two tight clusters far apart: most rings between them are empty
+        rng = random.Random(5)
+        points = [(key, (rng.uniform(0.0, 2.0), rng.uniform(0.0, 2.0))) for key in range(20)]
+        points += [(key, (rng.uniform(200.0, 202.0), rng.uniform(90.0, 92.0))) for key in range(20, 40)]
+        index = PointHash2D.from_points(points, cell_size=1.0)
+        for x, y in ((100.0, 45.0), (-30.0, -30.0), (250.0, 91.0), (1.0, 1.0), (150.0, 0.0)):
+            self.assert_nearest(index, points, x, y)
+
+    def test_points_on_cell_boundaries(self):
+        points = [(key, (float(i), float(j))) for key, (i, j) in
+                  enumerate((i, j) for i in range(-4, 5, 2) for j in range(-4, 5, 2))]
+        index = PointHash2D.from_points(points, cell_size=2.0)
+        for x in (-4.0, -3.0, -2.0, 0.0, 1.0, 2.0, 4.0, 5.0):
+            for y in (-4.0, -1.0, 0.0, 2.0, 3.0):
+                self.assert_nearest(index, points, x, y)
+        key, distance = index.nearest(2.0, 2.0)
+        self.assertEqual(index.points[key], (2.0, 2.0))
+        self.assertEqual(distance, 0.0)
+
+    def test_nearest_neighbours_exclude_self(self):
+        rng = random.Random(9)
+        points = [(key, (rng.uniform(0.0, 30.0), rng.uniform(0.0, 30.0))) for key in range(100)]
+        index = PointHash2D.from_points(points)
+        for key, (other, distance) in index.nearest_neighbours().items():
+            self.assertNotEqual(other, key)
+            x, y = index.points[key]
+            self.assertAlmostEqual(distance, brute_nearest_distance(points, x, y, exclude=key))
+
+    def test_max_distance_and_empty_index(self):
+        index = PointHash2D.from_points([("a", (10.0, 0.0))], cell_size=1.0)
+        self.assertEqual(index.nearest(0.0, 0.0, max_distance=5.0), (None, None))
+        self.assertEqual(index.nearest(0.0, 0.0, max_distance=10.0), ("a", 10.0))
+        self.assertEqual(index.nearest(10.0, 0.0, exclude="a"), (None, None))
+        self.assertEqual(PointHash2D.from_points([]).nearest(0.0, 0.0), (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the Revit-free wire geometry core (Snippets._wires).
+Runs with plain CPython, no Revit needed:
+
+    python -m pytest tests
+"""
+
+import math
+import os
+import sys
+import unittest
+
+LIB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DEEM Tools.extension", "lib")
+sys.path.insert(0, os.path.normpath(LIB_PATH))
+
+from Snippets._spatial import GridHash2D  # noqa: E402
+from Snippets._wires import (  # noqa: E402
+    LineFrames, RegionFrames, fingerprint, is_orthogonal, map_in_frames, orthogonalize_batch,
+    orthogonalize_vertices, plan_lengths, rotate_vertex_lists, route_around, separate_parallel,
+    source_identity, vertex_diff, wire_frame_angles
+)
+
+RUN = [(0.0, 0.0, 0.0), (10.0, 0.0, 0.0)]
+
+
+def run_at(y):
+    return [(0.0, y, 0.0), (10.0, y, 0.0)]
+
+
+class SeparateParallelTest(unittest.TestCase):
+
+    def test_overlapping_runs_are_offset(self):
+        results = separate_parallel([RUN, list(RUN)], 0.5)
+        self.assertIsNone(results[0])
+        self.assertIn((10.0, 0.5, 0.0), results[1])
+        self.assertEqual(results[1][0], RUN[0])      # ends stay on their connectors
+        self.assertEqual(results[1][-1], RUN[-1])
+
+    def test_fixed_wire_stays_and_new_wire_moves(self):
+        results = separate_parallel([list(RUN), list(RUN)], 0.5, fixed={1})
+        self.assertIsNone(results[1])
+        self.assertIn((10.0, 0.5, 0.0), results[0])
+
+    def test_fixed_wires_block_their_tracks(self):
+        # Earlier run left one wire on the line and one offset to +0.5
+        results = separate_parallel([run_at(0.0), run_at(0.5), list(RUN)], 0.5, fixed={0, 1})
+        self.assertIsNone(results[0])
+        self.assertIsNone(results[1])
+        self.assertIn((10.0, -0.5, 0.0), results[2])
+
+    def test_fixed_wires_are_never_moved(self):
+        self.assertEqual(separate_parallel([list(RUN), list(RUN)], 0.5, fixed={0, 1}), [None, None])
+
+
+class RouteAroundTest(unittest.TestCase):
+    # Diagonal with X dominant: the horizontal-first L is preferred
+    A = (0.0, 0.0, 0.0)
+    B = (10.0, 4.0, 0.0)
+
+    def obstacles(self, keyed_boxes):
+        return GridHash2D.from_boxes(keyed_boxes, cell_size=2.0)
+
+    def test_no_obstacles_takes_the_dominant_l(self):
+        self.assertEqual(route_around(self.A, self.B, self.obstacles([])), [(10.0, 0.0, 0.0)])
+
+    def test_picks_the_unblocked_l(self):
+        obstacles = self.obstacles([("corner", (9.0, -1.0, 11.0, 1.0))])
+        self.assertEqual(route_around(self.A, self.B, obstacles), [(0.0, 4.0, 0.0)])
+
+    def test_both_ls_blocked_falls_back_to_a_z(self):
+        obstacles = self.obstacles([("h", (5.0, -1.0, 6.0, 1.0)), ("v", (-1.0, 1.0, 1.0, 3.0))])
+        # The 0.5 splits still hit a box; the 0.25 split along X clears both
+        self.assertEqual(route_around(self.A, self.B, obstacles), [(2.5, 0.0, 0.0), (2.5, 4.0, 0.0)])
+
+    def test_every_route_blocked_keeps_the_dominant_l(self):
+        obstacles = self.obstacles([("wall", (4.0, -10.0, 6.0, 10.0))])
+        self.assertEqual(route_around(self.A, self.B, obstacles), [(10.0, 0.0, 0.0)])
+
+    def test_boxes_at_the_end_points_do_not_count(self):
+        obstacles = self.obstacles([("device", (-0.5, -0.5, 0.5, 0.5)), ("corner", (9.0, -1.0, 11.0, 1.0))])
+        self.assertEqual(route_around(self.A, self.B, obstacles), [(0.0, 4.0, 0.0)])
+        # Passing ignore explicitly makes the device count: every route starts in it
+        self.assertEqual(route_around(self.A, self.B, obstacles, ignore=set()), [(0.0, 4.0, 0.0)])
+
+    def test_end_points_stay_fixed(self):
+        obstacles = self.obstacles([("h", (5.0, -1.0, 6.0, 1.0)), ("v", (-1.0, 1.0, 1.0, 3.0))])
+        wire = [self.A, (5.0, 6.0, 0.0), self.B]
+        result = orthogonalize_vertices(wire, "avoid", obstacles)
+        self.assertEqual(result[0], self.A)
+        self.assertEqual(result[-1], self.B)
+        for a, b in zip(result, result[1:]):
+            self.assertTrue(is_orthogonal(a, b))
+
+
+def orthogonalize_auto(vertex_lists, angle):
+    return orthogonalize_batch(vertex_lists, "auto")
+
+
+class FramesTest(unittest.TestCase):
+    ANGLE = math.radians(30.0)
+
+    def rotated(self, local_vertices):
+        return rotate_vertex_lists([local_vertices], self.ANGLE)[0]
+
+    def assert_orthogonal_in_frame(self, vertices, angle):
+        local = rotate_vertex_lists([vertices], -angle)[0]
+        for a, b in zip(local, local[1:]):
+            self.assertTrue(is_orthogonal(a, b), "{} -> {}".format(a, b))
+
+    def test_line_frame_angles_fold_to_the_nearest_axis(self):
+        frames = LineFrames([(0.0, 0.0, 100.0, 0.0),
+                             (0.0, 50.0, 50.0 * math.cos(math.radians(120.0)),
+                              50.0 + 50.0 * math.sin(math.radians(120.0)))])
+        self.assertEqual(frames.angle_at(10.0, 1.0), 0.0)
+        self.assertAlmostEqual(frames.angle_at(-5.0, 55.0), self.ANGLE)
+        self.assertEqual(LineFrames([]).angle_at(0.0, 0.0), 0.0)
+
+    def test_wire_in_rotated_line_frame(self):
+        wire = self.rotated([(0.0, 0.0, 0.0), (10.0, 4.0, 0.0)])
+        cos_a, sin_a = math.cos(self.ANGLE), math.sin(self.ANGLE)
+        frames = LineFrames([(-20.0 * cos_a, -20.0 * sin_a, 20.0 * cos_a, 20.0 * sin_a)])
+        angles = wire_frame_angles([wire], frames)
+        self.assertAlmostEqual(angles[0], self.ANGLE)
+
+        result = map_in_frames([wire], angles, orthogonalize_auto)[0]
+        self.assertIs(result[0], wire[0])
+        self.assertIs(result[-1], wire[-1])
+        self.assertEqual(len(result), 3)
+        self.assert_orthogonal_in_frame(result, self.ANGLE)
+        # The elbow is the frame-local horizontal-first corner
+        elbow = self.rotated([(10.0, 0.0, 0.0)])[0]
+        self.assertAlmostEqual(result[1][0], elbow[0])
+        self.assertAlmostEqual(result[1][1], elbow[1])
+
+    def test_wire_already_clean_in_its_frame_is_unchanged(self):
+        wire = self.rotated([(0.0, 0.0, 0.0), (10.0, 0.0, 0.0), (10.0, 4.0, 0.0)])
+        self.assertEqual(map_in_frames([wire], [self.ANGLE], orthogonalize_auto), [None])
+
+    def test_region_frames_and_wire_outside_every_frame(self):
+        square = [(0.0, 0.0), (20.0, 0.0), (20.0, 20.0), (0.0, 20.0)]
+        frames = RegionFrames([([square], self.ANGLE)])
+        inside = [(2.0, 2.0, 0.0)] + [(2.0 + x, 2.0 + y, z) for x, y, z in self.rotated([(10.0, 4.0, 0.0)])]
+        outside = [(50.0, 50.0, 0.0), (60.0, 54.0, 0.0)]
+        angles = wire_frame_angles([outside, inside], frames)
+        self.assertEqual(angles, [0.0, self.ANGLE])
+
+        results = map_in_frames([outside, inside], angles, orthogonalize_auto)
+        # Outside: plain project axes
+        self.assertEqual(results[0], [(50.0, 50.0, 0.0), (60.0, 50.0, 0.0), (60.0, 54.0, 0.0)])
+        self.assertEqual(results[1][0], inside[0])
+        self.assertEqual(results[1][-1], inside[-1])
+        self.assert_orthogonal_in_frame(results[1], self.ANGLE)
+
+
+def plan(*points):
+    return [(x, y, 0.0) for x, y in points]
+
+
+class LengthsTest(unittest.TestCase):
+
+    def test_plan_lengths(self):
+        cases = [
+            ([], 0.0),
+            (plan((1.0, 1.0)), 0.0),
+            (plan((0.0, 0.0), (3.0, 4.0)), 5.0),
+            ([(0.0, 0.0, 0.0), (3.0, 4.0, 9.0)], 5.0),          # Z is ignored
+            (plan((0.0, 0.0), (3.0, 0.0), (3.0, 4.0)), 7.0),
+            (plan((0.0, 0.0), (0.0, 0.0), (-2.0, 0.0)), 2.0),   # repeated vertex adds nothing
+        ]
+        lengths = plan_lengths([vertices for vertices, expected in cases])
+        self.assertEqual(len(lengths), len(cases))
+        for (vertices, expected), length in zip(cases, lengths):
+            self.assertAlmostEqual(length, expected, msg=str(vertices))
+
+    def test_vertex_diff(self):
+        diagonal = math.hypot(10.0, 4.0)
+        cases = [
+            # old, new, (added, removed, length delta)
+            (plan((0.0, 0.0), (10.0, 4.0)), plan((0.0, 0.0), (10.0, 4.0)), (0, 0, 0.0)),
+            (plan((0.0, 0.0), (10.0, 4.0)), plan((0.0, 0.0), (10.0, 0.0), (10.0, 4.0)), (1, 0, 14.0 - diagonal)),
+            (plan((0.0, 0.0), (5.0, 0.0), (10.0, 0.0)), plan((0.0, 0.0), (10.0, 0.0)), (0, 1, 0.0)),
+            (plan((0.0, 0.0), (5.0, 5.0), (10.0, 0.0)), plan((0.0, 0.0), (5.0, 0.0), (10.0, 0.0)),
+             (1, 1, 10.0 - 2 * math.hypot(5.0, 5.0))),
+            (plan((0.0, 0.0), (0.0, 0.0), (10.0, 0.0)), plan((0.0, 0.0), (10.0, 0.0)), (0, 1, 0.0)),
+            # Moves below FINGERPRINT_DIGITS are the same position
+            (plan((0.0, 0.0), (10.0, 0.0)), plan((0.0, 0.00001), (10.0, 0.0)), (0, 0, 0.0)),
+            # Compared by position, not index
+            (plan((0.0, 0.0), (10.0, 0.0)), plan((10.0, 0.0), (0.0, 0.0)), (0, 0, 0.0)),
+        ]
+        for old, new, (added, removed, delta) in cases:
+            result = vertex_diff(old, new)
+            self.assertEqual(result[:2], (added, removed), msg="{} -> {}".format(old, new))
+            self.assertAlmostEqual(result[2], delta, places=4, msg="{} -> {}".format(old, new))
+
+
+class SourceIdentityTest(unittest.TestCase):
+    # Parts as the Wire Fix tool formats them: grid lines, scope box footprints, obstacle boxes
+    GRIDS = ["0.0000,0.0000;100.0000,0.0000", "0.0000,0.0000;0.0000,80.0000"]
+    OBSTACLES = ["101|1.0000,1.0000;2.0000,2.0000", "102|5.0000,5.0000;6.0000,6.5000"]
+
+    def test_same_parts_in_any_order_give_the_same_identity(self):
+        self.assertEqual(source_identity("grids", self.GRIDS), source_identity("grids", list(reversed(self.GRIDS))))
+        self.assertEqual(source_identity("grids", []), "grids")
+
+    def test_moved_grid_changes_identity_and_fingerprint(self):
+        moved = [self.GRIDS[0], "0.5000,0.0000;0.5000,80.0000"]
+        before = source_identity("grids", self.GRIDS)
+        after = source_identity("grids", moved)
+        self.assertNotEqual(before, after)
+        self.assertNotEqual(source_identity("scope_boxes", self.GRIDS), before)
+        self.assertNotEqual(fingerprint(RUN, "auto|0.0000|" + before), fingerprint(RUN, "auto|0.0000|" + after))
+
+    def test_changed_obstacle_box_changes_identity(self):
+        before = source_identity("obstacles", self.OBSTACLES)
+        self.assertNotEqual(before, source_identity("obstacles", [self.OBSTACLES[0], "102|5.0000,5.0000;6.0000,7.0000"]))
+        self.assertNotEqual(before, source_identity("obstacles", self.OBSTACLES[:1]))
+        self.assertNotEqual(before, source_identity("obstacles", [self.OBSTACLES[0], "103|5.0000,5.0000;6.0000,6.5000"]))
+
+
+if __name__ == "__main__":
+    unittest.main()